@@ -20,6 +20,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from vina_backend.services.lesson_generator import LessonGenerator
 from vina_backend.integrations.llm.client import LLMClient, get_llm_client
+from vina_backend.integrations.llm.router import record_judge_scores, reset_model_router
+from vina_backend.core.config import get_settings
 from vina_backend.domain.schemas.profile import UserProfileData
 from vina_backend.integrations.db.engine import init_db
 from vina_backend.services.profile_builder import get_or_create_user_profile
@@ -89,7 +91,7 @@ Return ONLY a JSON object with:
 }}
 """
         try:
-            result = self.client.generate_json(prompt, temperature=0.3)
+            result = self.client.generate_json(prompt, temperature=0.3, caller="benchmark_judge")
             return result
         except Exception as e:
             logger.error(f"Judge evaluation failed: {e}")
@@ -154,6 +156,7 @@ def run_benchmark():
                     res = {
                         "model_name": model_info["name"],
                         "model_id": model_info["model"],
+                        "route": f"{model_info['provider']}/{model_info['model']}",
                         "latency": round(latency, 2),
                         "success": not is_fallback,
                         "rewrites": metadata.rewrite_count,
@@ -178,6 +181,24 @@ def run_benchmark():
 
     # Generate Markdown Report
     generate_report(results)
+    save_quality_scores(results)
+
+def save_quality_scores(results: List[Dict]):
+    """Feed judge scores to the model router's quality table."""
+    scores: Dict[str, List[float]] = {}
+    for r in results:
+        if "error" in r or not r["success"]:
+            continue
+        scores.setdefault(r["route"], []).append(float(r["judge_score"]))
+    if not scores:
+        return
+    
+    # The benchmarked client runs the whole generate -> review -> rewrite loop
+    path = Path(get_settings().llm_model_quality_path)
+    for task in ("generate", "review", "rewrite"):
+        record_judge_scores(path, task, scores)
+    reset_model_router()
+    print(f"\n📈 Judge scores saved for routing: {path}")
 
 def generate_report(results: List[Dict]):
     """Creates a markdown report of the benchmark."""
@@ -155,9 +155,8 @@ async def run_full_pipeline(profession: str, industry: str, level_str: str, diff
             else:
                 print(f"⚠️ Cache MISS for {lesson_id} (Model: {model_name}, Diff: {difficulty_level}, Adapt: {adaptation_context}). Generating new lesson...")
             
-            # generate_lesson handles the Generator -> Reviewer -> Refiner loop
-            generated_lesson = await asyncio.to_thread(
-                lesson_generator.generate_lesson,
+            # generate_lesson_async runs the Generator -> Reviewer -> Refiner loop on the async LLM path
+            generated_lesson = await lesson_generator.generate_lesson_async(
                 lesson_id=lesson_id,
                 course_id=COURSE_ID,
                 user_profile=user_profile,
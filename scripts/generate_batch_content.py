@@ -16,6 +16,7 @@ sys.path.insert(0, str(root_path / "src"))
 
 # Import the pipeline from the demo script
 from scripts.demo_complete_pipeline import run_full_pipeline
+from vina_backend.integrations.llm.scheduler import llm_priority
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -61,9 +62,7 @@ async def generate_all():
             except Exception as e:
                 fail_count += 1
                 logger.error(f"❌ Failed to generate Lesson {lesson_num} for {profession}: {e}")
-            
-            # Small cooldown between generations to avoid rate limits
-            await asyncio.sleep(2)
+            # No cooldown needed: LLMClient waits on the shared RPM/TPM limiter
 
     total_time = time.time() - start_time
     logger.info(f"\n{'#'*60}")
@@ -75,7 +74,9 @@ async def generate_all():
 
 if __name__ == "__main__":
     try:
-        asyncio.run(generate_all())
+        # Batch priority: yield provider capacity to interactive requests
+        with llm_priority("batch"):
+            asyncio.run(generate_all())
     except KeyboardInterrupt:
         logger.info("\nStopped by user.")
     except Exception as e:
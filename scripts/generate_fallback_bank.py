@@ -0,0 +1,116 @@
+"""
+Build the fallback lesson bank (src/vina_backend/domain/constants/fallback_lessons.json).
+
+One validated lesson per (course, lesson, difficulty), written for the
+profession-neutral CORE_PROFILE (services/lesson_layers.py) and served by
+LessonGenerator with no LLM call when the generation pipeline falls back
+(see services/fallback_bank.py). Rebuild after changing the course config
+or fallback_generator.md and commit the file.
+
+Usage Examples:
+1. Build missing lessons for the default course (Default: Skip Existing):
+   uv run scripts/generate_fallback_bank.py
+
+2. Rebuild every lesson (e.g. after editing fallback_generator.md):
+   uv run scripts/generate_fallback_bank.py --overwrite
+
+3. Only some lessons and difficulties:
+   uv run scripts/generate_fallback_bank.py --lessons l01_what_llms_are l02_tokens --difficulties 3
+
+4. Resume after a crash without paying again for completed LLM calls:
+   uv run scripts/generate_fallback_bank.py --llm-cache
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from vina_backend.domain.schemas.lesson import LessonContent
+from vina_backend.integrations.llm.client import get_llm_client
+from vina_backend.integrations.llm.scheduler import llm_priority
+from vina_backend.services.course_loader import get_difficulty_knobs, get_lesson_config, load_course_config
+from vina_backend.services.fallback_bank import load_fallback_bank, save_fallback_bank, set_fallback_lesson
+from vina_backend.services.lesson_generator import PROMPTS_DIR, LessonGenerator
+from vina_backend.services.lesson_layers import CORE_PROFILE
+from vina_backend.services.lesson_prefetch import CONTENT_DIFFICULTY_LEVELS
+from vina_backend.services.review_sampling import prompt_version
+from vina_backend.utils.logging import setup_logging
+
+setup_logging("INFO")
+logger = logging.getLogger("FALLBACK_BANK")
+
+DEFAULT_COURSE_ID = "c_llm_foundations"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the fallback lesson bank")
+    parser.add_argument("--course", default=DEFAULT_COURSE_ID, help=f"Course ID (default: {DEFAULT_COURSE_ID})")
+    parser.add_argument("--lessons", nargs="*", help="Lesson IDs to build (default: all lessons in the course)")
+    parser.add_argument(
+        "--difficulties", nargs="*", type=int, default=list(CONTENT_DIFFICULTY_LEVELS),
+        help="Difficulty levels to build (default: 1 3 5)"
+    )
+    parser.add_argument("--overwrite", action="store_true", help="Rebuild lessons already in the bank (default: False)")
+    parser.add_argument("--llm-cache", action="store_true", help="Reuse cached LLM responses from previous runs (default: False)")
+    args = parser.parse_args()
+
+    llm_client = get_llm_client()
+    if args.llm_cache:
+        llm_client.use_response_cache = True
+        logger.info("♻️  LLM response cache enabled")
+
+    course_config = load_course_config(args.course)
+    lesson_ids = args.lessons or [lesson["lesson_id"] for lesson in course_config["lessons"]]
+    bank = load_fallback_bank(reload=True)
+    existing = bank["courses"].get(args.course, {})
+    generator = LessonGenerator(cache_service=None, llm_client=llm_client)
+
+    logger.info(f"🏦 Fallback bank v{bank['version']}: {len(lesson_ids)} lessons × difficulties {args.difficulties}")
+
+    built = 0
+    failed = []
+    for lesson_id in lesson_ids:
+        lesson_spec = get_lesson_config(args.course, lesson_id)
+        for difficulty_level in args.difficulties:
+            if str(difficulty_level) in existing.get(lesson_id, {}) and not args.overwrite:
+                logger.info(f"⏩ SKIP: {lesson_id} D{difficulty_level} (Already exists)")
+                continue
+
+            prompt = generator._format_fallback_prompt(
+                lesson_spec, CORE_PROFILE, difficulty_level, get_difficulty_knobs(difficulty_level), course_config
+            )
+            try:
+                with llm_priority("batch"):
+                    lesson_json = llm_client.generate_json(
+                        prompt,
+                        temperature=0.7,
+                        response_model=LessonContent,
+                        caller="lesson_fallback"
+                    )
+                lesson_json = LessonContent(**lesson_json).model_dump()
+            except Exception as e:
+                logger.error(f"❌ FAILED: {lesson_id} D{difficulty_level} - {e}")
+                failed.append(f"{lesson_id} D{difficulty_level}")
+                continue
+
+            set_fallback_lesson(bank, args.course, lesson_id, difficulty_level, lesson_json)
+            built += 1
+            logger.info(f"✅ {lesson_id} D{difficulty_level}: {len(lesson_json['slides'])} slides")
+
+    if built:
+        save_fallback_bank(bank, prompt_version(PROMPTS_DIR / "fallback_generator.md"))
+        logger.info(f"💾 Saved {built} lessons as fallback bank v{bank['version']}")
+    else:
+        logger.info("Nothing to save")
+
+    if failed:
+        logger.error(f"❌ {len(failed)} lessons failed: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,9 @@ Usage Examples:
 
 3. Force regenerate even if quizzes already exist:
    uv run scripts/generate_lesson_quizzes.py --start 1 --end 3 --overwrite
+
+4. Resume after a crash without paying again for completed LLM calls:
+   uv run scripts/generate_lesson_quizzes.py --start 1 --end 3 --llm-cache
 """
 
 import json
@@ -27,6 +30,8 @@ from vina_backend.services.agents.lesson_quiz_generator import LessonQuizGenerat
 from vina_backend.services.agents.lesson_quiz_reviewer import LessonQuizReviewerAgent
 from vina_backend.services.agents.lesson_quiz_rewriter import LessonQuizRewriterAgent
 from vina_backend.services.course_loader import load_course_config
+from vina_backend.integrations.llm.client import get_llm_client
+from vina_backend.integrations.llm.scheduler import llm_priority
 from vina_backend.services.profile_builder import get_or_create_user_profile
 from vina_backend.domain.schemas.lesson_quiz import LessonQuiz
 from vina_backend.domain.constants.enums import Profession, INDUSTRIES_BY_PROFESSION, ExperienceLevel
@@ -130,8 +135,14 @@ def main():
     parser.add_argument("--end", type=int, required=True, help="End lesson number (inclusive)")
     parser.add_argument("--profession", type=str, help="Specific profession (optional)")
     parser.add_argument("--overwrite", action="store_true", help="Overwrite existing quizzes in the range (default: False)")
+    parser.add_argument("--llm-cache", action="store_true", help="Reuse cached LLM responses from previous runs (default: False)")
     args = parser.parse_args()
 
+    if args.llm_cache:
+        # Agents share the global client, so this covers generator/reviewer/rewriter
+        get_llm_client().use_response_cache = True
+        logger.info("♻️  LLM response cache enabled")
+
     # Filter professions
     professions_to_process = [args.profession] if args.profession else TARGET_PROFESSIONS
     
@@ -260,4 +271,6 @@ def main():
         logger.warning("\n⚠️  No new quizzes were generated successfully. File not updated.")
 
 if __name__ == "__main__":
-    main()
+    # Batch priority: yield provider capacity to interactive requests
+    with llm_priority("batch"):
+        main()
@@ -22,6 +22,7 @@ from vina_backend.services.agents.practice_question_reviewer import PracticeQues
 from vina_backend.services.agents.practice_question_rewriter import PracticeQuestionRewriterAgent
 from vina_backend.services.course_loader import load_course_config
 from vina_backend.domain.schemas.practice_quiz import PracticeQuestion
+from vina_backend.integrations.llm.scheduler import llm_priority
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -182,4 +183,6 @@ def main():
     logger.info(f"Done! Generated {total_generated} new practice questions.")
 
 if __name__ == "__main__":
-    main()
+    # Batch priority: yield provider capacity to interactive requests
+    with llm_priority("batch"):
+        main()
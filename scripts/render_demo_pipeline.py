@@ -114,8 +114,7 @@ async def run_render_pipeline(profession: str, industry: str, level_str: str, di
             cache_service = LessonCacheService(db_session=session)
             lesson_generator = LessonGenerator(cache_service=cache_service)
             
-            generated_lesson = await asyncio.to_thread(
-                lesson_generator.generate_lesson,
+            generated_lesson = await lesson_generator.generate_lesson_async(
                 lesson_id=lesson_id,
                 course_id=COURSE_ID,
                 user_profile=user_profile,
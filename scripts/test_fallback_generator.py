@@ -11,6 +11,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from vina_backend.services.lesson_generator import LessonGenerator
+from vina_backend.integrations.llm.loop import run_sync
 from vina_backend.services.profile_builder import get_or_create_user_profile
 from vina_backend.utils.logging import setup_logging
 from vina_backend.integrations.db.engine import init_db, get_session
@@ -60,7 +61,7 @@ def test_fallback_generator():
     print(f"\n⏳ Generating fallback lesson...")
     
     try:
-        fallback_lesson = generator._fallback_lesson(
+        fallback_lesson = run_sync(generator._fallback_lesson(
             lesson_id=lesson_id,
             course_id=course_id,
             difficulty_level=difficulty_level,
@@ -68,7 +69,7 @@ def test_fallback_generator():
             user_profile=profile,
             difficulty_knobs=difficulty_knobs,
             course_config=course_config
-        )
+        ))
         
         print(f"\n✅ Fallback Lesson Generated Successfully!")
         
@@ -197,7 +198,7 @@ def test_different_difficulties():
         difficulty_knobs = get_difficulty_knobs(difficulty)
         
         try:
-            fallback = generator._fallback_lesson(
+            fallback = run_sync(generator._fallback_lesson(
                 lesson_id=lesson_id,
                 course_id=course_id,
                 difficulty_level=difficulty,
@@ -205,7 +206,7 @@ def test_different_difficulties():
                 user_profile=profile,
                 difficulty_knobs=difficulty_knobs,
                 course_config=course_config
-            )
+            ))
             
             expected_slides = 3 if difficulty <= 2 else (4 if difficulty == 3 else 5)
             actual_slides = len(fallback.lesson_content.slides)
@@ -43,7 +43,7 @@ def test_lesson_generation():
         
         # 2. Initialize services
         cache_service = LessonCacheService(db_session)
-        generator = LessonGenerator(cache_service)
+        generator = LessonGenerator(cache_service, force_review=True)
         
         # 3. Generate lesson
         print(f"\n  🎬 Generating Lesson: l01_what_llms_are (Difficulty 3)")
@@ -103,7 +103,7 @@ def test_cache_hit():
         
         # Initialize services
         cache_service = LessonCacheService(db_session)
-        generator = LessonGenerator(cache_service)
+        generator = LessonGenerator(cache_service, force_review=True)
         
         # Generate same lesson
         print(f"\n  🔄 Regenerating l01_what_llms_are (should hit cache)")
@@ -145,7 +145,7 @@ def test_different_difficulty():
         )
         
         cache_service = LessonCacheService(db_session)
-        generator = LessonGenerator(cache_service)
+        generator = LessonGenerator(cache_service, force_review=True)
         
         # Generate at difficulty 1 (Guided)
         print(f"\n  🎬 Generating l01_what_llms_are at Difficulty 1 (Guided)")
@@ -229,7 +229,7 @@ def test_different_profile():
         print(f"     Industry: {profile.industry}")
         
         cache_service = LessonCacheService(db_session)
-        generator = LessonGenerator(cache_service)
+        generator = LessonGenerator(cache_service, force_review=True)
         
         print(f"\n  🎬 Generating l01_what_llms_are for HR Manager")
         
@@ -1,7 +1,42 @@
+import asyncio
+
 from fastapi import APIRouter
 
+from vina_backend.integrations.http.pool import get_http_metrics
+from vina_backend.integrations.llm.health import get_health_registry
+from vina_backend.integrations.llm.scheduler import get_scheduler
+from vina_backend.services.generation_jobs import get_job_queue
+from vina_backend.services.review_sampling import get_review_sampler
+
 router = APIRouter()
 
 @router.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+
+@router.get("/health/llm")
+async def llm_health():
+    """LLM scheduler queue depth/wait times and per-model circuit state."""
+    return {
+        "scheduler": get_scheduler().get_metrics(),
+        "models": get_health_registry().snapshot(),
+    }
+
+
+@router.get("/health/http")
+async def http_pool_health():
+    """Connection reuse and TCP/TLS handshake times per outbound host."""
+    return {"hosts": get_http_metrics()}
+
+
+@router.get("/health/jobs")
+async def job_queue_health():
+    """Background generation jobs per state (see services/generation_jobs.py)."""
+    return {"jobs": await asyncio.to_thread(get_job_queue().depth)}
+
+
+@router.get("/health/reviews")
+async def review_sampling_health():
+    """Reviewer outcomes and the share of lessons whose review was skipped (see services/review_sampling.py)."""
+    return {"reviews": await asyncio.to_thread(get_review_sampler().get_stats)}
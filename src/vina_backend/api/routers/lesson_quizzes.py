@@ -1,6 +1,6 @@
 
 import logging
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
 from typing import Optional
 
 from vina_backend.domain.schemas.lesson_quiz import LessonQuiz, QuizSubmission, QuizResult
@@ -9,8 +9,13 @@ from sqlmodel import select, Session
 from vina_backend.integrations.db.models.user import UserProfile
 from vina_backend.integrations.db.session import get_session
 from vina_backend.integrations.db.repositories.profile_repository import ProfileRepository
+from vina_backend.integrations.db.engine import engine
+from vina_backend.core.config import get_settings
+from vina_backend.services.course_loader import find_course_for_lesson
+from vina_backend.services.lesson_prefetch import prefetch_next_lesson
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
 
 router = APIRouter()
 
@@ -61,8 +66,27 @@ async def get_quiz(
         logger.error(f"Failed to fetch quiz: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch quiz")
 
+def _prefetch_next_lesson(submission: QuizSubmission, next_lesson_id: str, score: int) -> None:
+    """Queue low-priority generation of the next lesson (runs after the response is sent)."""
+    try:
+        course_prefix, _, lesson_id = submission.lessonId.rpartition(":")
+        course_id = submission.courseId or course_prefix or find_course_for_lesson(lesson_id)
+        if not course_id:
+            logger.debug(f"No course found for lesson {lesson_id}, skipping prefetch of {next_lesson_id}")
+            return
+        prefetch_next_lesson(
+            engine,
+            user_id=submission.userId,
+            course_id=course_id,
+            next_lesson_id=next_lesson_id,
+            current_difficulty=submission.difficulty or 3,
+            quiz_score=score
+        )
+    except Exception as e:
+        logger.warning(f"Failed to prefetch next lesson {next_lesson_id}: {e}")
+
 @router.post("/quizzes/submit", response_model=QuizResult)
-async def submit_quiz(submission: QuizSubmission):
+async def submit_quiz(submission: QuizSubmission, background_tasks: BackgroundTasks):
     """
     Process quiz submission and calculate results.
     
@@ -110,6 +134,10 @@ async def submit_quiz(submission: QuizSubmission):
         if passed:
             # We determine the next lesson to unlock
             next_lesson_id = await get_next_lesson(submission.lessonId)
+            # Prefetch jobs only run where job workers are enabled
+            if next_lesson_id and settings.lesson_prefetch_enabled and settings.job_workers_enabled:
+                # Best-effort: queued after the response so it never delays the learner
+                background_tasks.add_task(_prefetch_next_lesson, submission, next_lesson_id, score)
         
         # Persist results?
         # PRD Section 7.2 doesn't explicitly ask for DB persistence of the RESULT record here,
@@ -6,6 +6,9 @@ from pydantic import BaseModel
 from sqlmodel import Session, select
 from vina_backend.integrations.db.models.user import User
 from vina_backend.api.dependencies import get_current_user, get_db, get_current_user_optional
+from vina_backend.core.config import get_settings
+from vina_backend.integrations.db.repositories.profile_repository import ProfileRepository
+from vina_backend.services.generation_jobs import GenerationJob, enqueue_lesson_video_job, get_job_queue
 
 router = APIRouter()
 
@@ -164,6 +167,23 @@ def get_lesson_detail(
         resources=[]
     )
 
+def _job_status(job: GenerationJob) -> dict:
+    """Status payload for a generation job."""
+    eta = get_job_queue().estimate_seconds(job, workers=get_settings().job_workers)
+    return {
+        "jobId": job.id,
+        "status": job.status,
+        "attempts": job.attempts,
+        "maxAttempts": job.max_attempts,
+        "queuePosition": eta["queue_position"],
+        "estimatedSeconds": eta["eta_seconds"],
+        "result": json.loads(job.result_json) if job.result_json else None,
+        "error": job.error if job.status == "failed" else None,
+        "createdAt": job.created_at.isoformat(),
+        "finishedAt": job.finished_at.isoformat() if job.finished_at else None
+    }
+
+
 @router.post("/adapt")
 def adapt_lesson(
     lessonId: str = Body(...),
@@ -172,9 +192,12 @@ def adapt_lesson(
     current_user: User = Depends(get_current_user)
 ):
     """
-    Stub for AI Adaptation. 
-    In the future, this triggers the LLM pipeline to rewrite the script and generate a new video.
-    For now, it returns a simulated 'Generating' or switches difficulty.
+    Queue regeneration of a lesson (and its video) for an adaptation.
+    
+    Returns a job id to poll at /lessons/jobs/{jobId} and an ETA based on the
+    jobs queued ahead of it. Once the job succeeds, /lessons/{id} with the new
+    difficulty returns the adapted video. With JOB_WORKERS_ENABLED=false only
+    the new difficulty is returned.
     """
     # Logic from PRD:
     # simplify_this -> D1
@@ -186,11 +209,56 @@ def adapt_lesson(
         new_diff = 1
     elif adaptationType == "get_to_the_point":
         new_diff = 5
-        
+    elif adaptationType in ["examples", "more_examples"]:
+        new_diff = 3  # "More Examples" is only available at Difficulty 3 (see get_lesson_detail)
+    
+    if not get_settings().job_workers_enabled:
+        # No worker would run a job: only switch difficulty
+        return {
+            "status": "generating",
+            "message": f"Adapting lesson to '{adaptationType}'...",
+            "estimatedSeconds": 5,
+            "newDifficulty": new_diff
+            # Frontend polls /lessons/{id} with new difficulty
+        }
+    
+    if not current_user.profile:
+        raise HTTPException(status_code=400, detail="Complete onboarding before adapting lessons")
+    
+    course_id, _, lesson_id = lessonId.rpartition(":")
+    course_id = course_id or "c_llm_foundations"
+    # Same adaptation_context get_lesson_detail looks up ("more_examples" is stored as "examples")
+    adaptation_context = "examples" if adaptationType in ["examples", "more_examples"] else None
+    
+    job = enqueue_lesson_video_job(
+        course_id,
+        lesson_id,
+        new_diff,
+        ProfileRepository.to_profile_data(current_user.profile),
+        adaptation_context=adaptation_context,
+        user_id=current_user.id
+    )
+    status = _job_status(job)
+    
     return {
         "status": "generating",
         "message": f"Adapting lesson to '{adaptationType}'...",
-        "estimatedSeconds": 5,
+        "jobId": job.id,
+        "jobStatus": job.status,
+        "queuePosition": status["queuePosition"],
+        "estimatedSeconds": status["estimatedSeconds"],
         "newDifficulty": new_diff
-        # Frontend polls /lessons/{id} with new difficulty
+        # Frontend polls /lessons/jobs/{jobId}, then /lessons/{id} with new difficulty
     }
+
+
+@router.get("/jobs/{job_id}")
+def get_generation_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """Status, ETA and result of a generation job started by /lessons/adapt."""
+    job = get_job_queue().get(job_id)
+    if not job or (job.user_id and job.user_id != current_user.id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _job_status(job)
@@ -2,13 +2,15 @@
 Application configuration using environment variables.
 """
 from functools import lru_cache
-from typing import Literal, Optional, Tuple, Type
+from typing import Any, Dict, List, Literal, Optional, Tuple, Type
 from pathlib import Path
 from pydantic_settings import BaseSettings, PydanticBaseSettingsSource, SettingsConfigDict
 
 # Calculate DB Path at module level
 _project_root = Path(__file__).resolve().parent.parent.parent.parent
 _db_path = _project_root / "data" / "vina.db"
+_llm_recordings_path = _project_root / "data" / "llm_recordings.jsonl"
+_model_quality_path = _project_root / "data" / "model_quality.json"
 
 
 class Settings(BaseSettings):
@@ -27,12 +29,125 @@ class Settings(BaseSettings):
     llm_reasoning_model: Optional[str] = None
     llm_max_tokens: int
     llm_temperature: float
+    # Warn when prompt + max_tokens exceeds this share of the model's context window
+    llm_context_warning_ratio: float = 0.9
+    
+    # LLM circuit breaker (per provider/model)
+    llm_circuit_failure_threshold: int = 3
+    llm_circuit_cooldown_seconds: float = 30.0
+    
+    # LLM rate limits, JSON mapping "provider" or "provider/model" -> {"rpm": int, "tpm": int}
+    # Merged over DEFAULT_RATE_LIMITS in integrations/llm/rate_limit.py when those are enabled
+    llm_rate_limits: Dict[str, Dict[str, int]] = {}
+    # Throttle providers without an LLM_RATE_LIMITS entry at conservative default quotas (opt-in)
+    llm_rate_limit_defaults_enabled: bool = False
+    
+    # Opt-in persistent cache of raw LLM responses (see integrations/llm/response_cache.py)
+    llm_response_cache_enabled: bool = False
+    llm_response_cache_ttl_seconds: int = 7 * 24 * 3600
+    llm_response_cache_max_entries: int = 5000
+    
+    # Hedged requests: if the primary model is slower than its recent latency
+    # percentile, race the same request against the next healthy fallback
+    llm_hedging_enabled: bool = False
+    llm_hedge_latency_percentile: float = 90.0
+    llm_hedge_default_delay_seconds: float = 15.0  # Used until enough latency samples exist
+    llm_hedge_max_per_minute: int = 6
+    
+    # Send cache_control on system prompts (Anthropic); other providers cache prefixes automatically
+    llm_prompt_caching_enabled: bool = True
+    
+    # LLM transport (see integrations/llm/transport.py): "live", "record" (live +
+    # append request/response pairs to JSONL) or "replay" (answer from JSONL, no network)
+    llm_transport_mode: Literal["live", "record", "replay"] = "live"
+    llm_transport_recording_path: str = str(_llm_recordings_path)
+    # Optional latency/error injection, e.g. {"latency_median_seconds": 2, "error_rate_503": 0.1, "seed": 42}
+    llm_fault_injection: Dict[str, Any] = {}
+    
+    # Task-aware model routing (see integrations/llm/router.py): pick the cheapest model per
+    # task (generate/review/rewrite/quiz/profile/judge) that meets its judge-score bar
+    llm_routing_enabled: bool = False
+    # Per-task overrides, e.g. {"review": {"models": ["gemini/gemini-2.5-flash"], "min_quality": 6}}
+    llm_routing_table: Dict[str, Dict[str, Any]] = {}
+    llm_model_quality_path: str = str(_model_quality_path)  # Written by scripts/benchmark_models.py
+    
+    # Process-wide LLM call scheduler (see integrations/llm/scheduler.py): interactive
+    # calls are served first; batch jobs may use at most llm_batch_max_concurrency slots
+    llm_max_concurrency: int = 8
+    llm_batch_max_concurrency: int = 4
+    
+    # LLM token usage/cost accounting (see integrations/llm/usage.py)
+    llm_usage_ring_size: int = 1000
+    llm_usage_flush_interval_seconds: float = 60.0
+    
+    # Fallback path: serve the pre-built lesson from domain/constants/fallback_lessons.json
+    # (scripts/generate_fallback_bank.py) instead of an LLM call, and queue a personalized regeneration
+    # (needs job_workers_enabled in some process to run it)
+    fallback_bank_enabled: bool = False
+    fallback_regenerate_enabled: bool = False
+    
+    # Adaptive reviewer sampling (see services/review_sampling.py): skip the LLM review for
+    # (model, lesson, difficulty) combinations with at least min_reviews reviews under the current
+    # prompts and an approval rate >= threshold, if the deterministic precheck passes.
+    # review_sampling_rate of skippable lessons are still reviewed; review_force disables skipping (QA)
+    review_sampling_enabled: bool = False
+    review_sampling_min_reviews: int = 20
+    review_sampling_approval_threshold: float = 0.95
+    review_sampling_rate: float = 0.1
+    review_force: bool = False
+    
+    # "full" runs generate → review → rewrite per learner profile; "layered" generates and
+    # reviews one profession-neutral core lesson per lesson/difficulty/adaptation and only
+    # personalizes its hook and example slides per profile (see services/lesson_layers.py)
+    lesson_generation_mode: Literal["full", "layered"] = "full"
+    
+    # "independent" generates every difficulty through the pipeline; "derived" generates and
+    # reviews difficulty 3 once and derives difficulties 1 and 5 from it with one cheap call
+    # each, cached together (queued in the background after difficulty 3 is cached)
+    lesson_variant_mode: Literal["independent", "derived"] = "independent"
+    
+    # fix_in_place rewrites: "patch" rewrites only the slides with issues (one call per slide,
+    # in parallel) when every issue targets a single slide; "full" always rewrites the whole lesson
+    lesson_rewrite_mode: Literal["patch", "full"] = "full"
+    
+    # Coalesce concurrent identical lesson generations (see services/lesson_singleflight.py):
+    # one request per cache key generates, others wait for it (leases coordinate workers)
+    lesson_singleflight_enabled: bool = False
+    lesson_lease_seconds: float = 300.0
+    lesson_lease_poll_seconds: float = 2.0
+    lesson_lease_wait_seconds: float = 240.0
+    
+    # Background generation jobs behind POST /lessons/adapt (see services/generation_jobs.py).
+    # Without workers, /lessons/adapt only switches difficulty and queues nothing
+    job_workers_enabled: bool = False
+    job_workers: int = 2
+    job_poll_seconds: float = 1.0
+    job_max_attempts: int = 3
+    job_retry_backoff_seconds: float = 30.0  # Doubles per attempt
+    job_timeout_seconds: float = 900.0
+    # Queue the next lesson (at its predicted difficulty) when a learner passes a quiz
+    lesson_prefetch_enabled: bool = True
+    
+    # Shared outbound HTTP pool for litellm, ElevenLabs and google-genai (see integrations/http/pool.py)
+    http_pooling_enabled: bool = True
+    http2_enabled: bool = True
+    http_max_connections: int = 100
+    http_max_connections_per_host: int = 20
+    http_keepalive_expiry_seconds: float = 60.0
+    http_timeout_seconds: float = 600.0
     
     # Provider-specific API Keys
     anthropic_api_key: Optional[str] = None
     openai_api_key: Optional[str] = None
     gemini_api_key: Optional[str] = None
     
+    # Optional key pools (JSON lists, e.g. GEMINI_API_KEYS=["key-1","key-2"]); calls are
+    # spread across the pool and a key that hits a 429 cools down while the others serve
+    anthropic_api_keys: List[str] = []
+    openai_api_keys: List[str] = []
+    gemini_api_keys: List[str] = []
+    llm_key_cooldown_seconds: float = 60.0
+    
     # Text-to-Speech (ElevenLabs)
     elevenlabs_api_key: str
     elevenlabs_voice_id: str
@@ -99,6 +214,20 @@ class Settings(BaseSettings):
             )
         
         return api_key
+    
+    def get_api_keys(self, provider: str) -> List[str]:
+        """
+        Get all API keys configured for a provider.
+        
+        Args:
+            provider: LLM provider name
+        
+        Returns:
+            The single *_API_KEY (if set) followed by the *_API_KEYS pool, without duplicates
+        """
+        single = getattr(self, f"{provider}_api_key", None)
+        pool = getattr(self, f"{provider}_api_keys", None) or []
+        return list(dict.fromkeys(k for k in [single, *pool] if k))
 
 
 @lru_cache()
@@ -1,7 +1,7 @@
 """
 Pydantic schemas for lesson content and generation.
 """
-from typing import List, Dict, Optional, Literal, Union
+from typing import Any, List, Dict, Optional, Literal, Union
 from pydantic import BaseModel, Field
 
 
@@ -86,6 +86,11 @@ class LessonContent(BaseModel):
         }
 
 
+class PersonalizedSlides(BaseModel):
+    """Slides rewritten by the personalization pass of layered generation."""
+    slides: List[SlideContent] = Field(..., min_items=1, max_items=6)
+
+
 class IssueDetail(BaseModel):
     """Detailed issue information from reviewer."""
     type: str
@@ -140,8 +145,13 @@ class GenerationMetadata(BaseModel):
     generation_time_seconds: Optional[float] = None
     phase_durations: Dict[str, float] = Field(default_factory=dict)
     review_passed_first_time: Optional[bool] = None
+    review_skipped: bool = Field(default=False)  # LLM review skipped by review sampling
+    fallback: Optional[str] = None  # "bank", "llm" or "minimal" when a fallback lesson was served
+    core_cache_hit: Optional[bool] = None  # Layered generation: core lesson came from cache
+    derived_from_difficulty: Optional[int] = None  # Variant derivation: difficulty this lesson was derived from
     rewrite_count: int = Field(default=0)
     quality_score: Optional[float] = None
+    token_usage: Dict[str, Any] = Field(default_factory=dict)  # Totals and per-agent breakdown
 
 
 class GeneratedLesson(BaseModel):
@@ -129,6 +129,14 @@ class QuizSubmission(BaseModel):
     
     lessonId: str
     userId: str
+    courseId: Optional[str] = Field(
+        None,
+        description="Course of the lesson (defaults to the course prefix of lessonId or the course listing it)"
+    )
+    difficulty: Optional[int] = Field(
+        None,
+        description="Difficulty the lesson was taken at (predicts the next lesson's difficulty)"
+    )
     answers: List[dict] = Field(
         ...,
         description="List of {questionId, selectedAnswer, isCorrect}"
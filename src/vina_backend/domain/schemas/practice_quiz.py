@@ -91,6 +91,22 @@ class PracticeQuestion(BaseModel):
         
         return v
 
+class PracticeQuestionDraft(BaseModel):
+    """Practice question as returned by the generator/rewriter agents (IDs assigned afterwards)."""
+    
+    id: Optional[str] = None
+    lessonId: Optional[str] = None
+    text: str
+    options: List[PracticeQuizOption]
+    correctAnswer: str
+    explanation: str
+    conceptTested: Optional[str] = None
+
+class PracticeQuestionBatch(BaseModel):
+    """Structured-output schema for a batch of practice questions."""
+    
+    questions: List[PracticeQuestionDraft]
+
 class DailyPracticeSession(BaseModel):
     """Practice session data."""
     
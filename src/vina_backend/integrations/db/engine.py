@@ -24,6 +24,11 @@ def init_db():
     import vina_backend.integrations.db.models.session
     import vina_backend.integrations.db.models.quiz_attempt
     from vina_backend.services.lesson_cache import LessonCache  # Import cache model
+    from vina_backend.services.lesson_singleflight import LessonGenerationLease
+    from vina_backend.services.generation_jobs import GenerationJob
+    from vina_backend.services.review_sampling import LessonReviewStats
+    from vina_backend.integrations.llm.response_cache import LLMResponseCacheEntry
+    from vina_backend.integrations.llm.usage import LLMUsageRecord
     
     SQLModel.metadata.create_all(engine)
 
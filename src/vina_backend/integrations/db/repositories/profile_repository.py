@@ -9,6 +9,24 @@ class ProfileRepository:
     def __init__(self, session: Session):
         self.session = session
 
+    @staticmethod
+    def to_profile_data(db_profile: UserProfile) -> UserProfileData:
+        """Convert a stored profile to UserProfileData (defaults for fields not yet onboarded)."""
+        return UserProfileData(
+            profession=db_profile.profession or "Unassigned",
+            industry=db_profile.industry or "Unassigned",
+            experience_level=db_profile.experience_level or "Beginner",
+            leadership_level=db_profile.leadership_level,
+            daily_responsibilities=db_profile.daily_responsibilities,
+            pain_points=db_profile.pain_points,
+            typical_outputs=db_profile.typical_outputs,
+            professional_goals=db_profile.professional_goals,
+            safety_priorities=db_profile.safety_priorities,
+            high_stakes_areas=db_profile.high_stakes_areas,
+            technical_comfort_level=db_profile.technical_comfort_level,
+            learning_style_notes=db_profile.learning_style_notes or ""
+        )
+
     def get_profile(
         self, 
         profession: str, 
@@ -14,6 +14,7 @@ from tenacity import (
 )
 
 from vina_backend.core.config import get_settings
+from vina_backend.integrations.http.pool import get_http_client
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -59,8 +60,11 @@ class TTSClient:
         self.max_concurrent = max_concurrent
         self.semaphore = asyncio.Semaphore(max_concurrent)
         
-        # Initialize ElevenLabs client
-        self.client = ElevenLabs(api_key=self.api_key)
+        # Initialize ElevenLabs client (on the shared keep-alive pool if enabled)
+        if settings.http_pooling_enabled:
+            self.client = ElevenLabs(api_key=self.api_key, httpx_client=get_http_client())
+        else:
+            self.client = ElevenLabs(api_key=self.api_key)
         
         logger.info(f"TTS client initialized (voice_id={self.voice_id}, max_concurrent={max_concurrent})")
     
@@ -0,0 +1,4 @@
+"""Shared outbound HTTP pool package."""
+from .pool import get_http_client, get_http_metrics
+
+__all__ = ["get_http_client", "get_http_metrics"]
@@ -0,0 +1,217 @@
+"""
+Shared outbound HTTP connection pool.
+
+litellm, the ElevenLabs SDK and the google-genai SDK each create their own
+HTTP clients, so bursty workloads pay a fresh TCP + TLS handshake on most
+calls. Every integration instead gets the process-wide httpx client from
+get_http_client():
+
+- keep-alive connections reused across providers and calls
+- HTTP/2 where the server supports it (several requests share one connection)
+- a per-host concurrency cap on top of the global connection limit
+- TCP connect and TLS handshake times recorded per host (see get_http_metrics)
+"""
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Callable, Deque, Dict, Iterator, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPPoolMetrics:
+    """Per-host request, new-connection and handshake statistics."""
+
+    def __init__(self, window: int = 200):
+        self._lock = threading.Lock()
+        self._requests: Dict[str, int] = defaultdict(int)
+        self._connections: Dict[str, int] = defaultdict(int)
+        self._tcp_connect: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=window))
+        self._tls_handshake: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=window))
+
+    def record_request(self, host: str) -> None:
+        with self._lock:
+            self._requests[host] += 1
+
+    def record_tcp_connect(self, host: str, seconds: float) -> None:
+        with self._lock:
+            self._connections[host] += 1
+            self._tcp_connect[host].append(seconds)
+
+    def record_tls_handshake(self, host: str, seconds: float) -> None:
+        with self._lock:
+            self._tls_handshake[host].append(seconds)
+
+    @staticmethod
+    def _summarize(samples: Deque[float]) -> Dict[str, Optional[float]]:
+        if not samples:
+            return {"avg_ms": None, "p95_ms": None}
+        ordered = sorted(samples)
+        return {
+            "avg_ms": round(1000 * sum(ordered) / len(ordered), 1),
+            "p95_ms": round(1000 * ordered[int(0.95 * (len(ordered) - 1))], 1),
+        }
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Point-in-time view of every host contacted.
+
+        Returns:
+            Dictionary keyed by host with request/connection counts, the share
+            of requests served on a reused connection and handshake timings
+        """
+        with self._lock:
+            return {
+                host: {
+                    "requests": requests,
+                    "new_connections": self._connections[host],
+                    "connection_reuse_ratio": round(1 - min(self._connections[host], requests) / requests, 3),
+                    "tcp_connect": self._summarize(self._tcp_connect[host]),
+                    "tls_handshake": self._summarize(self._tls_handshake[host]),
+                }
+                for host, requests in self._requests.items()
+            }
+
+
+def _make_trace(metrics: HTTPPoolMetrics, host: str) -> Callable[[str, Dict[str, Any]], None]:
+    """httpcore trace callback timing the connect/TLS phases of one request."""
+    started: Dict[str, float] = {}
+
+    def trace(event_name: str, info: Dict[str, Any]) -> None:
+        if event_name.endswith(".started"):
+            started[event_name[:-len(".started")]] = time.perf_counter()
+            return
+        if not event_name.endswith(".complete"):
+            return
+        phase = event_name[:-len(".complete")]
+        if phase not in started:
+            return
+        elapsed = time.perf_counter() - started.pop(phase)
+        if phase == "connection.connect_tcp":
+            metrics.record_tcp_connect(host, elapsed)
+        elif phase == "connection.start_tls":
+            metrics.record_tls_handshake(host, elapsed)
+
+    return trace
+
+
+class _HostSlotStream(httpx.SyncByteStream):
+    """Response body stream that frees its host slot once the response is closed."""
+
+    def __init__(self, stream: httpx.SyncByteStream, semaphore: threading.BoundedSemaphore):
+        self._stream = stream
+        self._semaphore = semaphore
+        self._released = False
+        self._lock = threading.Lock()
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield from self._stream
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            with self._lock:
+                if not self._released:
+                    self._released = True
+                    self._semaphore.release()
+
+
+class HostLimitedTransport(httpx.BaseTransport):
+    """
+    Transport wrapper capping concurrent requests per host.
+
+    httpx only limits connections globally; this keeps one busy provider from
+    taking every pooled connection. A slot is held until the response is
+    closed, since the connection stays busy while the body is read.
+    """
+
+    def __init__(self, transport: httpx.BaseTransport, max_per_host: int, metrics: HTTPPoolMetrics):
+        self._transport = transport
+        self._max_per_host = max_per_host
+        self._metrics = metrics
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _semaphore(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self._max_per_host)
+            return self._semaphores[host]
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        self._metrics.record_request(host)
+        request.extensions["trace"] = _make_trace(self._metrics, host)
+        semaphore = self._semaphore(host)
+        semaphore.acquire()
+        try:
+            response = self._transport.handle_request(request)
+        except BaseException:
+            semaphore.release()
+            raise
+        response.stream = _HostSlotStream(response.stream, semaphore)
+        return response
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+# Global pool (lazy initialization)
+_http_client: Optional[httpx.Client] = None
+_http_metrics = HTTPPoolMetrics()
+_http_client_lock = threading.Lock()
+
+
+def get_http_client() -> httpx.Client:
+    """
+    Get or create the process-wide pooled HTTP client.
+
+    Thread-safe; SDK calls made from worker threads share its connections.
+
+    Returns:
+        httpx.Client configured from settings
+    """
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            from vina_backend.core.config import get_settings
+
+            settings = get_settings()
+            transport = httpx.HTTPTransport(
+                http2=settings.http2_enabled,
+                limits=httpx.Limits(
+                    max_connections=settings.http_max_connections,
+                    max_keepalive_connections=settings.http_max_connections,
+                    keepalive_expiry=settings.http_keepalive_expiry_seconds,
+                ),
+                retries=1,  # Retry failed connects only (never a sent request)
+            )
+            _http_client = httpx.Client(
+                transport=HostLimitedTransport(transport, settings.http_max_connections_per_host, _http_metrics),
+                timeout=httpx.Timeout(settings.http_timeout_seconds, connect=10.0),
+            )
+            logger.info(
+                f"Shared HTTP pool created (max_connections={settings.http_max_connections}, "
+                f"per_host={settings.http_max_connections_per_host}, http2={settings.http2_enabled})"
+            )
+        return _http_client
+
+
+def get_http_metrics() -> Dict[str, Dict[str, Any]]:
+    """Per-host connection reuse and handshake timings of the shared pool."""
+    return _http_metrics.snapshot()
+
+
+def reset_http_client():
+    """
+    Close and reset the shared HTTP client.
+    """
+    global _http_client
+    with _http_client_lock:
+        if _http_client is not None:
+            _http_client.close()
+        _http_client = None
@@ -16,6 +16,7 @@ from tenacity import (
 )
 
 from vina_backend.core.config import get_settings
+from vina_backend.integrations.http.pool import get_http_client
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -59,8 +60,14 @@ class ImagenClient:
         self.aspect_ratio = aspect_ratio
         self.semaphore = asyncio.Semaphore(max_concurrent)
         
-        # Initialize Google Gemini client
-        self.client = genai.Client(api_key=self.api_key)
+        # Initialize Google Gemini client (on the shared keep-alive pool if enabled)
+        if settings.http_pooling_enabled:
+            self.client = genai.Client(
+                api_key=self.api_key,
+                http_options=types.HttpOptions(httpx_client=get_http_client()),
+            )
+        else:
+            self.client = genai.Client(api_key=self.api_key)
         
         logger.info(f"Imagen client initialized (model={model}, aspect_ratio={aspect_ratio}, max_concurrent={max_concurrent})")
     
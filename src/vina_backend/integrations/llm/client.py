@@ -2,13 +2,28 @@
 LLM client wrapper for litellm.
 Provides a unified interface for multiple LLM providers (Anthropic, OpenAI, Gemini).
 """
+import asyncio
 import json
 import logging
+import threading
 import time
-from typing import Any, Dict, Optional, Literal, List
-from litellm import completion
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Literal, List, Tuple, Type
+import litellm
+from pydantic import BaseModel
 
 from vina_backend.core.config import get_settings
+from vina_backend.integrations.llm.health import get_health_registry
+from vina_backend.integrations.llm.key_pool import get_key_pool
+from vina_backend.integrations.llm.loop import run_sync
+from vina_backend.integrations.llm.rate_limit import TokenBucket, get_rate_limiter, estimate_request_tokens
+from vina_backend.integrations.llm.response_cache import LLMResponseCache, get_response_cache
+from vina_backend.integrations.llm.router import get_model_router, task_for_caller
+from vina_backend.integrations.llm.scheduler import get_scheduler
+from vina_backend.integrations.llm.transport import get_transport
+from vina_backend.integrations.llm.usage import UsageRecord, extract_token_counts, get_usage_tracker
+from vina_backend.utils.json_safety import loads_with_repair
+from vina_backend.utils.json_stream import JSONArrayStreamParser
 
 logger = logging.getLogger(__name__)
 
@@ -59,9 +74,28 @@ FALLBACK_MODELS = {
 }
 
 
+class LLMError(ValueError):
+    """An LLM call failed (a ValueError, like every generation failure before it)."""
+
+
+# Queued after the last element of a stream (see LLMClient._pump_stream)
+_STREAM_END = object()
+
+# (provider, model) that served the most recent call in this thread or task
+_last_model_used: ContextVar[Optional[Tuple[str, str]]] = ContextVar("llm_last_model_used", default=None)
+
+
 class LLMClient:
     """Wrapper around litellm for making LLM API calls across multiple providers."""
     
+    # litellm model names that rejected a JSON schema response_format at runtime.
+    # Shared across instances so the failed round trip is only paid once per process.
+    _structured_output_unsupported: set = set()
+    
+    # Per-minute budget for hedge requests, shared by every instance
+    _hedge_budget: Optional[TokenBucket] = None
+    _hedge_lock = threading.Lock()
+    
     def __init__(
         self,
         provider: Optional[Literal["anthropic", "openai", "gemini"]] = None,
@@ -74,29 +108,38 @@ class LLMClient:
         Args:
             provider: LLM provider to use (defaults to settings)
             model: Model to use (defaults to settings)
-            api_key: API key (defaults to settings based on provider)
+            api_key: API key (defaults to the provider's key pool from settings)
         """
         self.provider = provider or settings.llm_provider
         self.model = model or settings.llm_model
+        # Clients built for a specific model (benchmarks, judges) are never re-routed
+        self._explicit_model = model is not None
         
-        # Get API key for the specified provider (not the default one)
+        # An explicit key pins this client to it; otherwise calls rotate through the pool
+        self._pinned_api_key = bool(api_key)
         if api_key:
             self.api_key = api_key
         else:
-            # Get the key for THIS provider, not the default provider
-            key_map = {
-                "anthropic": settings.anthropic_api_key,
-                "openai": settings.openai_api_key,
-                "gemini": settings.gemini_api_key,
-            }
-            self.api_key = key_map.get(self.provider)
+            # Get the keys for THIS provider, not the default provider
+            keys = settings.get_api_keys(self.provider)
+            self.api_key = keys[0] if keys else None
             
-            if not self.api_key:
+            # Replayed recordings need no provider credentials
+            if not self.api_key and settings.llm_transport_mode != "replay":
                 raise ValueError(
                     f"No API key configured for provider '{self.provider}'. "
                     f"Please set {self.provider.upper()}_API_KEY in your .env file."
                 )
         
+        # Live, record or replay transport (see transport.py)
+        self.transport = get_transport()
+        
+        # Opt-in persistent response cache (can be overridden per call with use_cache)
+        self.use_response_cache = settings.llm_response_cache_enabled
+        
+        # Opt-in hedged requests against the next healthy fallback model
+        self.hedging_enabled = settings.llm_hedging_enabled
+        
         # Validate model matches provider
         self._validate_model()
     
@@ -138,21 +181,34 @@ class LLMClient:
             logger.warning(f"Using model '{self.model}' with provider '{self.provider}'")
             logger.info(f"Recommended models: {', '.join(recommended[:2])}")
     
-    def _get_safe_temperature(self, requested_temp: Optional[float] = None) -> float:
+    def _get_safe_temperature(
+        self,
+        requested_temp: Optional[float] = None,
+        provider: Optional[str] = None,
+        model: Optional[str] = None,
+    ) -> float:
         """
         Calculate a safe temperature based on 2026 provider guidelines.
         
         Special handling for Gemini 3 models which require temperature=1.0
         to avoid infinite loops and degraded reasoning performance.
+        
+        Args:
+            requested_temp: Temperature requested by the caller
+            provider: Provider of the route being called (defaults to the client's)
+            model: Model of the route being called (defaults to the client's)
         """
+        provider = provider or self.provider
+        model = model or self.model
+        
         # Check if this is a Gemini 3 model (gemini-3-* variants)
-        is_gemini_3 = self.provider == "gemini" and "gemini-3" in self.model.lower()
+        is_gemini_3 = provider == "gemini" and "gemini-3" in model.lower()
         
         # Force temperature=1.0 for Gemini 3 models (override requested temp)
         if is_gemini_3:
             if requested_temp is not None and requested_temp < 1.0:
                 logger.warning(
-                    f"Overriding temperature {requested_temp} → 1.0 for {self.model}. "
+                    f"Overriding temperature {requested_temp} → 1.0 for {model}. "
                     f"Gemini 3 models require temp=1.0 to avoid infinite loops and degraded performance."
                 )
             return 1.0
@@ -162,18 +218,321 @@ class LLMClient:
             return requested_temp
 
         # Use provider-specific defaults when no temperature is requested
-        if self.provider == "gemini":
+        if provider == "gemini":
             return 1.0  # Safe default for Gemini 2.5 and other Gemini models
-        elif self.provider == "anthropic":
+        elif provider == "anthropic":
             return 0.3  # Precision focus for Claude 4.5 analytical tasks
-        elif self.provider == "openai":
+        elif provider == "openai":
             # Check for reasoning models (o-series, gpt-5)
-            if any(m in self.model for m in ["o1", "o3", "gpt-5"]):
+            if any(m in model for m in ["o1", "o3", "gpt-5"]):
                 return 1.0
             return settings.llm_temperature
         
         return settings.llm_temperature
 
+    def _get_api_key_for(self, provider: str) -> Optional[str]:
+        """
+        Resolve the API key to use for a (possibly fallback) provider.
+        
+        A key passed to the constructor is always used for the client's own
+        provider; otherwise the next key is taken from the provider's pool
+        (least-recently-throttled first). In replay mode every provider gets a
+        placeholder key so the whole fallback chain can be exercised.
+        """
+        if settings.llm_transport_mode == "replay":
+            return (self.api_key if provider == self.provider else None) or "replay"
+        
+        if provider == self.provider and self._pinned_api_key:
+            return self.api_key
+        
+        if provider not in ("anthropic", "openai", "gemini"):
+            logger.error(f"Unknown provider: {provider}")
+            return None
+        return get_key_pool(provider).acquire()
+    
+    def _has_api_key(self, provider: str) -> bool:
+        """Whether any key is available for a provider (without taking one from the pool)."""
+        if settings.llm_transport_mode == "replay" or (provider == self.provider and self._pinned_api_key):
+            return True
+        return provider in ("anthropic", "openai", "gemini") and len(get_key_pool(provider)) > 0
+    
+    def _rotate_api_key(self, provider: str, api_key: str) -> Optional[str]:
+        """
+        Cool down a key that hit a 429 and pick another ready key from the pool.
+        
+        Returns:
+            A different key that is not cooling down, or None (pinned key,
+            single-key pool or every other key is cooling down)
+        """
+        if settings.llm_transport_mode == "replay" or (provider == self.provider and self._pinned_api_key):
+            return None
+        pool = get_key_pool(provider)
+        if len(pool) < 2:
+            return None
+        pool.mark_throttled(api_key)
+        next_key = pool.acquire(ready_only=True)
+        return next_key if next_key != api_key else None
+    
+    @staticmethod
+    def _format_model_name(provider: str, model: str) -> str:
+        """Format a (provider, model) pair for litellm (see _get_litellm_model_name)."""
+        if provider == "gemini" and not model.startswith("gemini/"):
+            return f"gemini/{model}"
+        return model
+    
+    @staticmethod
+    def _build_messages(prompt: str, system: Optional[str] = None) -> List[Dict[str, str]]:
+        """Build the litellm message list from a prompt and optional system prompt."""
+        messages = []
+        if system:
+            messages.append({"role": "system", "content": system})
+        messages.append({"role": "user", "content": prompt})
+        return messages
+    
+    def _get_models_to_try(self, caller: Optional[str] = None) -> List[Tuple[str, str]]:
+        """
+        Decide the route for a single request.
+        
+        Primary model followed by the configured fallback chain, with
+        duplicates dropped. With routing enabled, the models the router picks
+        for the caller's task come first. Models with an open circuit are
+        skipped at call time (see ModelHealthRegistry). The route is computed
+        per request and never written back to the client.
+        """
+        models_to_try = []
+        task = task_for_caller(caller)
+        if settings.llm_routing_enabled and task and not self._explicit_model:
+            models_to_try = [r for r in get_model_router().route(task) if self._has_api_key(r[0])]
+            if models_to_try:
+                logger.debug(f"Routing {task} ({caller}) to {models_to_try[0][0]}/{models_to_try[0][1]}")
+        
+        for route in [(self.provider, self.model), *FALLBACK_MODELS.get(self.provider, [])]:
+            if route not in models_to_try:
+                models_to_try.append(route)
+        return models_to_try
+    
+    @staticmethod
+    def _classify_error(error: Exception) -> str:
+        """
+        Classify a provider error for fallback handling.
+        
+        Returns:
+            "overloaded" (503), "rate_limit" (429), or "other"
+        """
+        error_str = str(error)
+        if any(code in error_str for code in ["503", "UNAVAILABLE", "overloaded"]):
+            return "overloaded"
+        if "429" in error_str:
+            return "rate_limit"
+        return "other"
+    
+    @staticmethod
+    def _is_schema_rejection(error: Exception) -> bool:
+        """
+        Whether a provider error is a 400 rejecting the JSON schema response_format.
+        
+        Timeouts, connection errors and other failures say nothing about schema
+        support and must not disable structured output for the model.
+        """
+        error_str = str(error).lower()
+        bad_request = (
+            getattr(error, "status_code", None) == 400
+            or type(error).__name__ == "BadRequestError"
+            or "400" in error_str
+        )
+        return bad_request and any(
+            term in error_str for term in ("response_format", "json_schema", "json schema", "response_schema")
+        )
+    
+    def _supports_structured_output(self, formatted_model: str) -> bool:
+        """Check whether litellm can pass a JSON schema response_format to this model."""
+        if formatted_model in self._structured_output_unsupported:
+            return False
+        try:
+            return litellm.supports_response_schema(model=formatted_model)
+        except Exception:
+            return False
+    
+    def _preflight_max_tokens(self, formatted_model: str, messages: List[Dict[str, Any]], max_tokens: int) -> int:
+        """
+        Check a request against the model's limits before sending it.
+        
+        Warns when prompt + output budget approaches the context window and
+        clamps max_tokens to the model's maximum output.
+        
+        Returns:
+            max_tokens to send
+        """
+        try:
+            info = litellm.get_model_info(model=formatted_model)
+        except Exception:
+            return max_tokens  # Unknown to litellm's model map
+        
+        max_output = info.get("max_output_tokens")
+        if max_output and max_tokens > max_output:
+            logger.info(f"Clamping max_tokens {max_tokens} -> {max_output} for {formatted_model}")
+            max_tokens = max_output
+        
+        context_window = info.get("max_input_tokens") or info.get("max_tokens")
+        if context_window:
+            prompt_tokens = estimate_request_tokens(messages, 0)
+            if prompt_tokens + max_tokens > settings.llm_context_warning_ratio * context_window:
+                logger.warning(
+                    f"Prompt for {formatted_model} is near its context limit: ~{prompt_tokens} prompt + "
+                    f"{max_tokens} output tokens of {context_window}"
+                )
+        return max_tokens
+    
+    @staticmethod
+    def _build_response_format(response_model: Type[BaseModel]) -> Dict[str, Any]:
+        """
+        Build a provider-native JSON schema response_format from a Pydantic model.
+        
+        strict is left off: our schemas use optional fields and defaults that
+        OpenAI's strict mode rejects. litellm translates this for Gemini and
+        Anthropic.
+        """
+        return {
+            "type": "json_schema",
+            "json_schema": {
+                "name": response_model.__name__,
+                "schema": response_model.model_json_schema(),
+                "strict": False,
+            },
+        }
+    
+    @staticmethod
+    def _build_completion_kwargs(
+        formatted_model: str,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: float,
+        api_key: str,
+        response_format: Optional[Dict[str, Any]] = None,
+        **extra: Any,
+    ) -> Dict[str, Any]:
+        """Assemble keyword arguments for litellm completion/acompletion."""
+        kwargs = {
+            "model": formatted_model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "api_key": api_key,
+            **extra,
+        }
+        if response_format:
+            kwargs["response_format"] = response_format
+        return kwargs
+    
+    @staticmethod
+    def _apply_prompt_cache_control(provider: str, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Mark the system prompt as a cacheable prefix.
+        
+        OpenAI and Gemini cache long identical prefixes automatically; Anthropic
+        only caches content blocks tagged with cache_control.
+        """
+        if provider != "anthropic" or not settings.llm_prompt_caching_enabled:
+            return messages
+        return [
+            {
+                "role": m["role"],
+                "content": [{"type": "text", "text": m["content"], "cache_control": {"type": "ephemeral"}}],
+            }
+            if m["role"] == "system" and isinstance(m["content"], str)
+            else m
+            for m in messages
+        ]
+    
+    def _on_model_success(self, provider: str, model: str, duration: float) -> None:
+        """Record a successful call in the health registry and remember the route used."""
+        get_health_registry().record_success(provider, model, duration)
+        _last_model_used.set((provider, model))
+        if provider != self.provider or model != self.model:
+            logger.info(f"Request served by fallback {provider}/{model} (primary: {self.provider}/{self.model})")
+    
+    def _get_response_cache_key(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float],
+        max_tokens: int,
+        use_cache: Optional[bool],
+        response_model: Optional[Type[BaseModel]] = None,
+    ) -> Optional[str]:
+        """
+        Fingerprint a request for the response cache.
+        
+        Returns:
+            Cache key, or None if caching is disabled for this call
+        """
+        enabled = self.use_response_cache if use_cache is None else use_cache
+        if not enabled:
+            return None
+        return LLMResponseCache.make_key(
+            self.provider,
+            self.model,
+            messages,
+            temperature,
+            max_tokens,
+            response_format=response_model.__name__ if response_model else None,
+        )
+    
+    @staticmethod
+    def _store_cached_response(cache_key: str, provider: str, model: str, content: str) -> None:
+        """Write a completion to the response cache; errors are logged, never raised."""
+        try:
+            get_response_cache().set(cache_key, provider, model, content)
+        except Exception as e:
+            logger.warning(f"Failed to cache LLM response from {provider}/{model}: {e}")
+    
+    @staticmethod
+    def _record_usage(
+        provider: str,
+        model: str,
+        response: Any,
+        duration: float,
+        caller: Optional[str] = None,
+    ) -> None:
+        """Record token usage and estimated cost of a successful completion."""
+        try:
+            prompt_tokens, completion_tokens, cached_tokens, cache_write_tokens = extract_token_counts(response)
+            try:
+                cost = litellm.completion_cost(completion_response=response) or 0.0
+            except Exception:
+                # Models missing from litellm's price map
+                cost = 0.0
+            get_usage_tracker().record(UsageRecord(
+                provider=provider,
+                model=model,
+                caller=caller or "unknown",
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                cached_tokens=cached_tokens,
+                cache_write_tokens=cache_write_tokens,
+                cost_usd=cost,
+                duration_seconds=round(duration, 3),
+            ))
+        except Exception as e:
+            logger.warning(f"Failed to record LLM usage for {provider}/{model}: {e}")
+    
+    @staticmethod
+    def _reconcile_rate_limit(provider: str, model: str, reserved_tokens: int, response: Any) -> None:
+        """Correct the TPM bucket with the usage the provider actually reported."""
+        usage = getattr(response, "usage", None)
+        total_tokens = getattr(usage, "total_tokens", None) if usage else None
+        if total_tokens:
+            get_rate_limiter().reconcile(provider, model, reserved_tokens, total_tokens)
+    
+    @property
+    def last_model_used(self) -> str:
+        """
+        Model that served the most recent call in the current thread or task.
+        
+        Falls back to the configured model if no call has completed yet.
+        """
+        route = _last_model_used.get()
+        return route[1] if route else self.model
+
     def generate(
         self,
         prompt: str,
@@ -182,10 +541,16 @@ class LLMClient:
         system: Optional[str] = None,
         max_retries: int = 2,
         retry_delay: float = 1.0,
+        use_cache: Optional[bool] = None,
+        response_model: Optional[Type[BaseModel]] = None,
+        caller: Optional[str] = None,
     ) -> str:
         """
         Generate text using the LLM with automatic fallback on 503 errors.
         
+        Sync wrapper around agenerate(), run on the shared LLM event loop
+        (see loop.py); must not be called from a coroutine on that loop.
+        
         Args:
             prompt: The prompt to send
             max_tokens: Maximum tokens to generate (defaults to settings)
@@ -193,6 +558,11 @@ class LLMClient:
             system: Optional system prompt
             max_retries: Maximum number of retries for rate limit errors (default: 2)
             retry_delay: Delay between retries in seconds for rate limits (default: 1.0)
+            use_cache: Read/write the persistent response cache (None follows
+                LLM_RESPONSE_CACHE_ENABLED, False bypasses it)
+            response_model: Optional Pydantic schema to request as provider-native
+                structured output; ignored for models that don't support it
+            caller: Tag recorded with the token usage (e.g. "lesson_reviewer")
         
         Returns:
             Generated text response
@@ -200,121 +570,357 @@ class LLMClient:
         Raises:
             ValueError: If generation fails after all model fallbacks
         """
+        async def _run() -> Tuple[str, Optional[Tuple[str, str]]]:
+            content = await self.agenerate(
+                prompt=prompt,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                system=system,
+                max_retries=max_retries,
+                retry_delay=retry_delay,
+                use_cache=use_cache,
+                response_model=response_model,
+                caller=caller,
+            )
+            return content, _last_model_used.get()
+        
+        # run_sync works on a copy of this context; carry the serving route back
+        content, route = run_sync(_run())
+        if route:
+            _last_model_used.set(route)
+        return content
+    
+    async def agenerate(
+        self,
+        prompt: str,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        system: Optional[str] = None,
+        max_retries: int = 2,
+        retry_delay: float = 1.0,
+        timeout: Optional[float] = None,
+        use_cache: Optional[bool] = None,
+        response_model: Optional[Type[BaseModel]] = None,
+        caller: Optional[str] = None,
+    ) -> str:
+        """
+        Generate text using the LLM with automatic fallback on 503 errors.
+        
+        The one implementation of the retry and fallback chain (generate()
+        wraps it). Backs off with asyncio.sleep so the event loop is never
+        blocked. Cancelling the awaiting task cancels the in-flight provider request
+        and stops walking the fallback chain.
+        
+        With hedging enabled, a primary model that is slower than its recent
+        latency percentile is raced against the next healthy fallback model.
+        
+        Args:
+            prompt: The prompt to send
+            max_tokens: Maximum tokens to generate (defaults to settings)
+            temperature: Sampling temperature 0-1 (None for intelligent default)
+            system: Optional system prompt
+            max_retries: Maximum number of retries for rate limit errors (default: 2)
+            retry_delay: Delay between retries in seconds for rate limits (default: 1.0)
+            timeout: Optional per-request timeout in seconds
+            use_cache: Read/write the persistent response cache (None follows settings)
+            response_model: Optional Pydantic schema for structured output
+            caller: Tag recorded with the token usage
+        
+        Returns:
+            Generated text response
+        
+        Raises:
+            ValueError: If generation fails after all model fallbacks
+            asyncio.CancelledError: If the calling task is cancelled
+        """
         max_tokens = max_tokens or settings.llm_max_tokens
-        safe_temp = self._get_safe_temperature(temperature)
+        messages = self._build_messages(prompt, system)
+        health = get_health_registry()
         
-        # Build messages for litellm
-        messages = []
-        if system:
-            messages.append({"role": "system", "content": system})
-        messages.append({"role": "user", "content": prompt})
+        cache_key = self._get_response_cache_key(messages, temperature, max_tokens, use_cache, response_model)
+        if cache_key:
+            cached_response = await asyncio.to_thread(get_response_cache().get, cache_key)
+            if cached_response is not None:
+                return cached_response
         
-        # Try with primary model first, then fallback models
-        # Primary model as tuple for consistent handling
-        models_to_try = [(self.provider, self.model)] + FALLBACK_MODELS.get(self.provider, [])
+        models_to_try = self._get_models_to_try(caller)
+        enforce_circuits = health.any_available(models_to_try)
+        call_args = dict(
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            max_retries=max_retries,
+            retry_delay=retry_delay,
+            timeout=timeout,
+            response_model=response_model,
+            caller=caller,
+        )
         
         last_error = None
+        tried = set()
         for model_index, (provider, model) in enumerate(models_to_try):
-            # Skip if this fallback model is the same as primary
-            if model_index > 0 and provider == self.provider and model == self.model:
+            if (provider, model) in tried:
+                continue
+            
+            if not self._has_api_key(provider):
+                logger.warning(f"No API key for fallback provider {provider}, skipping...")
+                continue
+            
+            if enforce_circuits and not health.acquire(provider, model):
+                logger.info(f"Circuit open for {provider}/{model}, skipping...")
                 continue
             
-            # Get API key for this provider
-            if provider != self.provider:
-                # Cross-provider fallback - need different API key
-                if provider == "anthropic":
-                    api_key = settings.anthropic_api_key
-                elif provider == "openai":
-                    api_key = settings.openai_api_key
-                elif provider == "gemini":
-                    api_key = settings.gemini_api_key
+            if model_index > 0:
+                logger.warning(f"Falling back to model: {provider}/{model}")
+            
+            tried.add((provider, model))
+            try:
+                if self.hedging_enabled and len(tried) == 1:
+                    content, route = await self._acall_hedged(
+                        provider, model, models_to_try[model_index + 1:], tried, **call_args
+                    )
                 else:
-                    logger.error(f"Unknown provider: {provider}")
-                    continue
-                
-                if not api_key:
-                    logger.warning(f"No API key for fallback provider {provider}, skipping...")
-                    continue
-            else:
-                api_key = self.api_key
+                    content = await self._acall_model(provider, model, **call_args)
+                    route = (provider, model)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                last_error = e
+                continue
             
-            # Try this model
-            for attempt in range(max_retries):
-                try:
-                    # Format model name for litellm
-                    if provider == "gemini" and not model.startswith("gemini/"):
-                        formatted_model = f"gemini/{model}"
-                    else:
-                        formatted_model = model
-                    
-                    if model_index > 0 and attempt == 0:
-                        logger.warning(f"Falling back to model: {provider}/{model}")
-                    
-                    if attempt > 0:
-                        logger.info(f"Retry {attempt}/{max_retries-1} for {formatted_model}")
-                    else:
-                        logger.info(f"Calling LLM ({formatted_model}) with {len(messages)} messages and temperature {safe_temp}")
-                    
-                    # Track call duration
+            if cache_key:
+                await asyncio.to_thread(self._store_cached_response, cache_key, route[0], route[1], content)
+            return content
+        
+        logger.error(f"All models failed across providers")
+        raise LLMError(
+            f"LLM generation failed after trying {len(models_to_try)} models: {str(last_error)}"
+        ) from last_error
+    
+    async def _acall_model(
+        self,
+        provider: str,
+        model: str,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: Optional[float],
+        max_retries: int,
+        retry_delay: float,
+        timeout: Optional[float],
+        response_model: Optional[Type[BaseModel]],
+        caller: Optional[str] = None,
+    ) -> str:
+        """
+        Call a single model with rate-limit retries (async).
+        
+        The caller must already hold the model's circuit (health.acquire).
+        
+        Returns:
+            Stripped response text
+        
+        Raises:
+            Exception: The last provider error once this model is given up on
+        """
+        health = get_health_registry()
+        limiter = get_rate_limiter()
+        scheduler = get_scheduler()
+        reserved_tokens = estimate_request_tokens(messages, max_tokens)
+        api_key = self._get_api_key_for(provider)
+        
+        formatted_model = self._format_model_name(provider, model)
+        safe_temp = self._get_safe_temperature(temperature, provider, model)
+        model_max_tokens = self._preflight_max_tokens(formatted_model, messages, max_tokens)
+        response_format = None
+        if response_model and self._supports_structured_output(formatted_model):
+            response_format = self._build_response_format(response_model)
+        
+        last_error = None
+        for attempt in range(max_retries):
+            reserved = False
+            try:
+                if attempt > 0:
+                    logger.info(f"Retry {attempt}/{max_retries-1} for {formatted_model}")
+                else:
+                    logger.info(f"Calling LLM async ({formatted_model}) with {len(messages)} messages and temperature {safe_temp}")
+                
+                # Reserve RPM/TPM capacity before queueing for a scheduler slot
+                await limiter.aacquire(provider, model, reserved_tokens)
+                reserved = True
+                
+                async with scheduler.aslot():
                     start_time = time.time()
                     
-                    # litellm handles provider routing internally based on model name
-                    response = completion(
-                        model=formatted_model,
-                        messages=messages,
-                        max_tokens=max_tokens,
-                        temperature=safe_temp,
-                        api_key=api_key,
+                    response = await self.transport.acomplete(
+                        **self._build_completion_kwargs(
+                            formatted_model, self._apply_prompt_cache_control(provider, messages),
+                            model_max_tokens, safe_temp, api_key, response_format,
+                            timeout=timeout,
+                        )
                     )
                     
                     duration = time.time() - start_time
-                    logger.info(f"LLM call to {formatted_model} took {duration:.2f}s")
-                    
-                    logger.debug(f"LLM response received. Length: {len(response.choices[0].message.content)} chars")
-                    
-                    # Success! Update the instance model and provider if we used a fallback
-                    if provider != self.provider or model != self.model:
-                        logger.info(f"Successfully switched from {self.provider}/{self.model} to {provider}/{model}")
-                        self.provider = provider
-                        self.model = model
-                        self.api_key = api_key
-                    
-                    return response.choices[0].message.content.strip()
+                reserved = False
+                logger.info(f"LLM call to {formatted_model} took {duration:.2f}s")
                 
-                except Exception as e:
-                    last_error = e
-                    error_str = str(e)
-                    
-                    # Check error type
-                    is_overloaded = any(code in error_str for code in ["503", "UNAVAILABLE", "overloaded"])
-                    is_rate_limit = "429" in error_str
-                    is_server_error = "500" in error_str
-                    
-                    # For 503/overload errors, immediately try next model (no retries)
-                    if is_overloaded:
-                        logger.warning(f"Model {formatted_model} is overloaded (503). Switching to next model...")
-                        break  # Move to next model immediately
-                    
-                    # For rate limits (429), retry with backoff
-                    elif is_rate_limit and attempt < max_retries - 1:
-                        wait_time = retry_delay * (2 ** attempt)
-                        logger.warning(f"Rate limit hit with {formatted_model}. Retrying in {wait_time}s...")
-                        time.sleep(wait_time)
-                        continue
-                    
-                    # For other errors, try next model
+                content = response.choices[0].message.content
+                logger.debug(f"LLM response received. Length: {len(content)} chars")
+                
+                self._on_model_success(provider, model, duration)
+                self._record_usage(provider, model, response, duration, caller)
+                self._reconcile_rate_limit(provider, model, reserved_tokens, response)
+                
+                return content.strip()
+            
+            except asyncio.CancelledError:
+                logger.info(f"LLM call to {formatted_model} cancelled")
+                health.release(provider, model)
+                if reserved:
+                    limiter.refund(provider, model, reserved_tokens)
+                raise
+            
+            except Exception as e:
+                last_error = e
+                error_kind = self._classify_error(e)
+                # A 429 on one pooled key doesn't count against the model while other keys can serve
+                next_key = self._rotate_api_key(provider, api_key) if error_kind == "rate_limit" else None
+                health.record_failure(provider, model, "key_rate_limit" if next_key else error_kind)
+                if error_kind == "rate_limit":
+                    limiter.penalize(provider, model)
+                elif reserved:
+                    limiter.refund(provider, model, reserved_tokens)
+                
+                # Schema rejected by the provider: retry the same model without it
+                if response_format and self._is_schema_rejection(e):
+                    logger.warning(f"Structured output rejected by {formatted_model}, retrying without schema: {e}")
+                    self._structured_output_unsupported.add(formatted_model)
+                    response_format = None
+                    continue
+                
+                if error_kind == "overloaded":
+                    logger.warning(f"Model {formatted_model} is overloaded (503). Switching to next model...")
+                    break
+                
+                elif next_key and attempt < max_retries - 1:
+                    logger.warning(f"Rate limit hit with {formatted_model} on key {api_key[:8]}..., switching key")
+                    api_key = next_key
+                    continue
+                
+                elif (
+                    error_kind == "rate_limit"
+                    and attempt < max_retries - 1
+                    and health.is_available(provider, model)
+                ):
+                    wait_time = retry_delay * (2 ** attempt)
+                    logger.warning(f"Rate limit hit with {formatted_model}. Retrying in {wait_time}s...")
+                    await asyncio.sleep(wait_time)
+                    continue
+                
+                else:
+                    if error_kind == "rate_limit":
+                        logger.error(f"Model {formatted_model} rate limit persists after retries")
                     else:
-                        if is_rate_limit:
-                            logger.error(f"Model {formatted_model} rate limit persists after retries")
-                        else:
-                            logger.error(f"Error with {formatted_model}: {error_str}")
-                        break  # Move to next model
-        
-        # All models failed
-        logger.exception(f"All models failed across providers")
-        raise ValueError(
-            f"LLM generation failed after trying {len(models_to_try)} models: {str(last_error)}"
-        ) from last_error
+                        logger.error(f"Error with {formatted_model}: {e}")
+                    break
+        
+        if last_error is None:
+            # No attempt made (max_retries < 1): hand back the circuit the caller acquired
+            health.release(provider, model)
+            raise LLMError(f"No attempt made for {formatted_model} (max_retries={max_retries})")
+        raise last_error
+    
+    @classmethod
+    def _take_hedge_budget(cls) -> bool:
+        """Consume one hedge from the process-wide per-minute budget."""
+        with cls._hedge_lock:
+            if cls._hedge_budget is None:
+                cls._hedge_budget = TokenBucket(settings.llm_hedge_max_per_minute)
+            if cls._hedge_budget.wait_time(1) > 0:
+                return False
+            cls._hedge_budget.consume(1)
+            return True
+    
+    def _get_hedge_delay(self, provider: str, model: str) -> float:
+        """Seconds to wait on the primary model before sending a hedge request."""
+        delay = get_health_registry().latency_percentile(
+            provider, model, settings.llm_hedge_latency_percentile
+        )
+        return delay if delay is not None else settings.llm_hedge_default_delay_seconds
+    
+    async def _acall_hedged(
+        self,
+        provider: str,
+        model: str,
+        candidates: List[Tuple[str, str]],
+        tried: set,
+        **call_args: Any,
+    ) -> Tuple[str, Tuple[str, str]]:
+        """
+        Call the primary model and, if it is slow, race it against a hedge.
+        
+        The hedge goes to the first candidate with an API key and an available
+        circuit, as long as the per-minute hedge budget allows it. The first
+        successful response wins and the other request is cancelled.
+        
+        Args:
+            provider: Primary provider (circuit already acquired)
+            model: Primary model
+            candidates: Remaining fallback chain to pick the hedge model from
+            tried: Routes already used; the hedge route is added to it
+            **call_args: Forwarded to _acall_model
+        
+        Returns:
+            (content, (provider, model)) of the winning request
+        
+        Raises:
+            Exception: The primary's error if no request succeeded
+        """
+        health = get_health_registry()
+        primary = asyncio.create_task(self._acall_model(provider, model, **call_args))
+        tasks = {primary: (provider, model)}
+        
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=self._get_hedge_delay(provider, model))
+            
+            if not done:
+                hedge_route = next(
+                    (
+                        route for route in candidates
+                        if route not in tried
+                        and self._has_api_key(route[0])
+                        and health.is_available(*route)
+                    ),
+                    None,
+                )
+                if hedge_route and self._take_hedge_budget() and health.acquire(*hedge_route):
+                    logger.warning(
+                        f"{provider}/{model} slower than p{settings.llm_hedge_latency_percentile:.0f}, "
+                        f"hedging with {hedge_route[0]}/{hedge_route[1]}"
+                    )
+                    tried.add(hedge_route)
+                    tasks[asyncio.create_task(self._acall_model(*hedge_route, **call_args))] = hedge_route
+            
+            pending = set(tasks)
+            primary_error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        route = tasks[task]
+                        # Tasks run in a copy of the context; record the winner here
+                        _last_model_used.set(route)
+                        if route != (provider, model):
+                            logger.warning(f"Hedge request to {route[0]}/{route[1]} won")
+                        return task.result(), route
+                    if task is primary:
+                        primary_error = task.exception()
+            
+            raise primary_error
+        
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
     
     def generate_json(
         self,
@@ -322,17 +928,25 @@ class LLMClient:
         max_tokens: Optional[int] = None,
         temperature: Optional[float] = None,
         system: Optional[str] = None,
+        use_cache: Optional[bool] = None,
+        response_model: Optional[Type[BaseModel]] = None,
+        caller: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Generate JSON using the LLM and parse it.
         
-        Handles common formatting issues like markdown code fences.
+        Handles common formatting issues like markdown code fences. When
+        response_model is given, providers that support JSON schema output are
+        asked for it natively; others fall back to prompt-only JSON.
         
         Args:
             prompt: The prompt to send
             max_tokens: Maximum tokens to generate
             temperature: Sampling temperature
             system: Optional system prompt
+            use_cache: Read/write the persistent response cache (None follows settings)
+            response_model: Optional Pydantic schema for structured output
+            caller: Tag recorded with the token usage (e.g. "lesson_generator")
         
         Returns:
             Parsed JSON as dictionary
@@ -345,13 +959,317 @@ class LLMClient:
             max_tokens=max_tokens,
             temperature=temperature,
             system=system,
+            use_cache=use_cache,
+            response_model=response_model,
+            caller=caller,
         )
+        try:
+            parsed = self._parse_json_response(response)
+        except ValueError:
+            self._discard_cached_response(prompt, system, temperature, max_tokens, use_cache, response_model)
+            raise
+        if not self._matches_response_model(parsed, response_model):
+            # The caller will reject it and retry; don't let the retry replay it from the cache
+            self._discard_cached_response(prompt, system, temperature, max_tokens, use_cache, response_model)
+        return parsed
+    
+    async def agenerate_json(
+        self,
+        prompt: str,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        system: Optional[str] = None,
+        timeout: Optional[float] = None,
+        use_cache: Optional[bool] = None,
+        response_model: Optional[Type[BaseModel]] = None,
+        caller: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Async version of generate_json().
         
+        Args:
+            prompt: The prompt to send
+            max_tokens: Maximum tokens to generate
+            temperature: Sampling temperature
+            system: Optional system prompt
+            timeout: Optional per-request timeout in seconds
+            use_cache: Read/write the persistent response cache (None follows settings)
+            response_model: Optional Pydantic schema for structured output
+            caller: Tag recorded with the token usage (e.g. "quiz_reviewer")
+        
+        Returns:
+            Parsed JSON as dictionary
+        
+        Raises:
+            ValueError: If generation or parsing fails
+        """
+        response = await self.agenerate(
+            prompt=prompt,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            system=system,
+            timeout=timeout,
+            use_cache=use_cache,
+            response_model=response_model,
+            caller=caller,
+        )
+        try:
+            parsed = self._parse_json_response(response)
+        except ValueError:
+            await asyncio.to_thread(
+                self._discard_cached_response, prompt, system, temperature, max_tokens, use_cache, response_model
+            )
+            raise
+        if not self._matches_response_model(parsed, response_model):
+            await asyncio.to_thread(
+                self._discard_cached_response, prompt, system, temperature, max_tokens, use_cache, response_model
+            )
+        return parsed
+    
+    async def astream_json_items(
+        self,
+        prompt: str,
+        array_key: str,
+        item_model: Optional[Type[BaseModel]] = None,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        system: Optional[str] = None,
+        timeout: Optional[float] = None,
+        response_model: Optional[Type[BaseModel]] = None,
+        caller: Optional[str] = None,
+        on_complete: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> AsyncIterator[Any]:
+        """
+        Streaming variant of agenerate_json(): yield each element of a
+        top-level JSON array as soon as its closing bracket arrives.
+        
+        Example:
+            async for slide in client.astream_json_items(prompt, "slides", SlideContent):
+                start_tts(slide)
+        
+        Falls back to the next model only while nothing has been yielded yet.
+        Streams bypass the response cache and hedging. The scheduler slot is
+        released as soon as the provider stream ends, however slowly the
+        elements are consumed.
+        
+        Args:
+            prompt: The prompt to send
+            array_key: Top-level key of the array to stream (e.g. "slides")
+            item_model: Optional Pydantic model each element is validated into
+            max_tokens: Maximum tokens to generate
+            temperature: Sampling temperature
+            system: Optional system prompt
+            timeout: Optional per-request timeout in seconds
+            response_model: Optional Pydantic schema for structured output
+            caller: Tag recorded with the token usage
+            on_complete: Called with the full parsed JSON once the stream ends
+        
+        Yields:
+            Array elements (item_model instances if given, otherwise dicts)
+        
+        Raises:
+            ValueError: If every model fails before streaming starts, or an element is invalid
+        """
+        max_tokens = max_tokens or settings.llm_max_tokens
+        messages = self._build_messages(prompt, system)
+        health = get_health_registry()
+        limiter = get_rate_limiter()
+        reserved_tokens = estimate_request_tokens(messages, max_tokens)
+        
+        models_to_try = self._get_models_to_try(caller)
+        enforce_circuits = health.any_available(models_to_try)
+        
+        last_error = None
+        for provider, model in models_to_try:
+            if not self._has_api_key(provider):
+                continue
+            if enforce_circuits and not health.acquire(provider, model):
+                logger.info(f"Circuit open for {provider}/{model}, skipping...")
+                continue
+            
+            api_key = self._get_api_key_for(provider)
+            formatted_model = self._format_model_name(provider, model)
+            safe_temp = self._get_safe_temperature(temperature, provider, model)
+            model_max_tokens = self._preflight_max_tokens(formatted_model, messages, max_tokens)
+            response_format = None
+            if response_model and self._supports_structured_output(formatted_model):
+                response_format = self._build_response_format(response_model)
+            
+            parser = JSONArrayStreamParser(array_key)
+            chunks = []
+            queue: asyncio.Queue = asyncio.Queue()
+            producer = None
+            reserved = False
+            invalid_item = False
+            yielded = 0
+            try:
+                await limiter.aacquire(provider, model, reserved_tokens)
+                reserved = True
+                logger.info(f"Streaming LLM ({formatted_model}) with {len(messages)} messages")
+                # The stream is read in its own task so the scheduler slot is held only
+                # while the provider streams, not while a slow consumer handles items
+                producer = asyncio.create_task(self._pump_stream(
+                    self._build_completion_kwargs(
+                        formatted_model, self._apply_prompt_cache_control(provider, messages),
+                        model_max_tokens, safe_temp, api_key, response_format,
+                        timeout=timeout,
+                    ),
+                    parser, chunks, queue,
+                ))
+                
+                while True:
+                    item = await queue.get()
+                    if item is _STREAM_END:
+                        break
+                    try:
+                        item = self._validate_stream_item(item, item_model, array_key, yielded + 1)
+                    except ValueError:
+                        invalid_item = True
+                        raise
+                    yield item
+                    yielded += 1
+                
+                duration = await producer
+            
+            except (asyncio.CancelledError, GeneratorExit):
+                logger.info(f"Stream from {formatted_model} closed early")
+                if producer:
+                    producer.cancel()
+                health.release(provider, model)
+                if reserved:
+                    limiter.refund(provider, model, reserved_tokens)
+                raise
+            
+            except Exception as e:
+                if producer:
+                    producer.cancel()
+                if invalid_item:
+                    # The model answered; its output is rejected, not the model
+                    health.release(provider, model)
+                    limiter.refund(provider, model, reserved_tokens)
+                    raise
+                last_error = e
+                error_kind = self._classify_error(e)
+                if error_kind == "rate_limit":
+                    self._rotate_api_key(provider, api_key)
+                    limiter.penalize(provider, model)
+                elif reserved:
+                    limiter.refund(provider, model, reserved_tokens)
+                health.record_failure(provider, model, error_kind)
+                if yielded:
+                    # Elements were already handed out; switching models would duplicate them
+                    logger.error(f"Stream from {formatted_model} failed after {yielded} {array_key}: {e}")
+                    raise
+                logger.warning(f"Streaming from {formatted_model} failed before any output: {e}")
+                continue
+            
+            logger.info(f"LLM stream from {formatted_model} took {duration:.2f}s ({parser.items_emitted} {array_key})")
+            response = litellm.stream_chunk_builder(chunks, messages=messages) if chunks else None
+            self._on_model_success(provider, model, duration)
+            self._record_usage(provider, model, response, duration, caller)
+            self._reconcile_rate_limit(provider, model, reserved_tokens, response)
+            
+            if on_complete:
+                on_complete(self._parse_json_response(parser.text))
+            return
+        
+        logger.error(f"All models failed to stream")
+        raise LLMError(
+            f"LLM streaming failed after trying {len(models_to_try)} models: {str(last_error)}"
+        ) from last_error
+    
+    async def _pump_stream(
+        self,
+        completion_kwargs: Dict[str, Any],
+        parser: JSONArrayStreamParser,
+        chunks: List[Any],
+        queue: asyncio.Queue,
+    ) -> float:
+        """
+        Read a provider stream while holding a scheduler slot, queueing each
+        completed array element as it arrives.
+        
+        _STREAM_END is always queued last, also when the stream fails.
+        
+        Returns:
+            Duration of the stream in seconds
+        """
+        try:
+            async with get_scheduler().aslot():
+                start_time = time.time()
+                async for chunk in self.transport.astream(**completion_kwargs):
+                    chunks.append(chunk)
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        for item in parser.feed(delta):
+                            queue.put_nowait(item)
+                return time.time() - start_time
+        finally:
+            queue.put_nowait(_STREAM_END)
+    
+    @staticmethod
+    def _validate_stream_item(
+        item: Any,
+        item_model: Optional[Type[BaseModel]],
+        array_key: str,
+        index: int,
+    ) -> Any:
+        """Validate a streamed array element against item_model (if given)."""
+        if item_model is None:
+            return item
+        try:
+            return item_model(**item)
+        except Exception as e:
+            raise ValueError(f"Streamed {array_key} element {index} is invalid: {e}") from e
+    
+    @staticmethod
+    def _matches_response_model(parsed: Any, response_model: Optional[Type[BaseModel]]) -> bool:
+        """Whether parsed JSON validates against response_model (always True without one)."""
+        if response_model is None:
+            return True
+        try:
+            response_model.model_validate(parsed)
+            return True
+        except ValueError:
+            return False
+    
+    def _discard_cached_response(
+        self,
+        prompt: str,
+        system: Optional[str],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        use_cache: Optional[bool],
+        response_model: Optional[Type[BaseModel]] = None,
+    ) -> None:
+        """Drop a cached response that failed to parse or validate so a rerun asks the model again."""
+        cache_key = self._get_response_cache_key(
+            self._build_messages(prompt, system),
+            temperature,
+            max_tokens or settings.llm_max_tokens,
+            use_cache,
+            response_model,
+        )
+        if cache_key:
+            get_response_cache().delete(cache_key)
+    
+    def _parse_json_response(self, response: str) -> Dict[str, Any]:
+        """
+        Clean and parse a raw LLM response as JSON.
+        
+        Malformed output (truncation, trailing commas, bad escaping) is repaired
+        locally before giving up, so callers only re-prompt when repair fails.
+        """
         # Clean up common formatting issues
         cleaned = self._clean_json_response(response)
         
         try:
-            return json.loads(cleaned)
+            parsed, repairs = loads_with_repair(cleaned)
+            if repairs:
+                logger.warning(
+                    f"Repaired malformed JSON from {self.provider}/{self.model}: {'; '.join(repairs)}"
+                )
+            return parsed
         except json.JSONDecodeError as e:
             raise ValueError(
                 f"Failed to parse LLM response as JSON: {str(e)}\n"
@@ -411,6 +1329,7 @@ class LLMClient:
             "model": self.model,
             "api_key_set": bool(self.api_key),
             "api_key_preview": f"{self.api_key[:8]}..." if self.api_key else "NOT SET",
+            "api_key_pool_size": 1 if self._pinned_api_key else len(get_key_pool(self.provider)),
         }
 
 
@@ -0,0 +1,275 @@
+"""
+Process-wide health registry for LLM models.
+
+Tracks error rate and latency per (provider, model) and runs a simple
+circuit breaker so that an overloaded model is skipped for a cooldown
+window instead of costing every request a failed round trip.
+
+Circuit states:
+- closed:    model is healthy, requests flow normally
+- open:      repeated 503/429s, model is skipped until the cooldown expires
+- half_open: cooldown expired, a single probe request is let through;
+             success closes the circuit, failure re-opens it
+"""
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Error kinds (see LLMClient._classify_error) that count towards opening a circuit
+TRIPPING_ERRORS = {"overloaded", "rate_limit"}
+
+
+@dataclass
+class ModelHealth:
+    """Rolling health statistics for a single (provider, model)."""
+    provider: str
+    model: str
+    state: str = "closed"
+    consecutive_failures: int = 0
+    total_calls: int = 0
+    total_failures: int = 0
+    latency_ema: Optional[float] = None
+    opened_at: Optional[float] = None
+    probe_in_flight: bool = False
+    recent_outcomes: Deque[bool] = field(default_factory=lambda: deque(maxlen=20))
+    recent_latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=20))
+
+    @property
+    def error_rate(self) -> float:
+        """Error rate over the recent outcome window."""
+        if not self.recent_outcomes:
+            return 0.0
+        failures = sum(1 for ok in self.recent_outcomes if not ok)
+        return failures / len(self.recent_outcomes)
+
+
+class ModelHealthRegistry:
+    """
+    Thread-safe registry of model health shared by every LLMClient in the process.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        cooldown_seconds: float = 30.0,
+        window_size: int = 20,
+        latency_alpha: float = 0.3,
+    ):
+        """
+        Initialize the registry.
+
+        Args:
+            failure_threshold: Consecutive 503/429 failures before a circuit opens
+            cooldown_seconds: How long an open circuit stays open before a probe
+            window_size: Number of recent outcomes used for the error rate
+            latency_alpha: Smoothing factor for the latency moving average
+        """
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.window_size = window_size
+        self.latency_alpha = latency_alpha
+        self._models: Dict[Tuple[str, str], ModelHealth] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, provider: str, model: str) -> ModelHealth:
+        key = (provider, model)
+        if key not in self._models:
+            self._models[key] = ModelHealth(
+                provider=provider,
+                model=model,
+                recent_outcomes=deque(maxlen=self.window_size),
+                recent_latencies=deque(maxlen=self.window_size),
+            )
+        return self._models[key]
+
+    def acquire(self, provider: str, model: str) -> bool:
+        """
+        Check whether a request may be sent to this model right now.
+
+        An open circuit whose cooldown has expired moves to half_open and
+        lets exactly one probe through; callers that are refused should move
+        on to the next model in the chain.
+
+        Returns:
+            True if the request may proceed
+        """
+        with self._lock:
+            health = self._get(provider, model)
+
+            if health.state == "closed":
+                return True
+
+            if health.state == "open":
+                if time.monotonic() - health.opened_at < self.cooldown_seconds:
+                    return False
+                logger.info(f"Circuit for {provider}/{model} half-open, sending probe request")
+                health.state = "half_open"
+                health.probe_in_flight = True
+                return True
+
+            # half_open: only one probe at a time
+            if health.probe_in_flight:
+                return False
+            health.probe_in_flight = True
+            return True
+
+    def release(self, provider: str, model: str) -> None:
+        """Give back a half-open probe slot without recording an outcome (e.g. on cancellation)."""
+        with self._lock:
+            self._get(provider, model).probe_in_flight = False
+
+    def is_available(self, provider: str, model: str) -> bool:
+        """Read-only availability check (does not claim a half-open probe)."""
+        with self._lock:
+            health = self._get(provider, model)
+            if health.state == "closed":
+                return True
+            if health.state == "open":
+                return time.monotonic() - health.opened_at >= self.cooldown_seconds
+            return not health.probe_in_flight
+
+    def record_success(self, provider: str, model: str, latency_seconds: float) -> None:
+        """Record a successful call and close the circuit if it was probing."""
+        with self._lock:
+            health = self._get(provider, model)
+            health.total_calls += 1
+            health.consecutive_failures = 0
+            health.recent_outcomes.append(True)
+            health.recent_latencies.append(latency_seconds)
+            if health.latency_ema is None:
+                health.latency_ema = latency_seconds
+            else:
+                health.latency_ema = (
+                    self.latency_alpha * latency_seconds
+                    + (1 - self.latency_alpha) * health.latency_ema
+                )
+
+            if health.state != "closed":
+                logger.info(f"Circuit for {provider}/{model} closed after successful probe")
+            health.state = "closed"
+            health.opened_at = None
+            health.probe_in_flight = False
+
+    def record_failure(self, provider: str, model: str, error_kind: str) -> None:
+        """
+        Record a failed call.
+
+        Only overload (503) and rate-limit (429) errors count towards opening
+        the circuit; other errors are tracked in the error rate only.
+        """
+        with self._lock:
+            health = self._get(provider, model)
+            health.total_calls += 1
+            health.total_failures += 1
+            health.recent_outcomes.append(False)
+
+            if error_kind not in TRIPPING_ERRORS:
+                if health.state == "half_open":
+                    health.probe_in_flight = False
+                return
+
+            health.consecutive_failures += 1
+
+            if health.state == "half_open" or health.consecutive_failures >= self.failure_threshold:
+                if health.state != "open":
+                    logger.warning(
+                        f"Opening circuit for {provider}/{model} for {self.cooldown_seconds:.0f}s "
+                        f"({health.consecutive_failures} consecutive {error_kind} errors)"
+                    )
+                health.state = "open"
+                health.opened_at = time.monotonic()
+                health.probe_in_flight = False
+
+    def latency_percentile(
+        self,
+        provider: str,
+        model: str,
+        percentile: float,
+        min_samples: int = 5,
+    ) -> Optional[float]:
+        """
+        Latency percentile over the recent successful calls of a model.
+
+        Args:
+            percentile: Percentile in the range 0-100
+            min_samples: Minimum number of samples required for an estimate
+
+        Returns:
+            Latency in seconds, or None if there are too few samples
+        """
+        with self._lock:
+            samples = sorted(self._get(provider, model).recent_latencies)
+        if len(samples) < min_samples:
+            return None
+        index = min(len(samples) - 1, int(round(percentile / 100 * (len(samples) - 1))))
+        return samples[index]
+
+    def any_available(self, candidates: List[Tuple[str, str]]) -> bool:
+        """
+        Check whether at least one candidate has a closed or probe-ready circuit.
+
+        Callers use this to decide whether to enforce circuits at all: if every
+        candidate is open, the request is still attempted against the full
+        chain rather than failing without a single call.
+        """
+        if any(self.is_available(*c) for c in candidates):
+            return True
+        logger.warning("All candidate models have open circuits; trying full chain anyway")
+        return False
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """
+        Get a point-in-time view of every tracked model.
+
+        Returns:
+            Dictionary keyed by "provider/model"
+        """
+        with self._lock:
+            return {
+                f"{h.provider}/{h.model}": {
+                    "state": h.state,
+                    "total_calls": h.total_calls,
+                    "total_failures": h.total_failures,
+                    "error_rate": round(h.error_rate, 3),
+                    "latency_ema_seconds": round(h.latency_ema, 2) if h.latency_ema is not None else None,
+                    "consecutive_failures": h.consecutive_failures,
+                }
+                for h in self._models.values()
+            }
+
+
+# Global registry instance (lazy initialization)
+_health_registry: Optional[ModelHealthRegistry] = None
+
+
+def get_health_registry() -> ModelHealthRegistry:
+    """
+    Get or create the process-wide model health registry.
+
+    Returns:
+        ModelHealthRegistry configured from settings
+    """
+    global _health_registry
+    if _health_registry is None:
+        from vina_backend.core.config import get_settings
+
+        settings = get_settings()
+        _health_registry = ModelHealthRegistry(
+            failure_threshold=settings.llm_circuit_failure_threshold,
+            cooldown_seconds=settings.llm_circuit_cooldown_seconds,
+        )
+    return _health_registry
+
+
+def reset_health_registry():
+    """
+    Reset the global health registry.
+    Useful for testing.
+    """
+    global _health_registry
+    _health_registry = None
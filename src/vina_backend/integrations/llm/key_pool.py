@@ -0,0 +1,142 @@
+"""
+Pools of API keys per provider.
+
+A single key caps throughput at one account's rate limit. With several keys
+configured (e.g. GEMINI_API_KEYS), each call takes the least-recently-throttled
+key that is not cooling down, spreading load across accounts. A key that
+returns a 429 cools down on its own while the other keys keep serving.
+"""
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _KeyState:
+    """Throttling state of one API key."""
+    key: str
+    cooldown_until: float = 0.0
+    last_throttled: float = 0.0  # monotonic; 0 = never throttled
+    last_used: float = 0.0
+    throttle_count: int = 0
+
+
+class APIKeyPool:
+    """
+    Thread-safe key pool for one provider.
+    """
+
+    def __init__(self, keys: List[str], cooldown_seconds: float = 60.0):
+        """
+        Initialize the pool.
+
+        Args:
+            keys: API keys for the provider (duplicates are ignored)
+            cooldown_seconds: How long a key is skipped after a 429
+        """
+        self.cooldown_seconds = cooldown_seconds
+        self._states = [_KeyState(key) for key in dict.fromkeys(k for k in keys if k)]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def acquire(self, ready_only: bool = False) -> Optional[str]:
+        """
+        Pick the key for the next call.
+
+        Keys that are not cooling down are ranked by least-recently-throttled,
+        then least-recently-used (round robin among unthrottled keys). If every
+        key is cooling down, the one that recovers first is returned.
+
+        Args:
+            ready_only: Return None instead of a cooling-down key
+
+        Returns:
+            API key, or None if the pool is empty (or nothing is ready)
+        """
+        with self._lock:
+            if not self._states:
+                return None
+            now = time.monotonic()
+            ready = [s for s in self._states if s.cooldown_until <= now]
+            if ready:
+                state = min(ready, key=lambda s: (s.last_throttled, s.last_used))
+            elif ready_only:
+                return None
+            else:
+                state = min(self._states, key=lambda s: s.cooldown_until)
+            state.last_used = now
+            return state.key
+
+    def mark_throttled(self, key: str, cooldown_seconds: Optional[float] = None) -> None:
+        """Put a key into cooldown after the provider returned a 429 for it."""
+        with self._lock:
+            for state in self._states:
+                if state.key == key:
+                    now = time.monotonic()
+                    state.cooldown_until = now + (cooldown_seconds or self.cooldown_seconds)
+                    state.last_throttled = now
+                    state.throttle_count += 1
+                    ready = sum(1 for s in self._states if s.cooldown_until <= now)
+                    logger.warning(
+                        f"API key {key[:8]}... throttled, cooling down for "
+                        f"{cooldown_seconds or self.cooldown_seconds:.0f}s ({ready}/{len(self._states)} keys ready)"
+                    )
+                    return
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Per-key state for debugging/metrics (keys are truncated)."""
+        with self._lock:
+            now = time.monotonic()
+            return [
+                {
+                    "key_preview": f"{s.key[:8]}...",
+                    "cooling_down_seconds": round(max(0.0, s.cooldown_until - now), 1),
+                    "throttle_count": s.throttle_count,
+                }
+                for s in self._states
+            ]
+
+
+# Global pools per provider (lazy initialization)
+_key_pools: Optional[Dict[str, APIKeyPool]] = None
+_key_pools_lock = threading.Lock()
+
+
+def get_key_pool(provider: str) -> APIKeyPool:
+    """
+    Get the process-wide key pool for a provider.
+
+    Args:
+        provider: LLM provider name
+
+    Returns:
+        APIKeyPool built from settings (empty if no key is configured)
+    """
+    global _key_pools
+    with _key_pools_lock:
+        if _key_pools is None:
+            _key_pools = {}
+        if provider not in _key_pools:
+            from vina_backend.core.config import get_settings
+
+            settings = get_settings()
+            _key_pools[provider] = APIKeyPool(
+                settings.get_api_keys(provider),
+                cooldown_seconds=settings.llm_key_cooldown_seconds,
+            )
+        return _key_pools[provider]
+
+
+def reset_key_pools():
+    """
+    Reset all key pools.
+    Useful for testing or after changing keys at runtime.
+    """
+    global _key_pools
+    _key_pools = None
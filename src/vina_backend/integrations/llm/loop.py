@@ -0,0 +1,68 @@
+"""
+Shared event loop for async LLM work started from sync code.
+
+litellm caches its async HTTP clients per event loop, so an asyncio.run()
+per sync call leaves those clients bound to closed loops and the next call
+fails with "Event loop is closed". Sync entry points (hedged
+LLMClient.generate, LessonGenerator.generate_lesson) instead submit their
+coroutine to one long-lived loop running in a daemon thread.
+"""
+import asyncio
+import contextvars
+import threading
+from typing import Any, Coroutine, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Global loop (lazy initialization)
+_llm_loop: Optional[asyncio.AbstractEventLoop] = None
+_llm_loop_lock = threading.Lock()
+
+
+def get_llm_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get or start the process-wide background event loop.
+
+    Returns:
+        Event loop running forever in the "llm-loop" daemon thread
+    """
+    global _llm_loop
+    with _llm_loop_lock:
+        if _llm_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="llm-loop", daemon=True).start()
+            _llm_loop = loop
+        return _llm_loop
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Run a coroutine on the shared loop and block until it finishes.
+
+    The coroutine sees the caller's context variables (usage collection,
+    scheduler priority), like it would under asyncio.run().
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        The coroutine's result
+
+    Raises:
+        RuntimeError: If called from the shared loop itself (it would deadlock)
+    """
+    loop = get_llm_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("run_sync() cannot block the shared LLM loop; await the coroutine instead")
+
+    context = contextvars.copy_context()
+
+    async def _run_in_caller_context() -> T:
+        return await context.run(asyncio.ensure_future, coro)
+
+    return asyncio.run_coroutine_threadsafe(_run_in_caller_context(), loop).result()
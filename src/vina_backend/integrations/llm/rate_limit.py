@@ -0,0 +1,289 @@
+"""
+Per-provider/model rate limiting for LLM calls.
+
+Token-bucket limiter for requests per minute (RPM) and tokens per minute
+(TPM). Callers wait for capacity instead of firing requests that come back
+as 429s, which lets batch jobs run at the provider ceiling.
+
+Works from both sync (blocking sleep) and async (asyncio.sleep) code.
+"""
+import asyncio
+import logging
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from vina_backend.integrations.llm.token_budget import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+
+# Conservative per-provider defaults (requests/tokens per minute), applied
+# only with LLM_RATE_LIMIT_DEFAULTS_ENABLED since real quotas depend on the
+# account tier. Override per provider ("gemini") or per model
+# ("gemini/gemini-2.5-flash") with the LLM_RATE_LIMITS setting.
+DEFAULT_RATE_LIMITS: Dict[str, Dict[str, int]] = {
+    "anthropic": {"rpm": 50, "tpm": 80000},
+    "openai": {"rpm": 500, "tpm": 200000},
+    "gemini": {"rpm": 300, "tpm": 1000000},
+}
+
+
+class TokenBucket:
+    """
+    Classic token bucket refilled continuously at capacity / 60 per second.
+
+    Not thread-safe on its own; RateLimiter guards access with a lock.
+    """
+
+    def __init__(self, capacity: float):
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.refill_per_second = self.capacity / 60.0
+        self.updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self.updated_at
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_per_second)
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` tokens are available (0 if available now)."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.refill_per_second
+
+    def consume(self, amount: float) -> None:
+        """Take tokens; may go negative when reconciling actual usage."""
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+    def refund(self, amount: float) -> None:
+        """Return unused tokens to the bucket."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+    def drain(self) -> None:
+        """Empty the bucket (used when the provider reports a 429)."""
+        self._refill()
+        self.tokens = min(self.tokens, 0.0)
+
+
+class RateLimiter:
+    """
+    RPM + TPM limiter keyed by (provider, model).
+
+    Limits are resolved per model first, then per provider. Models without
+    any configured limit (and without opted-in defaults) are not throttled. Limits are per API key, so they
+    are multiplied by the number of keys pooled for the provider.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, Dict[str, int]]] = None,
+        key_counts: Optional[Dict[str, int]] = None,
+        use_defaults: bool = False,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            limits: Mapping of "provider" or "provider/model" to {"rpm": int, "tpm": int}
+            key_counts: Number of API keys per provider (defaults to 1)
+            use_defaults: Apply DEFAULT_RATE_LIMITS to providers without a configured limit
+        """
+        self.limits = {**(DEFAULT_RATE_LIMITS if use_defaults else {}), **(limits or {})}
+        self.key_counts = key_counts or {}
+        self._buckets: Dict[Tuple[str, str], Tuple[Optional[TokenBucket], Optional[TokenBucket]]] = {}
+        self._lock = threading.Lock()
+
+    def _get_buckets(self, provider: str, model: str) -> Tuple[Optional[TokenBucket], Optional[TokenBucket]]:
+        key = (provider, model)
+        if key not in self._buckets:
+            limit = self.limits.get(f"{provider}/{model}") or self.limits.get(provider) or {}
+            keys = max(1, self.key_counts.get(provider, 1))
+            rpm = limit.get("rpm")
+            tpm = limit.get("tpm")
+            self._buckets[key] = (
+                TokenBucket(rpm * keys) if rpm else None,
+                TokenBucket(tpm * keys) if tpm else None,
+            )
+        return self._buckets[key]
+
+    def _try_acquire(self, provider: str, model: str, tokens: int) -> float:
+        """Consume capacity if available; otherwise return the seconds to wait."""
+        with self._lock:
+            request_bucket, token_bucket = self._get_buckets(provider, model)
+            wait = 0.0
+            if request_bucket:
+                wait = max(wait, request_bucket.wait_time(1))
+            if token_bucket:
+                wait = max(wait, token_bucket.wait_time(tokens))
+
+            if wait > 0:
+                return wait
+
+            if request_bucket:
+                request_bucket.consume(1)
+            if token_bucket:
+                token_bucket.consume(tokens)
+            return 0.0
+
+    def acquire(
+        self,
+        provider: str,
+        model: str,
+        tokens: int = 0,
+        timeout: Optional[float] = None,
+    ) -> float:
+        """
+        Block until one request and `tokens` tokens are available.
+
+        Args:
+            provider: LLM provider
+            model: Model name
+            tokens: Estimated tokens for the request (prompt + max output)
+            timeout: Optional maximum seconds to wait
+
+        Returns:
+            Total seconds spent waiting
+
+        Raises:
+            TimeoutError: If capacity is not available within `timeout`
+        """
+        waited = 0.0
+        while True:
+            wait = self._try_acquire(provider, model, tokens)
+            if wait == 0:
+                if waited > 0:
+                    logger.info(f"Rate limiter delayed {provider}/{model} by {waited:.2f}s")
+                return waited
+            if timeout is not None and waited + wait > timeout:
+                raise TimeoutError(
+                    f"Rate limit capacity for {provider}/{model} not available within {timeout}s"
+                )
+            time.sleep(wait)
+            waited += wait
+
+    async def aacquire(
+        self,
+        provider: str,
+        model: str,
+        tokens: int = 0,
+        timeout: Optional[float] = None,
+    ) -> float:
+        """
+        Async version of acquire(); waits with asyncio.sleep.
+
+        Returns:
+            Total seconds spent waiting
+
+        Raises:
+            TimeoutError: If capacity is not available within `timeout`
+        """
+        waited = 0.0
+        while True:
+            wait = self._try_acquire(provider, model, tokens)
+            if wait == 0:
+                if waited > 0:
+                    logger.info(f"Rate limiter delayed {provider}/{model} by {waited:.2f}s")
+                return waited
+            if timeout is not None and waited + wait > timeout:
+                raise TimeoutError(
+                    f"Rate limit capacity for {provider}/{model} not available within {timeout}s"
+                )
+            await asyncio.sleep(wait)
+            waited += wait
+
+    def reconcile(self, provider: str, model: str, reserved_tokens: int, actual_tokens: int) -> None:
+        """
+        Correct the token bucket once the real usage of a request is known.
+
+        Args:
+            reserved_tokens: Tokens taken in acquire()
+            actual_tokens: Tokens actually reported by the provider
+        """
+        with self._lock:
+            _, token_bucket = self._get_buckets(provider, model)
+            if not token_bucket:
+                return
+            difference = actual_tokens - reserved_tokens
+            if difference > 0:
+                token_bucket.consume(difference)
+            elif difference < 0:
+                token_bucket.refund(-difference)
+
+    def refund(self, provider: str, model: str, tokens: int = 0) -> None:
+        """
+        Return the reservation of a request that got no response (failed or cancelled).
+
+        Args:
+            tokens: Tokens taken in acquire()
+        """
+        with self._lock:
+            request_bucket, token_bucket = self._get_buckets(provider, model)
+            if request_bucket:
+                request_bucket.refund(1)
+            if token_bucket:
+                token_bucket.refund(tokens)
+
+    def penalize(self, provider: str, model: str) -> None:
+        """
+        Back off after the provider returned a 429.
+
+        With a single key the buckets are drained; with a key pool only the
+        throttled key's share of the capacity is removed.
+        """
+        keys = max(1, self.key_counts.get(provider, 1))
+        with self._lock:
+            for bucket in self._get_buckets(provider, model):
+                if not bucket:
+                    continue
+                if keys == 1:
+                    bucket.drain()
+                else:
+                    bucket.consume(bucket.capacity / keys)
+
+
+def estimate_request_tokens(messages: list, max_tokens: int) -> int:
+    """
+    Rough token reservation for a request: ~4 characters per prompt token
+    plus the full output budget.
+    """
+    return sum(estimate_tokens(m.get("content") or "") for m in messages) + max_tokens
+
+
+# Global limiter instance (lazy initialization)
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    Get or create the process-wide rate limiter.
+
+    Returns:
+        RateLimiter configured from settings
+    """
+    global _rate_limiter
+    if _rate_limiter is None:
+        from vina_backend.core.config import get_settings
+
+        settings = get_settings()
+        _rate_limiter = RateLimiter(
+            limits=settings.llm_rate_limits,
+            key_counts={p: len(settings.get_api_keys(p)) for p in DEFAULT_RATE_LIMITS},
+            use_defaults=settings.llm_rate_limit_defaults_enabled,
+        )
+    return _rate_limiter
+
+
+def reset_rate_limiter():
+    """
+    Reset the global rate limiter.
+    Useful for testing or after changing limits at runtime.
+    """
+    global _rate_limiter
+    _rate_limiter = None
@@ -0,0 +1,258 @@
+"""
+Persistent LLM response cache keyed by prompt fingerprint.
+
+Opt-in cache that sits under LLMClient.generate so that re-running the batch
+scripts (lesson quizzes, practice questions, lesson generation) does not pay
+again for completions that already succeeded.
+"""
+import hashlib
+import json
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import delete, func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Field, Session, SQLModel, col, select
+
+logger = logging.getLogger(__name__)
+
+
+class LLMResponseCacheEntry(SQLModel, table=True):
+    """Database model for cached LLM completions."""
+
+    __tablename__ = "llm_response_cache"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    cache_key: str = Field(unique=True, index=True)
+    provider: str
+    model: str = Field(index=True)
+    response_text: str
+
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    accessed_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    hit_count: int = Field(default=0)
+
+
+class LLMResponseCache:
+    """
+    SQLite/Postgres-backed cache of raw LLM responses with TTL and size eviction.
+    """
+
+    def __init__(
+        self,
+        engine,
+        ttl_seconds: int = 7 * 24 * 3600,
+        max_entries: int = 5000,
+        evict_every: int = 100,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            engine: SQLAlchemy engine to store entries in
+            ttl_seconds: Entries older than this are treated as misses and removed
+            max_entries: Least recently accessed entries beyond this are evicted
+            evict_every: Run evict() once per this many writes
+        """
+        self.engine = engine
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.max_entries = max_entries
+        self.evict_every = max(1, evict_every)
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(
+        provider: str,
+        model: str,
+        messages: List[Dict[str, Any]],
+        temperature: Optional[float],
+        max_tokens: Optional[int],
+        response_format: Optional[str] = None,
+    ) -> str:
+        """
+        Fingerprint a request.
+
+        Args:
+            response_format: Name of the structured-output schema, if any
+
+        Returns:
+            SHA-256 hex digest of (provider, model, messages, temperature, max_tokens)
+        """
+        payload = json.dumps(
+            {
+                "provider": provider,
+                "model": model,
+                "messages": messages,
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+                "response_format": response_format,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, cache_key: str) -> Optional[str]:
+        """Return the cached response for a key, or None on miss/expiry."""
+        with Session(self.engine) as session:
+            entry = session.exec(
+                select(LLMResponseCacheEntry).where(LLMResponseCacheEntry.cache_key == cache_key)
+            ).first()
+
+            if not entry:
+                self._count(hit=False)
+                return None
+
+            if datetime.utcnow() - entry.created_at > self.ttl:
+                session.delete(entry)
+                session.commit()
+                self._count(hit=False)
+                return None
+
+            entry.accessed_at = datetime.utcnow()
+            entry.hit_count += 1
+            session.add(entry)
+            session.commit()
+
+            self._count(hit=True)
+            logger.info(f"LLM response cache HIT ({entry.provider}/{entry.model})")
+            return entry.response_text
+
+    def set(self, cache_key: str, provider: str, model: str, response_text: str) -> None:
+        """
+        Store a response, replacing any existing entry for the key.
+
+        A single upsert, so concurrent writers of the same prompt don't race
+        on the unique cache_key. Eviction runs every evict_every writes.
+        """
+        now = datetime.utcnow()
+        values = {
+            "cache_key": cache_key,
+            "provider": provider,
+            "model": model,
+            "response_text": response_text,
+            "created_at": now,
+            "accessed_at": now,
+        }
+        insert = postgresql.insert if self.engine.dialect.name == "postgresql" else sqlite.insert
+        statement = insert(LLMResponseCacheEntry).values(hit_count=0, **values)
+        statement = statement.on_conflict_do_update(
+            index_elements=["cache_key"],
+            set_={key: value for key, value in values.items() if key != "cache_key"},
+        )
+        with Session(self.engine) as session:
+            session.execute(statement)
+            session.commit()
+
+        with self._lock:
+            self._writes += 1
+            due = self._writes % self.evict_every == 0
+        if due:
+            self.evict()
+
+    def delete(self, cache_key: str) -> None:
+        """Remove a single entry (e.g. a response that turned out to be unusable)."""
+        with Session(self.engine) as session:
+            session.execute(delete(LLMResponseCacheEntry).where(LLMResponseCacheEntry.cache_key == cache_key))
+            session.commit()
+
+    def evict(self) -> int:
+        """
+        Remove expired entries and trim to max_entries (least recently accessed first).
+
+        Returns:
+            Number of entries deleted
+        """
+        deleted = 0
+        with Session(self.engine) as session:
+            cutoff = datetime.utcnow() - self.ttl
+            result = session.execute(
+                delete(LLMResponseCacheEntry).where(col(LLMResponseCacheEntry.created_at) < cutoff)
+            )
+            deleted += result.rowcount or 0
+
+            total = session.exec(select(func.count()).select_from(LLMResponseCacheEntry)).one()
+            overflow = total - self.max_entries
+            if overflow > 0:
+                stale_ids = session.exec(
+                    select(LLMResponseCacheEntry.id)
+                    .order_by(LLMResponseCacheEntry.accessed_at)
+                    .limit(overflow)
+                ).all()
+                result = session.execute(
+                    delete(LLMResponseCacheEntry).where(col(LLMResponseCacheEntry.id).in_(stale_ids))
+                )
+                deleted += result.rowcount or 0
+
+            session.commit()
+
+        if deleted:
+            logger.info(f"Evicted {deleted} LLM response cache entries")
+        return deleted
+
+    def clear(self) -> int:
+        """Delete every cached response."""
+        with Session(self.engine) as session:
+            result = session.execute(delete(LLMResponseCacheEntry))
+            session.commit()
+            return result.rowcount or 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get hit/miss counters for this process and the number of stored entries.
+        """
+        with Session(self.engine) as session:
+            total = session.exec(select(func.count()).select_from(LLMResponseCacheEntry)).one()
+
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "total_entries": total,
+        }
+
+
+# Global cache instance (lazy initialization)
+_response_cache: Optional[LLMResponseCache] = None
+
+
+def get_response_cache() -> LLMResponseCache:
+    """
+    Get or create the process-wide LLM response cache.
+
+    Returns:
+        LLMResponseCache backed by the application database
+    """
+    global _response_cache
+    if _response_cache is None:
+        from vina_backend.core.config import get_settings
+        from vina_backend.integrations.db.engine import engine
+
+        settings = get_settings()
+        LLMResponseCacheEntry.metadata.create_all(engine, tables=[LLMResponseCacheEntry.__table__])
+        _response_cache = LLMResponseCache(
+            engine,
+            ttl_seconds=settings.llm_response_cache_ttl_seconds,
+            max_entries=settings.llm_response_cache_max_entries,
+        )
+    return _response_cache
+
+
+def reset_response_cache():
+    """
+    Reset the global response cache instance (stored entries are kept).
+    """
+    global _response_cache
+    _response_cache = None
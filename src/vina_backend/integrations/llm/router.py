@@ -0,0 +1,282 @@
+"""
+Task-aware model routing.
+
+Different pipeline stages need different models: the reviewer only checks a
+lesson against ReviewResult and can run on a much faster model than the
+generator. The router maps each task class to a routing table entry:
+
+    "review": {"models": ["gemini/gemini-2.5-flash", ...],   # cheapest first
+               "min_quality": 6.0,                            # judge score bar (1-10)
+               "max_latency_seconds": 20}
+
+and orders the candidates for a request:
+
+1. models whose judge score for the task (from scripts/benchmark_models.py)
+   is below min_quality are dropped; unscored models are kept
+2. models that are currently slow (latency EMA above max_latency_seconds) or
+   failing (recent error rate above the threshold) are moved to the back
+3. otherwise the table order (cheapest first) is kept
+
+The client appends its usual fallback chain after the routed models.
+"""
+import json
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+TASK_CLASSES = ("generate", "review", "rewrite", "quiz", "profile", "judge")
+
+# Usage caller tag (see LLMClient.generate) -> task class
+TASK_BY_CALLER = {
+    "lesson_generator": "generate",
+    "lesson_fallback": "generate",
+    "lesson_reviewer": "review",
+    "lesson_rewriter": "rewrite",
+    "lesson_personalizer": "rewrite",
+    "lesson_variant": "rewrite",
+    "lesson_quiz_generator": "quiz",
+    "lesson_quiz_reviewer": "quiz",
+    "lesson_quiz_rewriter": "quiz",
+    "onboarding_quiz_generator": "quiz",
+    "onboarding_quiz_reviewer": "quiz",
+    "onboarding_quiz_rewriter": "quiz",
+    "practice_question_generator": "quiz",
+    "practice_question_reviewer": "quiz",
+    "practice_question_rewriter": "quiz",
+    "profile_builder": "profile",
+    "benchmark_judge": "judge",
+}
+
+# Candidates per task, cheapest first. Override per task with LLM_ROUTING_TABLE.
+DEFAULT_ROUTING_TABLE: Dict[str, Dict[str, Any]] = {
+    "generate": {
+        "models": [
+            "gemini/gemini-3-flash-preview",
+            "openai/gpt-5.2-mini",
+            "gemini/gemini-3-pro-preview",
+            "anthropic/claude-sonnet-4-20250514",
+        ],
+        "min_quality": 7.0,
+        "max_latency_seconds": 60,
+    },
+    "review": {
+        "models": [
+            "gemini/gemini-2.5-flash",
+            "openai/gpt-4o-mini",
+            "anthropic/claude-haiku-4-5-20251001",
+            "gemini/gemini-3-flash-preview",
+        ],
+        "min_quality": 6.0,
+        "max_latency_seconds": 20,
+    },
+    "rewrite": {
+        "models": [
+            "gemini/gemini-3-flash-preview",
+            "openai/gpt-5.2-mini",
+            "anthropic/claude-sonnet-4-20250514",
+        ],
+        "min_quality": 7.0,
+        "max_latency_seconds": 60,
+    },
+    "quiz": {
+        "models": [
+            "gemini/gemini-2.5-flash",
+            "openai/gpt-4o-mini",
+            "gemini/gemini-3-flash-preview",
+            "openai/gpt-5.2-mini",
+        ],
+        "min_quality": 6.5,
+        "max_latency_seconds": 30,
+    },
+    "profile": {
+        "models": [
+            "gemini/gemini-2.5-flash",
+            "openai/gpt-4o-mini",
+            "anthropic/claude-haiku-4-5-20251001",
+        ],
+        "min_quality": 6.5,
+        "max_latency_seconds": 15,
+    },
+    "judge": {
+        "models": [
+            "anthropic/claude-sonnet-4-20250514",
+            "gemini/gemini-3-pro-preview",
+            "openai/gpt-4o",
+        ],
+        "min_quality": 0,
+    },
+}
+
+
+def task_for_caller(caller: Optional[str]) -> Optional[str]:
+    """Task class for a usage caller tag (None if the caller is not routed)."""
+    return TASK_BY_CALLER.get(caller) if caller else None
+
+
+def _split_route(route: str) -> Tuple[str, str]:
+    provider, _, model = route.partition("/")
+    return provider, model
+
+
+def load_quality_scores(path: Path) -> Dict[str, Dict[str, float]]:
+    """
+    Load judge scores written by record_judge_scores().
+
+    Returns:
+        Mapping of task -> "provider/model" -> average judge score
+    """
+    path = Path(path)
+    if not path.exists():
+        return {}
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Could not read model quality scores from {path}: {e}")
+        return {}
+    return {
+        task: {route: entry["judge_score"] for route, entry in models.items()}
+        for task, models in data.items()
+    }
+
+
+def record_judge_scores(path: Path, task: str, scores: Dict[str, List[float]]) -> None:
+    """
+    Merge new judge scores into the quality file as running averages.
+
+    Args:
+        path: JSON file read by the router
+        task: Task class the scores apply to
+        scores: Mapping of "provider/model" -> judge scores from this run
+    """
+    path = Path(path)
+    data = json.loads(path.read_text()) if path.exists() else {}
+    models = data.setdefault(task, {})
+    for route, values in scores.items():
+        if not values:
+            continue
+        entry = models.get(route, {"judge_score": 0.0, "samples": 0})
+        samples = entry["samples"] + len(values)
+        entry["judge_score"] = round((entry["judge_score"] * entry["samples"] + sum(values)) / samples, 2)
+        entry["samples"] = samples
+        entry["updated_at"] = datetime.utcnow().isoformat()
+        models[route] = entry
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2))
+
+
+class ModelRouter:
+    """
+    Orders candidate models per task from the routing table, judge scores and live health.
+    """
+
+    def __init__(
+        self,
+        table: Optional[Dict[str, Dict[str, Any]]] = None,
+        quality_scores: Optional[Dict[str, Dict[str, float]]] = None,
+        health=None,
+        max_error_rate: float = 0.3,
+        min_samples: int = 5,
+    ):
+        """
+        Initialize the router.
+
+        Args:
+            table: Per-task overrides merged over DEFAULT_ROUTING_TABLE
+            quality_scores: Judge scores per task and "provider/model"
+            health: ModelHealthRegistry providing latency/error statistics
+            max_error_rate: Recent error rate above which a model is demoted
+            min_samples: Calls required before live statistics are trusted
+        """
+        self.table = {task: dict(entry) for task, entry in DEFAULT_ROUTING_TABLE.items()}
+        for task, entry in (table or {}).items():
+            self.table.setdefault(task, {}).update(entry)
+        self.quality_scores = quality_scores or {}
+        self.health = health
+        self.max_error_rate = max_error_rate
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+
+    def set_quality_scores(self, quality_scores: Dict[str, Dict[str, float]]) -> None:
+        """Replace the judge scores (e.g. after a benchmark run)."""
+        with self._lock:
+            self.quality_scores = quality_scores
+
+    def _is_degraded(self, stats: Optional[Dict[str, Any]], max_latency: Optional[float]) -> bool:
+        if not stats or stats["total_calls"] < self.min_samples:
+            return False
+        if stats["error_rate"] > self.max_error_rate:
+            return True
+        latency = stats["latency_ema_seconds"]
+        return bool(max_latency and latency is not None and latency > max_latency)
+
+    def route(self, task: str) -> List[Tuple[str, str]]:
+        """
+        Candidate (provider, model) routes for a task, best first.
+
+        Args:
+            task: One of TASK_CLASSES
+
+        Returns:
+            Ordered routes (empty if the task is unknown or no model meets the bar)
+        """
+        entry = self.table.get(task)
+        if not entry:
+            return []
+
+        min_quality = entry.get("min_quality", 0)
+        max_latency = entry.get("max_latency_seconds")
+        with self._lock:
+            scores = dict(self.quality_scores.get(task, {}))
+        stats = self.health.snapshot() if self.health else {}
+
+        preferred, demoted = [], []
+        for route in entry.get("models", []):
+            score = scores.get(route)
+            if score is not None and score < min_quality:
+                logger.debug(f"Router: {route} below quality bar for {task} ({score} < {min_quality})")
+                continue
+            (demoted if self._is_degraded(stats.get(route), max_latency) else preferred).append(route)
+
+        if demoted:
+            logger.info(f"Router: demoting slow/failing models for {task}: {demoted}")
+        if not preferred and not demoted:
+            logger.warning(f"Router: no model meets the quality bar for {task}, using default chain")
+
+        return [_split_route(route) for route in preferred + demoted]
+
+
+# Global router instance (lazy initialization)
+_model_router: Optional[ModelRouter] = None
+
+
+def get_model_router() -> ModelRouter:
+    """
+    Get or create the process-wide model router.
+
+    Returns:
+        ModelRouter configured from settings
+    """
+    global _model_router
+    if _model_router is None:
+        from vina_backend.core.config import get_settings
+        from vina_backend.integrations.llm.health import get_health_registry
+
+        settings = get_settings()
+        _model_router = ModelRouter(
+            table=settings.llm_routing_table,
+            quality_scores=load_quality_scores(Path(settings.llm_model_quality_path)),
+            health=get_health_registry(),
+        )
+    return _model_router
+
+
+def reset_model_router():
+    """
+    Reset the global router (e.g. to reload judge scores).
+    """
+    global _model_router
+    _model_router = None
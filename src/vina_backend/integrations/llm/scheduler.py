@@ -0,0 +1,251 @@
+"""
+Priority-aware scheduler for outbound LLM calls.
+
+Interactive requests (profile generation, on-demand lessons) and offline batch
+jobs (quiz/practice/lesson batch scripts) share the same provider quota. Every
+provider call takes a slot from this process-wide scheduler first:
+
+- interactive calls are always dispatched before queued batch calls
+- each class has its own concurrency cap, so batch work can only fill the
+  capacity interactive traffic leaves free and never starves it
+- within a class, waiters are served first-in first-out
+
+The priority of the current call comes from llm_priority() (a ContextVar), so
+batch scripts mark themselves once instead of threading a flag through every
+agent. Works from threads (blocking wait) and asyncio (awaitable wait).
+"""
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Highest priority first
+PRIORITY_CLASSES = ("interactive", "batch")
+
+_current_priority: ContextVar[Optional[str]] = ContextVar("llm_priority", default=None)
+
+
+@contextmanager
+def llm_priority(priority: str) -> Iterator[None]:
+    """
+    Run LLM calls made inside the block with the given priority class.
+
+    Example:
+        with llm_priority("batch"):
+            generator.generate(...)
+    """
+    if priority not in PRIORITY_CLASSES:
+        raise ValueError(f"Unknown LLM priority '{priority}', expected one of {PRIORITY_CLASSES}")
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def get_current_priority(default: str = "interactive") -> str:
+    """Priority class for calls made in the current context."""
+    return _current_priority.get() or default
+
+
+class _Waiter:
+    """A queued request for a slot, woken from whichever thread releases one."""
+
+    def __init__(self, priority: str, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.priority = priority
+        self.enqueued_at = time.monotonic()
+        self.granted = False
+        self._loop = loop
+        self._event = threading.Event() if loop is None else None
+        self._future = loop.create_future() if loop is not None else None
+
+    def grant(self) -> None:
+        self.granted = True
+        if self._event is not None:
+            self._event.set()
+        else:
+            self._loop.call_soon_threadsafe(self._resolve)
+
+    def _resolve(self) -> None:
+        if not self._future.done():
+            self._future.set_result(None)
+
+    def wait(self) -> None:
+        self._event.wait()
+
+    async def await_grant(self) -> None:
+        await self._future
+
+
+class LLMScheduler:
+    """
+    Process-wide slot scheduler with priority classes and per-class caps.
+    """
+
+    def __init__(self, max_concurrency: int = 8, class_limits: Optional[Dict[str, int]] = None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_concurrency: Maximum in-flight LLM calls across all classes
+            class_limits: Maximum in-flight calls per priority class (defaults to max_concurrency)
+        """
+        self.max_concurrency = max_concurrency
+        self.class_limits = {c: max_concurrency for c in PRIORITY_CLASSES}
+        self.class_limits.update(class_limits or {})
+
+        self._lock = threading.Lock()
+        self._active: Dict[str, int] = {c: 0 for c in PRIORITY_CLASSES}
+        self._queues: Dict[str, Deque[_Waiter]] = {c: deque() for c in PRIORITY_CLASSES}
+        self._served: Dict[str, int] = {c: 0 for c in PRIORITY_CLASSES}
+        self._recent_waits: Dict[str, Deque[float]] = {c: deque(maxlen=200) for c in PRIORITY_CLASSES}
+
+    def _has_capacity(self, priority: str) -> bool:
+        total_active = sum(self._active.values())
+        return total_active < self.max_concurrency and self._active[priority] < self.class_limits[priority]
+
+    def _grant(self, waiter: _Waiter) -> None:
+        """Mark a waiter as running (caller holds the lock)."""
+        self._active[waiter.priority] += 1
+        self._served[waiter.priority] += 1
+        self._recent_waits[waiter.priority].append(time.monotonic() - waiter.enqueued_at)
+        waiter.grant()
+
+    def _dispatch(self) -> None:
+        """Hand free slots to queued waiters, highest priority first (caller holds the lock)."""
+        for priority in PRIORITY_CLASSES:
+            queue = self._queues[priority]
+            while queue and self._has_capacity(priority):
+                self._grant(queue.popleft())
+
+    def _enqueue(self, priority: str, loop: Optional[asyncio.AbstractEventLoop] = None) -> _Waiter:
+        if priority not in PRIORITY_CLASSES:
+            raise ValueError(f"Unknown LLM priority '{priority}', expected one of {PRIORITY_CLASSES}")
+        waiter = _Waiter(priority, loop)
+        with self._lock:
+            # Jump straight in only if nobody of equal or higher priority is waiting
+            higher_waiting = any(
+                self._queues[p] for p in PRIORITY_CLASSES[: PRIORITY_CLASSES.index(priority) + 1]
+            )
+            if not higher_waiting and self._has_capacity(priority):
+                self._grant(waiter)
+            else:
+                self._queues[priority].append(waiter)
+        return waiter
+
+    def _release(self, priority: str) -> None:
+        with self._lock:
+            self._active[priority] -= 1
+            self._dispatch()
+
+    def _abandon(self, waiter: _Waiter) -> None:
+        """Drop a waiter whose caller gave up (cancellation), releasing its slot if it was granted."""
+        with self._lock:
+            if waiter.granted:
+                self._active[waiter.priority] -= 1
+                self._dispatch()
+            else:
+                try:
+                    self._queues[waiter.priority].remove(waiter)
+                except ValueError:
+                    pass
+
+    @contextmanager
+    def slot(self, priority: Optional[str] = None) -> Iterator[None]:
+        """
+        Hold a slot for the duration of a blocking LLM call.
+
+        Args:
+            priority: Priority class (defaults to the current llm_priority context)
+        """
+        priority = priority or get_current_priority()
+        waiter = self._enqueue(priority)
+        if not waiter.granted:
+            waiter.wait()
+        try:
+            yield
+        finally:
+            self._release(priority)
+
+    @asynccontextmanager
+    async def aslot(self, priority: Optional[str] = None) -> AsyncIterator[None]:
+        """
+        Async version of slot(); waits without blocking the event loop.
+
+        Args:
+            priority: Priority class (defaults to the current llm_priority context)
+        """
+        priority = priority or get_current_priority()
+        waiter = self._enqueue(priority, asyncio.get_running_loop())
+        if not waiter.granted:
+            try:
+                await waiter.await_grant()
+            except asyncio.CancelledError:
+                self._abandon(waiter)
+                raise
+        try:
+            yield
+        finally:
+            self._release(priority)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Queue depth, in-flight calls and wait times per priority class.
+
+        Returns:
+            Dictionary keyed by priority class plus overall capacity
+        """
+        with self._lock:
+            metrics: Dict[str, Any] = {"max_concurrency": self.max_concurrency}
+            for priority in PRIORITY_CLASSES:
+                waits = sorted(self._recent_waits[priority])
+                metrics[priority] = {
+                    "queue_depth": len(self._queues[priority]),
+                    "active": self._active[priority],
+                    "limit": self.class_limits[priority],
+                    "served": self._served[priority],
+                    "avg_wait_seconds": round(sum(waits) / len(waits), 3) if waits else 0.0,
+                    "p95_wait_seconds": round(waits[int(0.95 * (len(waits) - 1))], 3) if waits else 0.0,
+                }
+            return metrics
+
+
+# Global scheduler instance (lazy initialization)
+_scheduler: Optional[LLMScheduler] = None
+
+
+def get_scheduler() -> LLMScheduler:
+    """
+    Get or create the process-wide LLM scheduler.
+
+    Returns:
+        LLMScheduler configured from settings
+    """
+    global _scheduler
+    if _scheduler is None:
+        from vina_backend.core.config import get_settings
+
+        settings = get_settings()
+        _scheduler = LLMScheduler(
+            max_concurrency=settings.llm_max_concurrency,
+            class_limits={
+                "interactive": settings.llm_max_concurrency,
+                "batch": settings.llm_batch_max_concurrency,
+            },
+        )
+    return _scheduler
+
+
+def reset_scheduler():
+    """
+    Reset the global scheduler.
+    Useful for testing.
+    """
+    global _scheduler
+    _scheduler = None
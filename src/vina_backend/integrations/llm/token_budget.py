@@ -0,0 +1,111 @@
+"""
+Pre-flight token estimation and output budgets.
+
+A fixed max_tokens truncates long lessons (difficulty 1 has more slides and
+more words) and over-reserves rate-limit capacity for short ones. The
+budgets here size max_tokens from what the prompt actually asks for:
+
+- lessons: slide count and words per slide from the difficulty knobs
+  (course_config_global.json delivery_metrics)
+- single slides: words per slide (patch-based rewrites)
+- lesson quizzes: number of questions
+
+Estimates use ~4 characters per prompt token and ~1.35 tokens per English
+word of output, plus a safety margin for JSON structure and reasoning.
+"""
+import re
+from typing import Any, Dict, Tuple
+
+CHARS_PER_TOKEN = 4
+TOKENS_PER_WORD = 1.35
+
+# Spoken "talk" text per slide runs longer than the on-slide words the knobs describe
+NARRATION_WORDS_PER_SLIDE_WORD = 2.5
+FIGURE_WORDS_PER_SLIDE = 80  # image prompt + purpose + alt text
+SLIDE_JSON_OVERHEAD_TOKENS = 120
+LESSON_JSON_OVERHEAD_TOKENS = 200
+
+QUIZ_WORDS_PER_QUESTION = 200  # question, 4 options, explanation, rationale
+QUIZ_JSON_OVERHEAD_TOKENS = 100
+
+MIN_OUTPUT_TOKENS = 1000
+MAX_OUTPUT_TOKENS = 8000
+
+_RANGE = re.compile(r"(\d+)\s*(?:-|–|to)\s*(\d+)")
+_NUMBER = re.compile(r"\d+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for a piece of prompt text."""
+    return len(text) // CHARS_PER_TOKEN
+
+
+def parse_range(value: Any, default: Tuple[int, int]) -> Tuple[int, int]:
+    """
+    Parse a knob such as "4-5 slides (balanced pacing)" or "30-50 words".
+
+    Returns:
+        (low, high); a single number gives (n, n); unparseable values give default
+    """
+    text = str(value or "")
+    match = _RANGE.search(text)
+    if match:
+        low, high = int(match.group(1)), int(match.group(2))
+        return min(low, high), max(low, high)
+    match = _NUMBER.search(text)
+    if match:
+        return int(match.group()), int(match.group())
+    return default
+
+
+def _clamp(tokens: float, margin: float) -> int:
+    return int(min(MAX_OUTPUT_TOKENS, max(MIN_OUTPUT_TOKENS, tokens * margin)))
+
+
+def lesson_max_tokens(difficulty_knobs: Dict[str, Any], margin: float = 1.3) -> int:
+    """
+    Output budget for a full lesson JSON at a difficulty level.
+
+    Args:
+        difficulty_knobs: Difficulty config (see course_loader.get_difficulty_knobs)
+        margin: Multiplier on the estimate for variance and reasoning tokens
+
+    Returns:
+        max_tokens for the generator/rewriter call
+    """
+    metrics = difficulty_knobs.get("delivery_metrics", {})
+    _, max_slides = parse_range(metrics.get("slide_count_for_3min_lesson"), (4, 5))
+    _, max_words = parse_range(metrics.get("words_per_slide"), (50, 70))
+
+    words_per_slide = max_words * NARRATION_WORDS_PER_SLIDE_WORD + FIGURE_WORDS_PER_SLIDE
+    per_slide = words_per_slide * TOKENS_PER_WORD + SLIDE_JSON_OVERHEAD_TOKENS
+    return _clamp(max_slides * per_slide + LESSON_JSON_OVERHEAD_TOKENS, margin)
+
+
+def slide_max_tokens(difficulty_knobs: Dict[str, Any], margin: float = 1.3) -> int:
+    """
+    Output budget for a single slide JSON (patch-based rewrites).
+    
+    Args:
+        difficulty_knobs: Difficulty config (see course_loader.get_difficulty_knobs)
+        margin: Multiplier on the estimate for variance and reasoning tokens
+    
+    Returns:
+        max_tokens for one slide rewriter call
+    """
+    metrics = difficulty_knobs.get("delivery_metrics", {})
+    _, max_words = parse_range(metrics.get("words_per_slide"), (50, 70))
+    
+    words = max_words * NARRATION_WORDS_PER_SLIDE_WORD + FIGURE_WORDS_PER_SLIDE
+    return _clamp(words * TOKENS_PER_WORD + SLIDE_JSON_OVERHEAD_TOKENS, margin)
+
+
+def quiz_max_tokens(question_count: int = 3, margin: float = 1.3) -> int:
+    """
+    Output budget for a quiz JSON with the given number of questions.
+
+    Returns:
+        max_tokens for the quiz generator/rewriter call
+    """
+    per_question = QUIZ_WORDS_PER_QUESTION * TOKENS_PER_WORD
+    return _clamp(question_count * per_question + QUIZ_JSON_OVERHEAD_TOKENS, margin)
@@ -0,0 +1,378 @@
+"""
+Pluggable transport for LLM completions.
+
+LLMClient sends every request through a transport instead of calling litellm
+directly, so that load tests and benchmarks can run without network access:
+
+- live:   call the provider through litellm (default)
+- record: call the provider and append each request/response pair to a JSONL file
+- replay: answer from a JSONL recording, keyed by prompt fingerprint; no network
+
+Any mode can additionally inject latency and 503/429 errors (see FaultProfile),
+which makes fallback, circuit breaker and rate limiter behaviour reproducible.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import random
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import litellm
+from litellm import ModelResponse, acompletion, completion, stream_chunk_builder
+
+logger = logging.getLogger(__name__)
+
+
+class InjectedProviderError(Exception):
+    """Synthetic provider error raised by fault injection."""
+
+    def __init__(self, status_code: int, model: str):
+        self.status_code = status_code
+        reason = "503 UNAVAILABLE (injected overload)" if status_code == 503 else "429 Too Many Requests (injected)"
+        super().__init__(f"{reason} for {model}")
+
+
+class ReplayMissError(LookupError):
+    """No recorded response exists for a replayed request."""
+
+
+def prompt_fingerprint(messages: List[Dict[str, Any]]) -> str:
+    """
+    Hash the messages of a request, ignoring provider-specific content blocks.
+
+    Cache-control blocks are flattened to plain text so that a recording made
+    against one provider replays for every model in the fallback chain.
+    """
+    normalized = []
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, list):
+            content = "".join(block.get("text", "") for block in content if isinstance(block, dict))
+        normalized.append({"role": message.get("role"), "content": content})
+    return hashlib.sha256(json.dumps(normalized, sort_keys=True).encode()).hexdigest()
+
+
+@dataclass
+class FaultProfile:
+    """
+    Latency/error distribution applied to requests.
+
+    Latency is log-normal with the given median and sigma (sigma 0 gives a
+    fixed delay). Error rates are independent probabilities per request.
+    """
+    latency_median_seconds: float = 0.0
+    latency_sigma: float = 0.0
+    error_rate_503: float = 0.0
+    error_rate_429: float = 0.0
+    use_recorded_latency: bool = False  # Replay only: sleep for the recorded duration instead
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FaultProfile":
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in known})
+
+    @property
+    def active(self) -> bool:
+        return bool(
+            self.latency_median_seconds or self.error_rate_503 or self.error_rate_429 or self.use_recorded_latency
+        )
+
+
+@dataclass
+class FaultInjector:
+    """
+    Samples latency and errors per model from FaultProfiles.
+
+    Config format (LLM_FAULT_INJECTION):
+        {"latency_median_seconds": 2.0, "latency_sigma": 0.5, "error_rate_503": 0.1,
+         "seed": 42, "models": {"gemini/gemini-3-flash-preview": {"error_rate_503": 0.5}}}
+
+    Per-model entries override the top-level values for that model.
+    """
+    default: FaultProfile = field(default_factory=FaultProfile)
+    per_model: Dict[str, FaultProfile] = field(default_factory=dict)
+    seed: Optional[int] = None
+
+    def __post_init__(self):
+        self._rng = random.Random(self.seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "FaultInjector":
+        base = {k: v for k, v in config.items() if k not in ("models", "seed")}
+        per_model = {
+            model: FaultProfile.from_dict({**base, **overrides})
+            for model, overrides in (config.get("models") or {}).items()
+        }
+        return cls(default=FaultProfile.from_dict(base), per_model=per_model, seed=config.get("seed"))
+
+    def profile_for(self, model: str) -> FaultProfile:
+        return self.per_model.get(model, self.default)
+
+    @property
+    def active(self) -> bool:
+        return self.default.active or any(p.active for p in self.per_model.values())
+
+    def sample(self, model: str, recorded_latency: Optional[float] = None) -> Tuple[float, Optional[Exception]]:
+        """
+        Draw the outcome of one request.
+
+        Returns:
+            (delay_seconds, error_or_None)
+        """
+        profile = self.profile_for(model)
+        with self._lock:
+            if profile.use_recorded_latency and recorded_latency is not None:
+                delay = recorded_latency
+            elif profile.latency_median_seconds > 0:
+                delay = profile.latency_median_seconds * math.exp(self._rng.gauss(0, profile.latency_sigma))
+            else:
+                delay = 0.0
+
+            roll = self._rng.random()
+        if roll < profile.error_rate_503:
+            return delay, InjectedProviderError(503, model)
+        if roll < profile.error_rate_503 + profile.error_rate_429:
+            return delay, InjectedProviderError(429, model)
+        return delay, None
+
+
+class LLMTransport:
+    """Live transport: sends requests to the provider through litellm."""
+
+    mode = "live"
+
+    def __init__(self, faults: Optional[FaultInjector] = None):
+        self.faults = faults if faults and faults.active else None
+        self._use_shared_http_pool()
+    
+    @staticmethod
+    def _use_shared_http_pool() -> None:
+        """
+        Route litellm's blocking calls through the shared keep-alive pool.
+        
+        Async calls keep litellm's own cached clients, which are bound to the
+        event loop that created them.
+        """
+        from vina_backend.core.config import get_settings
+        from vina_backend.integrations.http.pool import get_http_client
+        
+        if get_settings().http_pooling_enabled and litellm.client_session is None:
+            litellm.client_session = get_http_client()
+
+    def _send(self, **kwargs: Any) -> Any:
+        return completion(**kwargs)
+
+    async def _asend(self, **kwargs: Any) -> Any:
+        return await acompletion(**kwargs)
+
+    def complete(self, **kwargs: Any) -> Any:
+        """Blocking completion (same keyword arguments as litellm.completion)."""
+        if self.faults:
+            delay, error = self.faults.sample(kwargs["model"])
+            time.sleep(delay)
+            if error:
+                raise error
+        return self._send(**kwargs)
+
+    async def acomplete(self, **kwargs: Any) -> Any:
+        """Async completion (same keyword arguments as litellm.acompletion)."""
+        if self.faults:
+            delay, error = self.faults.sample(kwargs["model"])
+            await asyncio.sleep(delay)
+            if error:
+                raise error
+        return await self._asend(**kwargs)
+    
+    async def _astream(self, **kwargs: Any) -> AsyncIterator[Any]:
+        response = await acompletion(stream=True, **kwargs)
+        async for chunk in response:
+            yield chunk
+    
+    async def astream(self, **kwargs: Any) -> AsyncIterator[Any]:
+        """
+        Streamed async completion yielding litellm chunks.
+        
+        Fault injection applies to the time-to-first-chunk.
+        """
+        if self.faults:
+            delay, error = self.faults.sample(kwargs["model"])
+            await asyncio.sleep(delay)
+            if error:
+                raise error
+        async for chunk in self._astream(**kwargs):
+            yield chunk
+
+
+class RecordingTransport(LLMTransport):
+    """Live transport that appends every successful request/response pair to a JSONL file."""
+
+    mode = "record"
+
+    def __init__(self, path: Path, faults: Optional[FaultInjector] = None):
+        super().__init__(faults)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _record(self, kwargs: Dict[str, Any], response: Any, duration: float) -> None:
+        entry = {
+            "key": prompt_fingerprint(kwargs["messages"]),
+            "model": kwargs["model"],
+            "messages": kwargs["messages"],
+            "duration_seconds": round(duration, 3),
+            "recorded_at": datetime.utcnow().isoformat(),
+            "response": response.model_dump(),
+        }
+        line = json.dumps(entry, default=str)
+        with self._lock, open(self.path, "a") as f:
+            f.write(line + "\n")
+
+    def _send(self, **kwargs: Any) -> Any:
+        start = time.time()
+        response = completion(**kwargs)
+        self._record(kwargs, response, time.time() - start)
+        return response
+
+    async def _asend(self, **kwargs: Any) -> Any:
+        start = time.time()
+        response = await acompletion(**kwargs)
+        await asyncio.to_thread(self._record, kwargs, response, time.time() - start)
+        return response
+    
+    async def _astream(self, **kwargs: Any) -> AsyncIterator[Any]:
+        start = time.time()
+        chunks = []
+        response = await acompletion(stream=True, **kwargs)
+        async for chunk in response:
+            chunks.append(chunk)
+            yield chunk
+        # Record the assembled response so streamed calls replay like regular ones
+        assembled = stream_chunk_builder(chunks, messages=kwargs["messages"])
+        await asyncio.to_thread(self._record, kwargs, assembled, time.time() - start)
+
+
+class ReplayTransport(LLMTransport):
+    """
+    Offline transport answering from a JSONL recording.
+
+    Requests are matched by prompt fingerprint regardless of model. When a
+    prompt was recorded several times, the recordings are returned in order
+    and then cycled, so replays are deterministic.
+    """
+
+    mode = "replay"
+    REPLAY_CHUNK_CHARS = 200
+
+    def __init__(self, path: Path, faults: Optional[FaultInjector] = None):
+        super().__init__(faults)
+        self.path = Path(path)
+        self._entries: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._cursors: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+        if self.path.exists():
+            with open(self.path) as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries[entry["key"]].append(entry)
+        logger.info(f"Loaded {sum(len(v) for v in self._entries.values())} recorded LLM responses from {self.path}")
+
+    def _next_entry(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        key = prompt_fingerprint(kwargs["messages"])
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                raise ReplayMissError(f"No recorded response for prompt {key[:12]} (model {kwargs['model']})")
+            entry = entries[self._cursors[key] % len(entries)]
+            self._cursors[key] += 1
+        return entry
+
+    def _prepare(self, kwargs: Dict[str, Any]) -> Tuple[Dict[str, Any], float, Optional[Exception]]:
+        entry = self._next_entry(kwargs)
+        delay, error = 0.0, None
+        if self.faults:
+            delay, error = self.faults.sample(kwargs["model"], entry.get("duration_seconds"))
+        return entry, delay, error
+
+    @staticmethod
+    def _build_response(entry: Dict[str, Any], model: str) -> ModelResponse:
+        response = ModelResponse(**entry["response"])
+        response.model = model
+        return response
+
+    def complete(self, **kwargs: Any) -> Any:
+        entry, delay, error = self._prepare(kwargs)
+        time.sleep(delay)
+        if error:
+            raise error
+        return self._build_response(entry, kwargs["model"])
+
+    async def acomplete(self, **kwargs: Any) -> Any:
+        entry, delay, error = self._prepare(kwargs)
+        await asyncio.sleep(delay)
+        if error:
+            raise error
+        return self._build_response(entry, kwargs["model"])
+    
+    async def astream(self, **kwargs: Any) -> AsyncIterator[Any]:
+        """Replay a recorded response as a stream of fixed-size chunks."""
+        entry, delay, error = self._prepare(kwargs)
+        await asyncio.sleep(delay)
+        if error:
+            raise error
+        response = self._build_response(entry, kwargs["model"])
+        content = response.choices[0].message.content or ""
+        for start in range(0, len(content), self.REPLAY_CHUNK_CHARS):
+            yield ModelResponse(
+                stream=True,
+                model=kwargs["model"],
+                choices=[{"index": 0, "delta": {"role": "assistant", "content": content[start:start + self.REPLAY_CHUNK_CHARS]}}],
+            )
+            await asyncio.sleep(0)
+
+
+# Global transport instance (lazy initialization)
+_transport: Optional[LLMTransport] = None
+
+
+def get_transport() -> LLMTransport:
+    """
+    Get or create the process-wide LLM transport.
+
+    Returns:
+        Transport selected by LLM_TRANSPORT_MODE
+    """
+    global _transport
+    if _transport is None:
+        from vina_backend.core.config import get_settings
+
+        settings = get_settings()
+        faults = FaultInjector.from_config(settings.llm_fault_injection) if settings.llm_fault_injection else None
+        path = Path(settings.llm_transport_recording_path)
+
+        if settings.llm_transport_mode == "record":
+            _transport = RecordingTransport(path, faults)
+        elif settings.llm_transport_mode == "replay":
+            _transport = ReplayTransport(path, faults)
+        else:
+            _transport = LLMTransport(faults)
+        logger.info(f"LLM transport mode: {_transport.mode}")
+    return _transport
+
+
+def reset_transport():
+    """
+    Reset the global transport (e.g. after changing the mode in tests).
+    """
+    global _transport
+    _transport = None
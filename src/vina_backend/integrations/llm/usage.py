@@ -0,0 +1,284 @@
+"""
+Token usage and cost accounting for LLM calls.
+
+Every successful completion is recorded with its prompt/completion/cached
+token counts, estimated cost, the model that actually answered and a caller
+tag (e.g. "lesson_generator", "quiz_reviewer"). Records are kept in an
+in-memory ring for quick inspection and flushed periodically to the
+llm_usage table for offline analysis.
+
+Callers that need the usage of a unit of work (e.g. one lesson) wrap it in
+collect_usage() and sum the collected records with summarize_usage().
+"""
+import asyncio
+import atexit
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Deque, Dict, Iterator, List, Optional, Set, Tuple
+
+from sqlmodel import Field, Session, SQLModel
+
+logger = logging.getLogger(__name__)
+
+# Records of the current unit of work (see collect_usage); None when not collecting
+_usage_collector: ContextVar[Optional[List["UsageRecord"]]] = ContextVar("llm_usage_collector", default=None)
+
+
+@dataclass
+class UsageRecord:
+    """Usage of a single LLM completion."""
+    provider: str
+    model: str
+    caller: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    cache_write_tokens: int = 0
+    cost_usd: float = 0.0
+    duration_seconds: float = 0.0
+    created_at: datetime = field(default_factory=datetime.utcnow)
+
+
+class LLMUsageRecord(SQLModel, table=True):
+    """Database model for flushed LLM usage records."""
+
+    __tablename__ = "llm_usage"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    provider: str
+    model: str = Field(index=True)
+    caller: str = Field(index=True)
+    prompt_tokens: int = Field(default=0)
+    completion_tokens: int = Field(default=0)
+    cached_tokens: int = Field(default=0)
+    cache_write_tokens: int = Field(default=0)
+    cost_usd: float = Field(default=0.0)
+    duration_seconds: float = Field(default=0.0)
+    created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+
+
+def extract_token_counts(response: Any) -> Tuple[int, int, int, int]:
+    """
+    Read (prompt, completion, cached, cache_write) token counts from a litellm response.
+
+    Cached prompt tokens are reported as prompt_tokens_details.cached_tokens
+    (OpenAI/Gemini) or cache_read_input_tokens (Anthropic). Only Anthropic
+    reports tokens written to the prompt cache (cache_creation_input_tokens).
+    """
+    usage = getattr(response, "usage", None)
+    if not usage:
+        return 0, 0, 0, 0
+
+    prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+    completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached_tokens = getattr(details, "cached_tokens", 0) if details else 0
+    cached_tokens = cached_tokens or getattr(usage, "cache_read_input_tokens", 0) or 0
+
+    cache_write_tokens = getattr(usage, "cache_creation_input_tokens", 0) or 0
+
+    return int(prompt_tokens), int(completion_tokens), int(cached_tokens), int(cache_write_tokens)
+
+
+def summarize_usage(records: List[UsageRecord]) -> Dict[str, Any]:
+    """
+    Sum a list of usage records, overall and per caller.
+
+    Returns:
+        Dictionary with calls, token totals, cost_usd, the share of prompt
+        tokens served from the provider prompt cache and a by_caller breakdown
+    """
+    def _empty() -> Dict[str, Any]:
+        return {
+            "calls": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "cached_tokens": 0,
+            "cache_write_tokens": 0,
+            "cost_usd": 0.0,
+        }
+
+    totals = _empty()
+    by_caller: Dict[str, Dict[str, Any]] = {}
+
+    for record in records:
+        for bucket in (totals, by_caller.setdefault(record.caller, _empty())):
+            bucket["calls"] += 1
+            bucket["prompt_tokens"] += record.prompt_tokens
+            bucket["completion_tokens"] += record.completion_tokens
+            bucket["cached_tokens"] += record.cached_tokens
+            bucket["cache_write_tokens"] += record.cache_write_tokens
+            bucket["cost_usd"] += record.cost_usd
+
+    totals["cost_usd"] = round(totals["cost_usd"], 6)
+    totals["cache_hit_ratio"] = (
+        round(totals["cached_tokens"] / totals["prompt_tokens"], 3) if totals["prompt_tokens"] else 0.0
+    )
+    for bucket in by_caller.values():
+        bucket["cost_usd"] = round(bucket["cost_usd"], 6)
+
+    return {**totals, "by_caller": by_caller}
+
+
+@contextmanager
+def collect_usage() -> Iterator[List[UsageRecord]]:
+    """
+    Collect the usage records produced inside the block.
+
+    Example:
+        with collect_usage() as records:
+            client.generate_json(prompt, caller="lesson_generator")
+        summarize_usage(records)
+    """
+    records: List[UsageRecord] = []
+    token = _usage_collector.set(records)
+    try:
+        yield records
+    finally:
+        _usage_collector.reset(token)
+
+
+class UsageTracker:
+    """
+    In-memory ring of recent usage records with periodic flush to the database.
+    """
+
+    def __init__(self, engine=None, ring_size: int = 1000, flush_interval_seconds: float = 60.0):
+        """
+        Initialize the tracker.
+
+        Args:
+            engine: SQLAlchemy engine to flush records to (None keeps them in memory only)
+            ring_size: Number of recent records kept in memory
+            flush_interval_seconds: Minimum time between automatic flushes
+        """
+        self.engine = engine
+        self.flush_interval_seconds = flush_interval_seconds
+        self._recent: Deque[UsageRecord] = deque(maxlen=ring_size)
+        self._pending: List[UsageRecord] = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        # Background flushes started from an event loop (referenced so they aren't garbage collected)
+        self._flush_tasks: Set[asyncio.Task] = set()
+
+    def record(self, record: UsageRecord) -> None:
+        """
+        Store a record and flush pending records if the interval has elapsed.
+
+        Inside an event loop the flush runs in a worker thread so the database
+        write never blocks the loop.
+        """
+        collector = _usage_collector.get()
+        if collector is not None:
+            collector.append(record)
+
+        with self._lock:
+            self._recent.append(record)
+            self._pending.append(record)
+            flush_due = time.monotonic() - self._last_flush >= self.flush_interval_seconds
+            if flush_due:
+                # Claim this flush so concurrent records don't start another one
+                self._last_flush = time.monotonic()
+
+        logger.debug(
+            f"LLM usage [{record.caller}] {record.provider}/{record.model}: "
+            f"{record.prompt_tokens} prompt ({record.cached_tokens} cached), "
+            f"{record.completion_tokens} completion, ${record.cost_usd:.5f}"
+        )
+
+        if flush_due:
+            self._flush_soon()
+
+    def _flush_soon(self) -> None:
+        """Flush off the event loop when called from one, inline otherwise."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        task = loop.create_task(asyncio.to_thread(self.flush))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    def recent(self, caller: Optional[str] = None) -> List[UsageRecord]:
+        """Records still in the in-memory ring, optionally filtered by caller."""
+        with self._lock:
+            records = list(self._recent)
+        if caller:
+            records = [r for r in records if r.caller == caller]
+        return records
+
+    def flush(self) -> int:
+        """
+        Write pending records to the database.
+
+        Returns:
+            Number of records written (0 if there is no engine or on error)
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
+            self._last_flush = time.monotonic()
+
+        if not pending or self.engine is None:
+            return 0
+
+        try:
+            with Session(self.engine) as session:
+                session.add_all(LLMUsageRecord(**asdict(r)) for r in pending)
+                session.commit()
+        except Exception as e:
+            logger.warning(f"Failed to flush {len(pending)} LLM usage records: {e}")
+            with self._lock:
+                self._pending = pending + self._pending
+            return 0
+
+        logger.info(f"Flushed {len(pending)} LLM usage records")
+        return len(pending)
+
+    def get_stats(self, caller: Optional[str] = None) -> Dict[str, Any]:
+        """Summarize the records in the in-memory ring."""
+        return summarize_usage(self.recent(caller))
+
+
+# Global tracker instance (lazy initialization)
+_usage_tracker: Optional[UsageTracker] = None
+
+
+def get_usage_tracker() -> UsageTracker:
+    """
+    Get or create the process-wide usage tracker.
+
+    Returns:
+        UsageTracker flushing to the application database
+    """
+    global _usage_tracker
+    if _usage_tracker is None:
+        from vina_backend.core.config import get_settings
+        from vina_backend.integrations.db.engine import engine
+
+        settings = get_settings()
+        LLMUsageRecord.metadata.create_all(engine, tables=[LLMUsageRecord.__table__])
+        _usage_tracker = UsageTracker(
+            engine,
+            ring_size=settings.llm_usage_ring_size,
+            flush_interval_seconds=settings.llm_usage_flush_interval_seconds,
+        )
+        atexit.register(_usage_tracker.flush)
+    return _usage_tracker
+
+
+def reset_usage_tracker():
+    """
+    Flush and reset the global usage tracker.
+    """
+    global _usage_tracker
+    if _usage_tracker is not None:
+        _usage_tracker.flush()
+    _usage_tracker = None
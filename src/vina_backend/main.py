@@ -93,6 +93,21 @@ app.include_router(assessment.router, prefix="/api/v1", tags=["assessment"])
 app.include_router(lesson_quizzes.router, prefix="/api/v1", tags=["lessons"])
 app.include_router(practice.router, prefix="/api/v1/practice", tags=["practice"])
 
+@app.on_event("startup")
+async def start_job_workers():
+    """Start the background generation job workers (see services/generation_jobs.py)."""
+    if settings.job_workers_enabled:
+        from vina_backend.services.generation_jobs import get_job_worker_pool
+        get_job_worker_pool().start()
+
+
+@app.on_event("shutdown")
+async def stop_job_workers():
+    """Stop the workers; jobs still running go back to the queue."""
+    if settings.job_workers_enabled:
+        from vina_backend.services.generation_jobs import get_job_worker_pool
+        await get_job_worker_pool().stop()
+
 @app.get("/")
 async def root():
     return {
@@ -5,6 +5,8 @@ from pathlib import Path
 from jinja2 import Template
 
 from vina_backend.integrations.llm.client import get_llm_client
+from vina_backend.integrations.llm.token_budget import quiz_max_tokens
+from vina_backend.domain.schemas.lesson_quiz import LessonQuiz
 
 logger = logging.getLogger(__name__)
 
@@ -61,7 +63,9 @@ class LessonQuizGeneratorAgent:
             quiz_json = self.llm.generate_json(
                 prompt,
                 temperature=0.7,  # Creative scenarios
-                max_tokens=3000
+                max_tokens=quiz_max_tokens(3),  # LessonQuiz has exactly 3 questions
+                response_model=LessonQuiz,
+                caller="lesson_quiz_generator"
             )
             
             logger.info(f"   ✅ Generated {len(quiz_json.get('questions', []))} questions")
@@ -62,7 +62,9 @@ class LessonQuizReviewerAgent:
             review_json = self.llm.generate_json(
                 prompt,
                 temperature=0.2,  # Low temp for consistent evaluation
-                max_tokens=1000
+                max_tokens=1000,
+                response_model=ReviewResult,
+                caller="lesson_quiz_reviewer"
             )
             
             result = ReviewResult(**review_json)
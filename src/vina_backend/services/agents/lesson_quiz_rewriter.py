@@ -6,6 +6,8 @@ from pathlib import Path
 from jinja2 import Template
 
 from vina_backend.integrations.llm.client import get_llm_client
+from vina_backend.integrations.llm.token_budget import quiz_max_tokens
+from vina_backend.domain.schemas.lesson_quiz import LessonQuiz
 
 logger = logging.getLogger(__name__)
 
@@ -65,7 +67,9 @@ class LessonQuizRewriterAgent:
             fixed_quiz = self.llm.generate_json(
                 prompt,
                 temperature=0.5,  # Moderate creativity for fixes
-                max_tokens=3000
+                max_tokens=quiz_max_tokens(3),  # LessonQuiz has exactly 3 questions
+                response_model=LessonQuiz,
+                caller="lesson_quiz_rewriter"
             )
             
             logger.info("   ✅ Quiz rewritten")
@@ -5,7 +5,7 @@ import json
 from jinja2 import Template
 
 from vina_backend.integrations.llm.client import get_llm_client
-from vina_backend.domain.schemas.practice_quiz import PracticeQuestion, PracticeQuizOption
+from vina_backend.domain.schemas.practice_quiz import PracticeQuestion, PracticeQuizOption, PracticeQuestionBatch
 
 logger = logging.getLogger(__name__)
 
@@ -38,7 +38,7 @@ class PracticeQuestionGeneratorAgent:
         # Call LLM
         try:
             # Using generate_json assuming the client supports it as seen in other agents
-            data = self.llm.generate_json(prompt, temperature=0.7)
+            data = self.llm.generate_json(prompt, temperature=0.7, response_model=PracticeQuestionBatch, caller="practice_question_generator")
             
             questions_data = data.get("questions", [])
             
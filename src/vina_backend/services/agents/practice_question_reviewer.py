@@ -39,7 +39,7 @@ class PracticeQuestionReviewerAgent:
         )
         
         try:
-            data = self.llm.generate_json(prompt, temperature=0.3)
+            data = self.llm.generate_json(prompt, temperature=0.3, caller="practice_question_reviewer")
             return data.get("reviews", [])
         except Exception as e:
             logger.error(f"Error parsing review response: {e}")
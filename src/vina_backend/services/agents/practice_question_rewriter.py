@@ -5,7 +5,7 @@ import json
 from jinja2 import Template
 
 from vina_backend.integrations.llm.client import get_llm_client
-from vina_backend.domain.schemas.practice_quiz import PracticeQuestion, PracticeQuizOption
+from vina_backend.domain.schemas.practice_quiz import PracticeQuestion, PracticeQuizOption, PracticeQuestionBatch
 
 logger = logging.getLogger(__name__)
 
@@ -45,7 +45,7 @@ class PracticeQuestionRewriterAgent:
         )
         
         try:
-            data = self.llm.generate_json(prompt, temperature=0.5)
+            data = self.llm.generate_json(prompt, temperature=0.5, response_model=PracticeQuestionBatch, caller="practice_question_rewriter")
             rewritten_data = data.get("questions", [])
             
             final_questions = []
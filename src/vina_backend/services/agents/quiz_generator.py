@@ -48,7 +48,8 @@ class QuizGeneratorAgent:
             quiz_json = self.llm.generate_json(
                 prompt,
                 temperature=0.7,  # Creative but controlled
-                max_tokens=3000
+                max_tokens=3000,
+                caller="onboarding_quiz_generator"
             )
             
             logger.info(f"   ✅ Generated {len(quiz_json.get('questions', []))} questions")
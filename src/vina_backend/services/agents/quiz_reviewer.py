@@ -54,7 +54,8 @@ class QuizReviewerAgent:
             review_json = self.llm.generate_json(
                 prompt,
                 temperature=0.2,  # Low temperature for consistent evaluation
-                max_tokens=1000
+                max_tokens=1000,
+                caller="onboarding_quiz_reviewer"
             )
             
             # Since the prompt structure might differ slightly from the pydantic model 
@@ -62,7 +62,8 @@ class QuizRewriterAgent:
             fixed_quiz = self.llm.generate_json(
                 prompt,
                 temperature=0.5,  # Moderate creativity for fixes
-                max_tokens=3000
+                max_tokens=3000,
+                caller="onboarding_quiz_rewriter"
             )
             
             logger.info("   ✅ Quiz rewritten")
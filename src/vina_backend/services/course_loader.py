@@ -92,6 +92,26 @@ def get_lesson_config(course_id: str, lesson_id: str) -> Dict[str, Any]:
     return lesson
 
 
+def find_course_for_lesson(lesson_id: str) -> Optional[str]:
+    """
+    Find the course a lesson belongs to.
+    
+    Args:
+        lesson_id: Lesson identifier (e.g., "l01_what_llms_are")
+    
+    Returns:
+        Course identifier, or None if no course config lists the lesson
+    """
+    for course_path in sorted([*CONSTANTS_DIR.glob("*.json"), *CONSTANTS_DIR.glob("courses/*.json")]):
+        with open(course_path, "r") as f:
+            config = json.load(f)
+        if not isinstance(config, dict) or "course_id" not in config:
+            continue
+        if any(lesson.get("lesson_id") == lesson_id for lesson in config.get("lessons", [])):
+            return config["course_id"]
+    return None
+
+
 def get_difficulty_knobs(difficulty_level: int) -> Dict[str, Any]:
     """
     Get the delivery metrics for a specific difficulty level.
@@ -0,0 +1,115 @@
+"""
+Pre-built fallback lessons.
+
+The fallback path of LessonGenerator runs exactly when the LLM pipeline is
+struggling (generation failed or the reviewer demanded regeneration), so
+another LLM call with fallback_generator.md is the least reliable thing it
+can do. The fallback bank is built offline by
+scripts/generate_fallback_bank.py: one validated, profession-neutral lesson
+per (course, lesson, difficulty), stored in
+domain/constants/fallback_lessons.json next to the course configs:
+
+    {
+      "version": 3,
+      "prompt_version": "<hash of fallback_generator.md>",
+      "generated_at": "...",
+      "courses": {"c_llm_foundations": {"l01_what_llms_are": {"1": {...}, "3": {...}, "5": {...}}}}
+    }
+
+Lessons are LessonContent JSON. The generator serves them with no LLM call
+and queues a personalized regeneration in the background.
+"""
+import copy
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from vina_backend.services.course_loader import CONSTANTS_DIR
+
+logger = logging.getLogger(__name__)
+
+FALLBACK_BANK_PATH = CONSTANTS_DIR / "fallback_lessons.json"
+
+_bank_cache: Dict[Path, Dict[str, Any]] = {}
+
+
+def empty_bank() -> Dict[str, Any]:
+    """Bank with no lessons (version 0)."""
+    return {"version": 0, "prompt_version": None, "generated_at": None, "courses": {}}
+
+
+def load_fallback_bank(path: Path = FALLBACK_BANK_PATH, reload: bool = False) -> Dict[str, Any]:
+    """
+    Load the fallback bank (cached after the first read).
+
+    Args:
+        path: Bank file
+        reload: Re-read the file even if it is cached
+
+    Returns:
+        Bank dictionary (empty_bank() if the file does not exist)
+    """
+    if reload or path not in _bank_cache:
+        if path.exists():
+            with open(path, "r") as f:
+                _bank_cache[path] = json.load(f)
+        else:
+            logger.warning(f"Fallback bank not found at {path}")
+            _bank_cache[path] = empty_bank()
+    return _bank_cache[path]
+
+
+def get_fallback_lesson(
+    course_id: str,
+    lesson_id: str,
+    difficulty_level: int,
+    path: Path = FALLBACK_BANK_PATH,
+) -> Optional[Dict[str, Any]]:
+    """
+    Pre-built lesson for a course lesson, at the closest difficulty available.
+
+    Args:
+        course_id: Course identifier
+        lesson_id: Lesson identifier
+        difficulty_level: Requested difficulty
+        path: Bank file
+
+    Returns:
+        Copy of the lesson JSON, or None if the bank has no lesson for it
+    """
+    levels = load_fallback_bank(path)["courses"].get(course_id, {}).get(lesson_id, {})
+    if not levels:
+        return None
+    closest = min(levels, key=lambda level: (abs(int(level) - difficulty_level), int(level)))
+    return copy.deepcopy(levels[closest])
+
+
+def set_fallback_lesson(
+    bank: Dict[str, Any],
+    course_id: str,
+    lesson_id: str,
+    difficulty_level: int,
+    lesson_json: Dict[str, Any],
+):
+    """Add or replace a lesson in a bank dictionary (see save_fallback_bank)."""
+    bank["courses"].setdefault(course_id, {}).setdefault(lesson_id, {})[str(difficulty_level)] = lesson_json
+
+
+def save_fallback_bank(bank: Dict[str, Any], prompt_version: str, path: Path = FALLBACK_BANK_PATH):
+    """
+    Write the bank as a new version.
+
+    Args:
+        bank: Bank dictionary
+        prompt_version: Hash of the fallback prompt the lessons were built with
+        path: Bank file
+    """
+    bank["version"] = bank.get("version", 0) + 1
+    bank["prompt_version"] = prompt_version
+    bank["generated_at"] = datetime.utcnow().isoformat()
+    with open(path, "w") as f:
+        json.dump(bank, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    _bank_cache[path] = bank
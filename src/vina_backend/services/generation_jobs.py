@@ -0,0 +1,711 @@
+"""
+Persistent background job queue for lesson and video generation.
+
+POST /lessons/adapt enqueues a job; a pool of async workers started with
+the API claims queued jobs, runs the lesson pipeline and VideoPipeline, and
+records the result. Jobs live in the generation_jobs table so they survive
+restarts:
+
+    queued -> running -> succeeded
+                      -> queued (retry after backoff) -> ... -> failed
+
+A claim is an atomic "UPDATE ... WHERE status = 'queued'", so several API
+processes can share one queue. Jobs left running by a crashed process are
+re-queued when the pool starts.
+"""
+import asyncio
+import json
+import logging
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import and_, func, or_, update
+from sqlmodel import Field, Session, SQLModel, col, select
+
+from vina_backend.integrations.llm.scheduler import llm_priority
+
+logger = logging.getLogger(__name__)
+
+JOB_STATES = ("queued", "running", "succeeded", "failed")
+
+# Used for ETAs until enough jobs have completed
+DEFAULT_JOB_SECONDS = 120.0
+
+# Higher priority jobs are claimed first
+JOB_PRIORITY_ADAPT = 10  # A learner is waiting on /lessons/adapt
+JOB_PRIORITY_REGENERATE = 5  # Personalized replacement for a served fallback lesson
+JOB_PRIORITY_PREFETCH = 0  # Speculative pre-generation (see services/lesson_prefetch.py)
+
+# Job types whose handlers raise on a fallback lesson, so the queue retries them
+RETRY_ON_FALLBACK_JOB_TYPES = ("lesson_video", "lesson")
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+# Type of the job running in the current context (set by JobWorkerPool._run)
+_current_job_type: ContextVar[Optional[str]] = ContextVar("generation_job_type", default=None)
+
+
+def get_current_job_type() -> Optional[str]:
+    """Type of the job being run in the current context (None outside job workers)."""
+    return _current_job_type.get()
+
+
+class GenerationJob(SQLModel, table=True):
+    """Database model for queued generation jobs."""
+
+    __tablename__ = "generation_jobs"
+
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
+    job_type: str = Field(index=True)
+    status: str = Field(default="queued", index=True)
+    priority: int = Field(default=JOB_PRIORITY_ADAPT, index=True)
+    user_id: Optional[str] = Field(default=None, index=True)
+    dedup_key: Optional[str] = Field(default=None, index=True)  # Identical pending jobs are merged
+
+    payload_json: str
+    result_json: Optional[str] = None
+    error: Optional[str] = None
+
+    attempts: int = Field(default=0)
+    max_attempts: int = Field(default=3)
+    run_after: datetime = Field(default_factory=datetime.utcnow, index=True)  # Retry backoff
+    worker_id: Optional[str] = None
+
+    created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class JobQueue:
+    """
+    Database-backed job queue with retries and exponential backoff.
+    """
+
+    def __init__(self, engine, max_attempts: int = 3, retry_backoff_seconds: float = 30.0):
+        """
+        Initialize the queue.
+
+        Args:
+            engine: SQLAlchemy engine holding the generation_jobs table
+            max_attempts: Attempts per job before it is marked failed
+            retry_backoff_seconds: Delay before the first retry (doubles per attempt)
+        """
+        self.engine = engine
+        self.max_attempts = max_attempts
+        self.retry_backoff_seconds = retry_backoff_seconds
+
+    def enqueue(
+        self,
+        job_type: str,
+        payload: Dict[str, Any],
+        user_id: Optional[str] = None,
+        dedup_key: Optional[str] = None,
+        priority: int = JOB_PRIORITY_ADAPT,
+    ) -> GenerationJob:
+        """
+        Add a job, or return the pending job with the same dedup_key.
+
+        Args:
+            job_type: Handler name (see JobWorkerPool handlers)
+            payload: JSON-serializable handler input
+            user_id: Owner of the job (for the status endpoint)
+            dedup_key: Jobs with the same key that are still queued/running are reused
+            priority: Jobs with higher priority are claimed first
+
+        Returns:
+            The queued (or already pending) job
+        """
+        with Session(self.engine) as session:
+            if dedup_key:
+                existing = session.exec(
+                    select(GenerationJob).where(
+                        GenerationJob.dedup_key == dedup_key,
+                        col(GenerationJob.status).in_(["queued", "running"]),
+                    )
+                ).first()
+                if existing:
+                    if priority > existing.priority:  # e.g. a learner now waits on a prefetch
+                        existing.priority = priority
+                        session.add(existing)
+                        session.commit()
+                        session.refresh(existing)
+                    logger.info(f"Job for {dedup_key} already pending ({existing.id})")
+                    return existing
+
+            job = GenerationJob(
+                job_type=job_type,
+                user_id=user_id,
+                dedup_key=dedup_key,
+                priority=priority,
+                payload_json=json.dumps(payload),
+                max_attempts=self.max_attempts,
+            )
+            session.add(job)
+            session.commit()
+            session.refresh(job)
+            logger.info(f"Enqueued {job_type} job {job.id}")
+            return job
+
+    def claim(self, worker_id: str) -> Optional[GenerationJob]:
+        """
+        Atomically move the highest-priority, oldest runnable job to running.
+
+        Returns:
+            The claimed job, or None if nothing is runnable
+        """
+        with Session(self.engine) as session:
+            for _ in range(5):  # Another worker may claim the same candidate first
+                candidate = session.exec(
+                    select(GenerationJob)
+                    .where(GenerationJob.status == "queued", GenerationJob.run_after <= datetime.utcnow())
+                    .order_by(col(GenerationJob.priority).desc(), GenerationJob.created_at)
+                ).first()
+                if candidate is None:
+                    return None
+
+                claimed = session.execute(
+                    update(GenerationJob)
+                    .where(GenerationJob.id == candidate.id, GenerationJob.status == "queued")
+                    .values(
+                        status="running",
+                        worker_id=worker_id,
+                        attempts=GenerationJob.attempts + 1,
+                        started_at=datetime.utcnow(),
+                    )
+                )
+                session.commit()
+                if claimed.rowcount == 1:
+                    session.refresh(candidate)
+                    return candidate
+            return None
+
+    def complete(self, job_id: str, result: Dict[str, Any]) -> None:
+        """Mark a job succeeded and store its result."""
+        with Session(self.engine) as session:
+            job = session.get(GenerationJob, job_id)
+            if job is None:
+                return
+            job.status = "succeeded"
+            job.result_json = json.dumps(result)
+            job.error = None
+            job.finished_at = datetime.utcnow()
+            session.add(job)
+            session.commit()
+
+    def fail(self, job_id: str, error: str) -> None:
+        """Re-queue a failed job with backoff, or mark it failed after max_attempts."""
+        with Session(self.engine) as session:
+            job = session.get(GenerationJob, job_id)
+            if job is None:
+                return
+            job.error = error
+            if job.attempts < job.max_attempts:
+                delay = self.retry_backoff_seconds * 2 ** (job.attempts - 1)
+                job.status = "queued"
+                job.run_after = datetime.utcnow() + timedelta(seconds=delay)
+                logger.warning(f"Job {job_id} failed (attempt {job.attempts}/{job.max_attempts}), retrying in {delay:.0f}s: {error}")
+            else:
+                job.status = "failed"
+                job.finished_at = datetime.utcnow()
+                logger.error(f"Job {job_id} failed permanently after {job.attempts} attempts: {error}")
+            session.add(job)
+            session.commit()
+
+    def release(self, job_id: str) -> None:
+        """Return a running job to the queue without counting the attempt (e.g. on shutdown)."""
+        with Session(self.engine) as session:
+            session.execute(
+                update(GenerationJob)
+                .where(GenerationJob.id == job_id, GenerationJob.status == "running")
+                .values(status="queued", attempts=GenerationJob.attempts - 1, worker_id=None)
+            )
+            session.commit()
+
+    def requeue_stale(self, older_than_seconds: float) -> int:
+        """
+        Re-queue running jobs whose worker died.
+
+        Returns:
+            Number of jobs re-queued
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=older_than_seconds)
+        with Session(self.engine) as session:
+            result = session.execute(
+                update(GenerationJob)
+                .where(GenerationJob.status == "running", GenerationJob.started_at < cutoff)
+                .values(status="queued", worker_id=None)
+            )
+            session.commit()
+        if result.rowcount:
+            logger.warning(f"Re-queued {result.rowcount} stale running job(s)")
+        return result.rowcount
+
+    def get(self, job_id: str) -> Optional[GenerationJob]:
+        """Load a job by id."""
+        with Session(self.engine) as session:
+            return session.get(GenerationJob, job_id)
+
+    def average_duration(self, sample_size: int = 20) -> float:
+        """Mean run time of recently succeeded jobs (DEFAULT_JOB_SECONDS if none)."""
+        with Session(self.engine) as session:
+            jobs = session.exec(
+                select(GenerationJob)
+                .where(GenerationJob.status == "succeeded", col(GenerationJob.started_at).is_not(None))
+                .order_by(col(GenerationJob.finished_at).desc())
+                .limit(sample_size)
+            ).all()
+        durations = [(job.finished_at - job.started_at).total_seconds() for job in jobs]
+        return sum(durations) / len(durations) if durations else DEFAULT_JOB_SECONDS
+
+    def estimate_seconds(self, job: GenerationJob, workers: int) -> Dict[str, Any]:
+        """
+        Estimate when a job will finish from the queue ahead of it.
+
+        Args:
+            job: Queued or running job
+            workers: Jobs processed in parallel
+
+        Returns:
+            Dictionary with queue_position (jobs ahead) and eta_seconds
+        """
+        if job.status in ("succeeded", "failed"):
+            return {"queue_position": 0, "eta_seconds": 0}
+
+        average = self.average_duration()
+        if job.status == "running":
+            elapsed = (datetime.utcnow() - job.started_at).total_seconds() if job.started_at else 0
+            return {"queue_position": 0, "eta_seconds": round(max(average - elapsed, 5))}
+
+        with Session(self.engine) as session:
+            ahead = session.exec(
+                select(func.count()).select_from(GenerationJob).where(
+                    col(GenerationJob.status).in_(["queued", "running"]),
+                    or_(
+                        GenerationJob.status == "running",
+                        GenerationJob.priority > job.priority,
+                        and_(GenerationJob.priority == job.priority, GenerationJob.created_at < job.created_at),
+                    ),
+                )
+            ).one()
+        waves = ahead // max(workers, 1) + 1
+        backoff = max((job.run_after - datetime.utcnow()).total_seconds(), 0)
+        return {"queue_position": ahead, "eta_seconds": round(waves * average + backoff)}
+
+    def depth(self) -> Dict[str, int]:
+        """Number of jobs per state."""
+        with Session(self.engine) as session:
+            rows = session.exec(
+                select(GenerationJob.status, func.count()).group_by(GenerationJob.status)
+            ).all()
+        counts = {state: 0 for state in JOB_STATES}
+        counts.update({status: count for status, count in rows})
+        return counts
+
+
+class JobWorkerPool:
+    """
+    Async workers claiming jobs from a JobQueue and running their handlers.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handlers: Dict[str, JobHandler],
+        concurrency: int = 2,
+        poll_seconds: float = 1.0,
+        job_timeout_seconds: float = 900.0,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            queue: Queue to consume
+            handlers: Mapping of job_type -> async handler(payload) -> result
+            concurrency: Number of jobs run in parallel
+            poll_seconds: Idle delay between claims when the queue is empty
+            job_timeout_seconds: A job running longer than this fails (and may retry)
+        """
+        self.queue = queue
+        self.handlers = handlers
+        self.concurrency = concurrency
+        self.poll_seconds = poll_seconds
+        self.job_timeout_seconds = job_timeout_seconds
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        """Start the workers on the running event loop."""
+        if self._tasks:
+            return
+        self.queue.requeue_stale(self.job_timeout_seconds)
+        prefix = uuid.uuid4().hex[:6]
+        self._tasks = [
+            asyncio.create_task(self._work(f"{prefix}-{index}"))
+            for index in range(self.concurrency)
+        ]
+        logger.info(f"Started {self.concurrency} generation job worker(s)")
+
+    async def stop(self) -> None:
+        """Cancel the workers; jobs they were running go back to the queue."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _work(self, worker_id: str) -> None:
+        while True:
+            try:
+                job = await asyncio.to_thread(self.queue.claim, worker_id)
+            except Exception as e:
+                logger.error(f"Job worker {worker_id} could not claim a job: {e}")
+                job = None
+            if job is None:
+                await asyncio.sleep(self.poll_seconds)
+                continue
+            await self._run(job)
+
+    async def _run(self, job: GenerationJob) -> None:
+        handler = self.handlers.get(job.job_type)
+        if handler is None:
+            await asyncio.to_thread(self.queue.fail, job.id, f"No handler for job type {job.job_type}")
+            return
+
+        logger.info(f"Running {job.job_type} job {job.id} (attempt {job.attempts}/{job.max_attempts})")
+        token = _current_job_type.set(job.job_type)
+        try:
+            with llm_priority("batch"):  # Live requests keep precedence over background jobs
+                result = await asyncio.wait_for(handler(json.loads(job.payload_json)), self.job_timeout_seconds)
+        except asyncio.CancelledError:
+            await asyncio.to_thread(self.queue.release, job.id)
+            raise
+        except Exception as e:
+            await asyncio.to_thread(self.queue.fail, job.id, f"{type(e).__name__}: {e}")
+        else:
+            await asyncio.to_thread(self.queue.complete, job.id, result)
+            logger.info(f"Job {job.id} succeeded")
+        finally:
+            _current_job_type.reset(token)
+
+
+async def run_lesson_video_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Generate a lesson (cached if possible) and its video, then store the video URL.
+
+    Args:
+        payload: course_id, lesson_id, difficulty_level, adaptation_context and
+            profile (UserProfileData fields)
+
+    Returns:
+        Dictionary with video_url, lesson_title and cache_hit
+
+    Raises:
+        RuntimeError: If the pipeline fell back (the job is retried with backoff;
+            a fallback lesson is not cached, so there is no row to attach a video to)
+    """
+    from pathlib import Path
+
+    from vina_backend.domain.schemas.profile import UserProfileData
+    from vina_backend.integrations.db.engine import engine
+    from vina_backend.services.lesson_cache import LessonCacheService
+    from vina_backend.services.lesson_generator import LessonGenerator
+    from vina_backend.services.video_pipeline import PipelineConfig, VideoPipeline, lesson_to_video_data
+
+    user_profile = UserProfileData(**payload["profile"])
+    course_id = payload["course_id"]
+    lesson_id = payload["lesson_id"]
+    difficulty_level = payload["difficulty_level"]
+    adaptation_context = payload.get("adaptation_context")
+
+    # Cache calls run in worker threads, so each one opens its own session
+    cache_service = LessonCacheService(engine=engine)
+    generator = LessonGenerator(cache_service=cache_service)
+    lesson = await generator.generate_lesson_async(
+        lesson_id=lesson_id,
+        course_id=course_id,
+        user_profile=user_profile,
+        difficulty_level=difficulty_level,
+        adaptation_context=adaptation_context,
+    )
+    if lesson.generation_metadata.fallback:
+        raise RuntimeError(f"Lesson {lesson_id} fell back ({lesson.generation_metadata.fallback})")
+
+    run_name = (
+        f"{LessonCacheService.generate_profile_hash(user_profile)}_d{difficulty_level}_"
+        f"{adaptation_context or 'base'}_{course_id}_{lesson_id}"
+    )
+    output_path = Path(f"cache/jobs/{run_name}.mp4")
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    pipeline = VideoPipeline(PipelineConfig(
+        cache_dir=Path(f"cache/runs/{run_name}"),
+        course_label=f"{user_profile.profession} Masterclass",
+    ))
+    result = await pipeline.generate_video_async(
+        lesson_data=lesson_to_video_data(lesson.lesson_content),
+        output_path=output_path,
+    )
+
+    video_url = result.video_url
+    if video_url is None:  # Video cache hit (not uploaded by the pipeline)
+        video_url = await asyncio.to_thread(
+            pipeline.cloudinary_client.upload_video,
+            file_path=result.video_path,
+            folder="vina_lessons_adapted" if adaptation_context else "vina_lessons",
+        )
+
+    await asyncio.to_thread(
+        cache_service.update_video_url,
+        course_id=course_id,
+        lesson_id=lesson_id,
+        difficulty_level=difficulty_level,
+        user_profile=user_profile,
+        llm_model=generator.llm_client.model,
+        video_url=video_url,
+        adaptation_context=adaptation_context,
+    )
+
+    return {
+        "video_url": video_url,
+        "lesson_title": lesson.lesson_content.lesson_title,
+        "cache_hit": lesson.generation_metadata.cache_hit,
+    }
+
+
+async def run_lesson_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Generate and cache a lesson without a video (replaces a served fallback lesson).
+
+    Args:
+        payload: course_id, lesson_id, difficulty_level, adaptation_context and
+            profile (UserProfileData fields)
+
+    Returns:
+        Dictionary with lesson_title and cache_hit
+
+    Raises:
+        RuntimeError: If the pipeline fell back again (the job is retried with backoff)
+    """
+    from vina_backend.domain.schemas.profile import UserProfileData
+    from vina_backend.integrations.db.engine import engine
+    from vina_backend.services.lesson_cache import LessonCacheService
+    from vina_backend.services.lesson_generator import LessonGenerator
+
+    generator = LessonGenerator(cache_service=LessonCacheService(engine=engine))
+    lesson = await generator.generate_lesson_async(
+        lesson_id=payload["lesson_id"],
+        course_id=payload["course_id"],
+        user_profile=UserProfileData(**payload["profile"]),
+        difficulty_level=payload["difficulty_level"],
+        adaptation_context=payload.get("adaptation_context"),
+    )
+
+    if lesson.generation_metadata.fallback:
+        raise RuntimeError(f"Lesson {payload['lesson_id']} fell back again ({lesson.generation_metadata.fallback})")
+    return {
+        "lesson_title": lesson.lesson_content.lesson_title,
+        "cache_hit": lesson.generation_metadata.cache_hit,
+    }
+
+
+async def run_lesson_variants_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Derive and cache the difficulty variants of a lesson (LESSON_VARIANT_MODE=derived).
+
+    Args:
+        payload: course_id, lesson_id and profile (UserProfileData fields)
+
+    Returns:
+        Dictionary with the derived difficulty levels
+    """
+    from vina_backend.domain.schemas.profile import UserProfileData
+    from vina_backend.integrations.db.engine import engine
+    from vina_backend.services.lesson_cache import LessonCacheService
+    from vina_backend.services.lesson_generator import LessonGenerator
+
+    generator = LessonGenerator(cache_service=LessonCacheService(engine=engine))
+    derived = await generator.derive_difficulty_variants_async(
+        lesson_id=payload["lesson_id"],
+        course_id=payload["course_id"],
+        user_profile=UserProfileData(**payload["profile"]),
+    )
+    return {"derived_difficulties": derived}
+
+
+def enqueue_lesson_variants_job(
+    course_id: str,
+    lesson_id: str,
+    user_profile: Any,
+    priority: int = JOB_PRIORITY_PREFETCH,
+) -> GenerationJob:
+    """
+    Queue derivation of a lesson's difficulty variants for a learner profile.
+
+    Args:
+        course_id: Course identifier
+        lesson_id: Lesson identifier (without course prefix)
+        user_profile: UserProfileData of the learner
+        priority: Defaults to JOB_PRIORITY_PREFETCH (speculative work)
+
+    Returns:
+        The queued (or already pending) job
+    """
+    from vina_backend.services.lesson_cache import LessonCacheService
+
+    profile_hash = LessonCacheService.generate_profile_hash(user_profile)
+    return get_job_queue().enqueue(
+        "lesson_variants",
+        payload={
+            "course_id": course_id,
+            "lesson_id": lesson_id,
+            "profile": user_profile.model_dump(),
+        },
+        dedup_key=f"variants:{course_id}:{lesson_id}:{profile_hash}",
+        priority=priority,
+    )
+
+
+def enqueue_lesson_job(
+    course_id: str,
+    lesson_id: str,
+    difficulty_level: int,
+    user_profile: Any,
+    adaptation_context: Optional[str] = None,
+    priority: int = JOB_PRIORITY_REGENERATE,
+) -> GenerationJob:
+    """
+    Queue (re)generation of a lesson for a learner profile, without a video.
+
+    Args:
+        course_id: Course identifier
+        lesson_id: Lesson identifier (without course prefix)
+        difficulty_level: Difficulty level (1, 3, or 5)
+        user_profile: UserProfileData of the learner
+        adaptation_context: Optional adaptation context (e.g. "examples")
+        priority: Defaults to JOB_PRIORITY_REGENERATE
+
+    Returns:
+        The queued (or already pending) job
+    """
+    from vina_backend.services.lesson_cache import LessonCacheService
+
+    profile_hash = LessonCacheService.generate_profile_hash(user_profile)
+    return get_job_queue().enqueue(
+        "lesson",
+        payload={
+            "course_id": course_id,
+            "lesson_id": lesson_id,
+            "difficulty_level": difficulty_level,
+            "adaptation_context": adaptation_context,
+            "profile": user_profile.model_dump(),
+        },
+        dedup_key=f"lesson:{course_id}:{lesson_id}:d{difficulty_level}:{profile_hash}:{adaptation_context}",
+        priority=priority,
+    )
+
+
+def enqueue_lesson_video_job(
+    course_id: str,
+    lesson_id: str,
+    difficulty_level: int,
+    user_profile: Any,
+    adaptation_context: Optional[str] = None,
+    user_id: Optional[str] = None,
+    priority: int = JOB_PRIORITY_ADAPT,
+) -> GenerationJob:
+    """
+    Queue generation of a lesson and its video for a learner profile.
+
+    Jobs for the same lesson, difficulty, adaptation and profile hash (the
+    fields of the lesson cache key) are merged while pending.
+
+    Args:
+        course_id: Course identifier
+        lesson_id: Lesson identifier (without course prefix)
+        difficulty_level: Difficulty level (1, 3, or 5)
+        user_profile: UserProfileData of the learner
+        adaptation_context: Optional adaptation context (e.g. "examples")
+        user_id: Owner of the job
+        priority: JOB_PRIORITY_ADAPT or JOB_PRIORITY_PREFETCH
+
+    Returns:
+        The queued (or already pending) job
+    """
+    from vina_backend.services.lesson_cache import LessonCacheService
+
+    profile_hash = LessonCacheService.generate_profile_hash(user_profile)
+    return get_job_queue().enqueue(
+        "lesson_video",
+        payload={
+            "course_id": course_id,
+            "lesson_id": lesson_id,
+            "difficulty_level": difficulty_level,
+            "adaptation_context": adaptation_context,
+            "profile": user_profile.model_dump(),
+        },
+        user_id=user_id,
+        dedup_key=f"{course_id}:{lesson_id}:d{difficulty_level}:{profile_hash}:{adaptation_context}",
+        priority=priority,
+    )
+
+
+# Global queue and worker pool (lazy initialization)
+_job_queue: Optional[JobQueue] = None
+_worker_pool: Optional[JobWorkerPool] = None
+
+
+def get_job_queue() -> JobQueue:
+    """
+    Get or create the process-wide job queue.
+
+    Returns:
+        JobQueue backed by the application database
+    """
+    global _job_queue
+    if _job_queue is None:
+        from vina_backend.core.config import get_settings
+        from vina_backend.integrations.db.engine import engine
+
+        settings = get_settings()
+        GenerationJob.metadata.create_all(engine, tables=[GenerationJob.__table__])
+        _job_queue = JobQueue(
+            engine,
+            max_attempts=settings.job_max_attempts,
+            retry_backoff_seconds=settings.job_retry_backoff_seconds,
+        )
+    return _job_queue
+
+
+def get_job_worker_pool() -> JobWorkerPool:
+    """
+    Get or create the process-wide worker pool (start it with .start()).
+
+    Returns:
+        JobWorkerPool handling "lesson_video", "lesson" and "lesson_variants" jobs
+    """
+    global _worker_pool
+    if _worker_pool is None:
+        from vina_backend.core.config import get_settings
+
+        settings = get_settings()
+        _worker_pool = JobWorkerPool(
+            get_job_queue(),
+            handlers={
+                "lesson_video": run_lesson_video_job,
+                "lesson": run_lesson_job,
+                "lesson_variants": run_lesson_variants_job,
+            },
+            concurrency=settings.job_workers,
+            poll_seconds=settings.job_poll_seconds,
+            job_timeout_seconds=settings.job_timeout_seconds,
+        )
+    return _worker_pool
+
+
+def reset_job_queue():
+    """
+    Reset the global queue and worker pool (stored jobs are kept).
+    """
+    global _job_queue, _worker_pool
+    _job_queue = None
+    _worker_pool = None
@@ -14,6 +14,24 @@ from vina_backend.services.course_loader import load_course_config
 logger = logging.getLogger(__name__)
 
 
+def next_difficulty(current_difficulty: int, quiz_score: int) -> int:
+    """
+    Difficulty after a quiz (see LearnerStateManager.mark_lesson_complete).
+    
+    Args:
+        current_difficulty: Difficulty the lesson was taken at
+        quiz_score: Score out of 3
+    
+    Returns:
+        New difficulty (1-5)
+    """
+    if quiz_score == 3:
+        return min(5, current_difficulty + 1)
+    if quiz_score == 2:
+        return current_difficulty
+    return max(1, current_difficulty - 1)
+
+
 class LearnerStateManager:
     """
     Manages learner state including progress tracking, difficulty adjustments,
@@ -216,16 +234,16 @@ class LearnerStateManager:
         # Adjust difficulty based on quiz performance
         old_difficulty = learner_state.current_difficulty
         
+        learner_state.current_difficulty = next_difficulty(old_difficulty, quiz_score)
+        
         if quiz_score == 3:
             # Perfect score: increase difficulty
-            learner_state.current_difficulty = min(5, learner_state.current_difficulty + 1)
             adjustment = "increased" if learner_state.current_difficulty > old_difficulty else "maintained (at max)"
         elif quiz_score == 2:
             # Passing score: maintain difficulty
             adjustment = "maintained"
         else:  # quiz_score in [0, 1]
             # Failing score: decrease difficulty
-            learner_state.current_difficulty = max(1, learner_state.current_difficulty - 1)
             adjustment = "decreased" if learner_state.current_difficulty < old_difficulty else "maintained (at min)"
         
         learner_state.updated_at = datetime.utcnow()
@@ -4,7 +4,8 @@ Lesson caching service to avoid regenerating identical lessons.
 import hashlib
 import json
 import logging
-from typing import Optional, Dict
+from contextlib import contextmanager
+from typing import Iterator, Optional, Dict
 from datetime import datetime
 from sqlmodel import Session, select, SQLModel, Field
 
@@ -47,8 +48,26 @@ class LessonCache(SQLModel, table=True):
 class LessonCacheService:
     """Service for caching generated lessons."""
     
-    def __init__(self, db_session: Session):
+    def __init__(self, db_session: Optional[Session] = None, engine=None):
+        """
+        Initialize the service.
+        
+        Args:
+            db_session: Session used by every call (request handlers)
+            engine: Open a new session per call instead; use this when calls run
+                in worker threads (asyncio.to_thread), as sessions are not thread-safe
+        """
         self.db_session = db_session
+        self.engine = engine
+    
+    @contextmanager
+    def _session(self) -> Iterator[Session]:
+        """The shared db_session, or a short-lived session when built from an engine."""
+        if self.engine is None:
+            yield self.db_session
+            return
+        with Session(self.engine) as session:
+            yield session
     
     @staticmethod
     def generate_profile_hash(user_profile: UserProfileData) -> str:
@@ -85,13 +104,15 @@ class LessonCacheService:
         )
         
         statement = select(LessonCache).where(LessonCache.cache_key == cache_key)
-        cached_entry = self.db_session.exec(statement).first()
-        
-        if cached_entry:
+        with self._session() as session:
+            cached_entry = session.exec(statement).first()
+            if not cached_entry:
+                return None
+            
             cached_entry.accessed_at = datetime.utcnow()
             cached_entry.access_count += 1
-            self.db_session.add(cached_entry)
-            self.db_session.commit()
+            session.add(cached_entry)
+            session.commit()
             
             return {
                 "lesson_content": json.loads(cached_entry.lesson_json),
@@ -105,8 +126,27 @@ class LessonCacheService:
                     "rew_output": json.loads(cached_entry.lesson_json) if cached_entry.rew_prompt else None
                 }
             }
+    
+    def is_cached(
+        self,
+        course_id: str,
+        lesson_id: str,
+        difficulty_level: int,
+        user_profile: UserProfileData,
+        llm_model: str,
+        adaptation_context: Optional[str] = None,
+        require_video: bool = False
+    ) -> bool:
+        """Whether a lesson (optionally with its video) is cached, without counting an access."""
+        profile_hash = self.generate_profile_hash(user_profile)
+        cache_key = self.generate_cache_key(
+            course_id, lesson_id, difficulty_level, profile_hash, llm_model, adaptation_context
+        )
         
-        return None
+        statement = select(LessonCache).where(LessonCache.cache_key == cache_key)
+        with self._session() as session:
+            cached_entry = session.exec(statement).first()
+        return cached_entry is not None and (cached_entry.video_url is not None or not require_video)
     
     def set(
         self,
@@ -131,43 +171,44 @@ class LessonCacheService:
         )
         
         statement = select(LessonCache).where(LessonCache.cache_key == cache_key)
-        existing = self.db_session.exec(statement).first()
-        
-        lesson_json = json.dumps(lesson_content)
-        initial_json = json.dumps(initial_lesson) if initial_lesson else None
-        rev_json = json.dumps(review_result) if review_result else None
-        
-        if existing:
-            existing.lesson_json = lesson_json
-            existing.initial_lesson_json = initial_json
-            existing.review_json = rev_json
-            existing.gen_prompt = gen_prompt
-            existing.rev_prompt = rev_prompt
-            existing.rew_prompt = rew_prompt
-            if video_url:
-                existing.video_url = video_url
-            existing.accessed_at = datetime.utcnow()
-            self.db_session.add(existing)
-        else:
-            cache_entry = LessonCache(
-                cache_key=cache_key,
-                course_id=course_id,
-                lesson_id=lesson_id,
-                llm_model=llm_model,
-                difficulty_level=difficulty_level,
-                adaptation_context=adaptation_context,
-                video_url=video_url,
-                profile_hash=profile_hash,
-                lesson_json=lesson_json,
-                initial_lesson_json=initial_json,
-                review_json=rev_json,
-                gen_prompt=gen_prompt,
-                rev_prompt=rev_prompt,
-                rew_prompt=rew_prompt
-            )
-            self.db_session.add(cache_entry)
-        
-        self.db_session.commit()
+        with self._session() as session:
+            existing = session.exec(statement).first()
+            
+            lesson_json = json.dumps(lesson_content)
+            initial_json = json.dumps(initial_lesson) if initial_lesson else None
+            rev_json = json.dumps(review_result) if review_result else None
+            
+            if existing:
+                existing.lesson_json = lesson_json
+                existing.initial_lesson_json = initial_json
+                existing.review_json = rev_json
+                existing.gen_prompt = gen_prompt
+                existing.rev_prompt = rev_prompt
+                existing.rew_prompt = rew_prompt
+                if video_url:
+                    existing.video_url = video_url
+                existing.accessed_at = datetime.utcnow()
+                session.add(existing)
+            else:
+                cache_entry = LessonCache(
+                    cache_key=cache_key,
+                    course_id=course_id,
+                    lesson_id=lesson_id,
+                    llm_model=llm_model,
+                    difficulty_level=difficulty_level,
+                    adaptation_context=adaptation_context,
+                    video_url=video_url,
+                    profile_hash=profile_hash,
+                    lesson_json=lesson_json,
+                    initial_lesson_json=initial_json,
+                    review_json=rev_json,
+                    gen_prompt=gen_prompt,
+                    rev_prompt=rev_prompt,
+                    rew_prompt=rew_prompt
+                )
+                session.add(cache_entry)
+            
+            session.commit()
     
     def update_video_url(
         self,
@@ -186,13 +227,14 @@ class LessonCacheService:
         )
         
         statement = select(LessonCache).where(LessonCache.cache_key == cache_key)
-        existing = self.db_session.exec(statement).first()
-        
-        if existing:
-            existing.video_url = video_url
-            self.db_session.add(existing)
-            self.db_session.commit()
-            return True
+        with self._session() as session:
+            existing = session.exec(statement).first()
+            
+            if existing:
+                existing.video_url = video_url
+                session.add(existing)
+                session.commit()
+                return True
         return False
         
         self.db_session.commit()
@@ -230,13 +272,14 @@ class LessonCacheService:
             # Invalidate all
             statement = select(LessonCache)
         
-        entries = self.db_session.exec(statement).all()
-        count = len(entries)
-        
-        for entry in entries:
-            self.db_session.delete(entry)
-        
-        self.db_session.commit()
+        with self._session() as session:
+            entries = session.exec(statement).all()
+            count = len(entries)
+            
+            for entry in entries:
+                session.delete(entry)
+            
+            session.commit()
         
         logger.info(f"Invalidated {count} cache entries")
         return count
@@ -256,7 +299,8 @@ class LessonCacheService:
         else:
             statement = select(LessonCache)
         
-        entries = self.db_session.exec(statement).all()
+        with self._session() as session:
+            entries = session.exec(statement).all()
         
         if not entries:
             return {
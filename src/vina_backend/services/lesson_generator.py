@@ -2,19 +2,22 @@
 Lesson generation service with 3-agent pipeline (Generator → Reviewer → Rewriter).
 Includes caching, validation, and retry logic.
 """
+import asyncio
+import contextvars
 import json
 import logging
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional
-from json import JSONDecodeError
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
 from jinja2 import Template
 from pydantic import ValidationError
 
 from vina_backend.domain.schemas.profile import UserProfileData
 from vina_backend.domain.schemas.lesson import (
     LessonContent,
+    SlideContent,
+    PersonalizedSlides,
     ReviewResult,
     GeneratedLesson,
     GenerationMetadata,
@@ -26,14 +29,49 @@ from vina_backend.services.course_loader import (
     get_difficulty_knobs,
     get_pedagogical_stage
 )
+from vina_backend.core.config import get_settings
+from vina_backend.services.fallback_bank import get_fallback_lesson
+from vina_backend.services.generation_jobs import (
+    RETRY_ON_FALLBACK_JOB_TYPES,
+    enqueue_lesson_job,
+    enqueue_lesson_variants_job,
+    get_current_job_type,
+)
 from vina_backend.services.lesson_cache import LessonCacheService
+from vina_backend.services.lesson_precheck import precheck_lesson
+from vina_backend.services.lesson_layers import CORE_PROFILE, is_core_profile, personalizable_slides
+from vina_backend.services.lesson_patch import group_issues_by_slide, merge_slides, slide_number_for_location
+from vina_backend.services.lesson_singleflight import get_lesson_singleflight
+from vina_backend.services.review_sampling import get_review_sampler, prompt_version
 from vina_backend.integrations.llm.client import get_llm_client, LLMClient
+from vina_backend.integrations.llm.loop import run_sync
+from vina_backend.integrations.llm.token_budget import lesson_max_tokens, slide_max_tokens
+from vina_backend.integrations.llm.usage import collect_usage, summarize_usage
 
 logger = logging.getLogger(__name__)
 
 # Path to prompt templates
 PROMPTS_DIR = Path(__file__).parent.parent / "prompts" / "lesson"
 
+# Marker in the lesson templates separating static instructions (sent as the
+# cacheable system prompt) from the per-learner section (sent as the user message)
+PROMPT_CACHE_BREAKPOINT = "<!-- PROMPT CACHE BREAKPOINT -->"
+
+# How often generate_lesson_async checks whether the client is still connected
+DISCONNECT_POLL_SECONDS = 1.0
+
+# Variant derivation (LESSON_VARIANT_MODE=derived): these difficulties are derived
+# from the reviewed base difficulty instead of running the full pipeline
+BASE_DIFFICULTY_LEVEL = 3
+VARIANT_DIFFICULTY_LEVELS = (1, 5)
+
+# Set while the base difficulty is generated for an inline derivation, which derives
+# the variants itself; _schedule_variants must not queue the same work as a job
+_deriving_variants: contextvars.ContextVar[bool] = contextvars.ContextVar("lesson_deriving_variants", default=False)
+
+# Summary of the ReviewResult substituted when the reviewer fails (not counted as an outcome)
+REVIEW_ERROR_SUMMARY = "Review agent error - regeneration required"
+
 
 class LessonGenerator:
     """
@@ -43,7 +81,8 @@ class LessonGenerator:
     def __init__(
         self, 
         cache_service: Optional[LessonCacheService] = None,
-        llm_client: Optional[LLMClient] = None
+        llm_client: Optional[LLMClient] = None,
+        force_review: bool = False
     ):
         """
         Initialize lesson generator.
@@ -51,15 +90,25 @@ class LessonGenerator:
         Args:
             cache_service: Optional caching service (if None, caching is disabled)
             llm_client: Optional custom LLM client
+            force_review: Always run the LLM reviewer, even where review sampling would skip it (QA runs)
         """
         self.cache_service = cache_service
         self.llm_client = llm_client or get_llm_client()
+        self.force_review = force_review
         
         # Load prompt templates
         self.generator_template = self._load_template("lesson_generator_prompt.md")
         self.reviewer_template = self._load_template("lesson_reviewer_prompt.md")
         self.rewriter_template = self._load_template("lesson_rewriter_prompt.md")
         self.fallback_template = self._load_template("fallback_generator.md")
+        self.slide_rewriter_template = self._load_template("lesson_slide_rewriter_prompt.md")
+        self.personalizer_template = self._load_template("lesson_personalizer_prompt.md")
+        self.variant_template = self._load_template("lesson_variant_prompt.md")
+        
+        # Review outcome stats restart whenever the generator or reviewer prompt changes
+        self.review_prompt_version = prompt_version(
+            PROMPTS_DIR / "lesson_generator_prompt.md", PROMPTS_DIR / "lesson_reviewer_prompt.md"
+        )
     
     @staticmethod
     def _load_template(filename: str) -> Template:
@@ -68,6 +117,19 @@ class LessonGenerator:
         with open(template_path, 'r') as f:
             return Template(f.read())
     
+    @staticmethod
+    def _split_prompt(prompt: str) -> tuple[Optional[str], str]:
+        """
+        Split a rendered prompt at PROMPT_CACHE_BREAKPOINT.
+        
+        Returns:
+            (system_prompt, user_prompt); system_prompt is None if the template has no breakpoint
+        """
+        prefix, marker, suffix = prompt.partition(PROMPT_CACHE_BREAKPOINT)
+        if not marker:
+            return None, prompt
+        return prefix.strip(), suffix.strip()
+    
     def generate_lesson(
         self,
         lesson_id: str,
@@ -80,6 +142,9 @@ class LessonGenerator:
         """
         Generate a personalized lesson with caching, validation, and quality control.
         
+        Sync wrapper around generate_lesson_async(), run on the shared LLM
+        event loop (see integrations/llm/loop.py).
+        
         Workflow:
         1. Generate lesson
         2. Review lesson
@@ -96,105 +161,770 @@ class LessonGenerator:
             bypass_cache: If True, force regeneration even if cached
         
         Returns:
-            GeneratedLesson with content and metadata
+            GeneratedLesson with content and metadata (including token usage
+            summed over every LLM call made for it)
         """
-        start_time = time.time()
+        return run_sync(self.generate_lesson_async(
+            lesson_id, course_id, user_profile, difficulty_level, adaptation_context, bypass_cache
+        ))
+    
+    async def generate_lesson_async(
+        self,
+        lesson_id: str,
+        course_id: str,
+        user_profile: UserProfileData,
+        difficulty_level: int,
+        adaptation_context: Optional[str] = None,
+        bypass_cache: bool = False,
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None
+    ) -> GeneratedLesson:
+        """
+        Generate a personalized lesson (see generate_lesson() for the workflow).
         
-        # 1. Check cache (skip if bypass_cache is True)
-        model_name = self.llm_client.model if self.llm_client else "unknown"
-        if self.cache_service and not bypass_cache:
-            cached_lesson = self.cache_service.get(
-                course_id, lesson_id, difficulty_level, user_profile, model_name, adaptation_context
+        Runs on the async LLM path, so the event loop is never blocked by a
+        pipeline stage. The cache lookup and the four course config loads run
+        concurrently. Cancelling the calling task (or a client disconnect)
+        stops the pipeline between or during LLM calls, so an abandoned
+        request does not keep spending tokens.
+        
+        Args:
+            lesson_id: Lesson identifier (e.g., "l01_what_llms_are")
+            course_id: Course identifier (e.g., "c_llm_foundations")
+            user_profile: User profile data
+            difficulty_level: Difficulty level (1, 3, or 5)
+            adaptation_context: Optional adaptation type
+            bypass_cache: If True, force regeneration even if cached
+            is_disconnected: Optional coroutine function reporting whether the
+                client has gone away (e.g. FastAPI's request.is_disconnected)
+        
+        Returns:
+            GeneratedLesson with content and metadata
+        
+        Raises:
+            asyncio.CancelledError: If the task is cancelled or the client disconnects
+        """
+        with collect_usage() as usage_records:
+            pipeline = asyncio.ensure_future(self._generate_lesson(
+                lesson_id, course_id, user_profile, difficulty_level, adaptation_context, bypass_cache
+            ))
+            watcher = (
+                asyncio.ensure_future(self._cancel_on_disconnect(pipeline, is_disconnected))
+                if is_disconnected else None
             )
-            if cached_lesson:
-                logger.info(f"Returning CACHED lesson for {lesson_id} (Model: {model_name})")
-                return GeneratedLesson(
-                    lesson_id=lesson_id,
-                    course_id=course_id,
-                    difficulty_level=difficulty_level,
-                    lesson_content=LessonContent(**cached_lesson["lesson_content"]),
-                    generation_metadata=GenerationMetadata(cache_hit=True, llm_model=model_name),
-                    audit_trail=AuditTrail(**cached_lesson["audit_trail"])
+            try:
+                lesson = await pipeline
+            except asyncio.CancelledError:
+                logger.warning(
+                    f"Lesson generation for {lesson_id} cancelled after "
+                    f"{len(usage_records)} LLM call(s)"
                 )
+                raise
+            finally:
+                if watcher:
+                    watcher.cancel()
         
-        # 2. Load context
-        logger.info(f"Generating lesson {lesson_id} for {user_profile.profession} at difficulty {difficulty_level}")
+        if usage_records:
+            lesson.generation_metadata.token_usage = summarize_usage(usage_records)
+            logger.info(
+                f"Lesson {lesson_id} used {lesson.generation_metadata.token_usage['prompt_tokens']} prompt + "
+                f"{lesson.generation_metadata.token_usage['completion_tokens']} completion tokens "
+                f"(${lesson.generation_metadata.token_usage['cost_usd']:.4f})"
+            )
+        return lesson
+    
+    @staticmethod
+    async def _cancel_on_disconnect(
+        pipeline: "asyncio.Future",
+        is_disconnected: Callable[[], Awaitable[bool]]
+    ) -> None:
+        """Cancel the pipeline once the client disconnects."""
+        while not pipeline.done():
+            if await is_disconnected():
+                logger.info("Client disconnected, cancelling lesson generation")
+                pipeline.cancel()
+                return
+            await asyncio.sleep(DISCONNECT_POLL_SECONDS)
+    
+    async def astream_lesson_slides(
+        self,
+        lesson_id: str,
+        course_id: str,
+        user_profile: UserProfileData,
+        difficulty_level: int,
+        adaptation_context: Optional[str] = None,
+        on_complete: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> AsyncIterator[SlideContent]:
+        """
+        Stream the generator's slides as soon as each one is complete.
         
+        Lets the video pipeline start TTS and image prompts for slide 1 while
+        the model is still writing later slides. Slides come from the generator
+        draft (before review/rewrite); pass on_complete to receive the full
+        lesson JSON, e.g. to run the reviewer on it afterwards.
+        
+        Args:
+            lesson_id: Lesson identifier
+            course_id: Course identifier
+            user_profile: User profile data
+            difficulty_level: Difficulty level (1, 3, or 5)
+            adaptation_context: Optional adaptation type
+            on_complete: Called with the full lesson JSON when the stream ends
+        
+        Yields:
+            SlideContent objects in order
+        """
         course_config = load_course_config(course_id)
         lesson_spec = get_lesson_config(course_id, lesson_id)
         difficulty_knobs = get_difficulty_knobs(difficulty_level)
         pedagogical_stage = get_pedagogical_stage(course_id, lesson_id)
         
+        generator_prompt = self._format_generator_prompt(
+            lesson_spec, user_profile, difficulty_level, difficulty_knobs,
+            pedagogical_stage, course_config, adaptation_context
+        )
+        system_prompt, user_prompt = self._split_prompt(generator_prompt)
+        
+        async for slide in self.llm_client.astream_json_items(
+            user_prompt,
+            "slides",
+            item_model=SlideContent,
+            system=system_prompt,
+            temperature=0.7,
+            max_tokens=lesson_max_tokens(difficulty_knobs),
+            response_model=LessonContent,
+            caller="lesson_generator",
+            on_complete=on_complete,
+        ):
+            logger.info(f"Streamed slide {slide.slide_number} for {lesson_id}: {slide.title}")
+            yield slide
+    
+    async def _generate_lesson(
+        self,
+        lesson_id: str,
+        course_id: str,
+        user_profile: UserProfileData,
+        difficulty_level: int,
+        adaptation_context: Optional[str] = None,
+        bypass_cache: bool = False
+    ) -> GeneratedLesson:
+        """Run the generate → review → rewrite pipeline (see generate_lesson)."""
+        start_time = time.time()
+        model_name = self.llm_client.model if self.llm_client else "unknown"
+        
+        # 1-2. Cache lookup and context loading run concurrently (both are disk/DB bound)
+        cache_lookup = asyncio.sleep(0) if bypass_cache else asyncio.to_thread(
+            self._get_cached_lesson,
+            lesson_id, course_id, user_profile, difficulty_level, adaptation_context, model_name
+        )
+        cached, course_config, lesson_spec, difficulty_knobs, pedagogical_stage = await asyncio.gather(
+            cache_lookup,
+            asyncio.to_thread(load_course_config, course_id),
+            asyncio.to_thread(get_lesson_config, course_id, lesson_id),
+            asyncio.to_thread(get_difficulty_knobs, difficulty_level),
+            asyncio.to_thread(get_pedagogical_stage, course_id, lesson_id),
+        )
+        if cached:
+            return cached
+        
+        context = (course_config, lesson_spec, difficulty_knobs, pedagogical_stage)
+        if bypass_cache or not get_settings().lesson_singleflight_enabled:
+            return await self._run_pipeline(
+                lesson_id, course_id, user_profile, difficulty_level, adaptation_context, model_name, start_time, context
+            )
+        
+        # Concurrent misses for the same cache key share one pipeline run
+        lesson, shared = await get_lesson_singleflight().arun(
+            self._cache_key(lesson_id, course_id, user_profile, difficulty_level, adaptation_context, model_name),
+            lambda: self._run_pipeline(
+                lesson_id, course_id, user_profile, difficulty_level, adaptation_context, model_name, start_time, context
+            ),
+            recheck=lambda: self._get_cached_lesson(
+                lesson_id, course_id, user_profile, difficulty_level, adaptation_context, model_name
+            ),
+            use_lease=self.cache_service is not None
+        )
+        return self._shared_copy(lesson) if shared else lesson
+    
+    async def _run_pipeline(
+        self,
+        lesson_id: str,
+        course_id: str,
+        user_profile: UserProfileData,
+        difficulty_level: int,
+        adaptation_context: Optional[str],
+        model_name: str,
+        start_time: float,
+        context: tuple[Dict, Dict, Dict, Optional[Dict]]
+    ) -> GeneratedLesson:
+        """
+        Steps 3-8 of _generate_lesson (after a cache miss).
+        
+        Args:
+            context: (course_config, lesson_spec, difficulty_knobs, pedagogical_stage)
+        """
+        course_config, lesson_spec, difficulty_knobs, pedagogical_stage = context
+        if self._use_layered_generation(user_profile):
+            return await self._run_layered_pipeline(
+                lesson_id, course_id, user_profile, difficulty_level, adaptation_context, model_name, start_time,
+                difficulty_knobs
+            )
+        
+        if self._use_derived_variants(difficulty_level, adaptation_context):
+            derived = await self._derive_variant(lesson_id, course_id, user_profile, difficulty_level, model_name, start_time)
+            if derived:
+                return derived
+        
+        logger.info(f"Generating lesson {lesson_id} for {user_profile.profession} at difficulty {difficulty_level}")
+        
         # 3. Generate initial lesson
         gen_start = time.time()
-        lesson_json, generation_success, generator_prompt = self._generate_with_retry(
-            lesson_spec, user_profile, difficulty_level, difficulty_knobs, 
+        lesson_json, generation_success, generator_prompt = await self._generate_with_retry(
+            lesson_spec, user_profile, difficulty_level, difficulty_knobs,
             pedagogical_stage, course_config, adaptation_context
         )
         gen_duration = time.time() - gen_start
+        # Review sampling is measured per model that wrote the lesson (router or fallback included)
+        generator_model = self.llm_client.last_model_used
         
         if not generation_success:
             logger.error(f"Failed to generate valid lesson for {lesson_id}")
-            return self._fallback_lesson(
+            return await self._fallback_lesson(
                 lesson_id, course_id, difficulty_level,
-                lesson_spec, user_profile, difficulty_knobs, course_config
+                lesson_spec, user_profile, difficulty_knobs, course_config, adaptation_context
             )
         
-        # 4. Review lesson
+        # 4. Review lesson (skipped for combinations the reviewer almost always approves)
         rev_start = time.time()
-        review_result, reviewer_prompt = self._review_lesson(
-            lesson_json, lesson_spec, user_profile, difficulty_level, difficulty_knobs, course_config
+        reviewer_prompt = None
+        review_result = await asyncio.to_thread(
+            self._skipped_review, lesson_json, lesson_id, lesson_spec, difficulty_level, difficulty_knobs,
+            generator_model
         )
+        if review_result is None:
+            review_result, reviewer_prompt = await self._review_lesson(
+                lesson_json, lesson_spec, user_profile, difficulty_level, difficulty_knobs, course_config
+            )
+            await asyncio.to_thread(
+                self._record_review_outcome, lesson_id, difficulty_level, review_result, generator_model
+            )
         rev_duration = time.time() - rev_start
         
         initial_lesson = lesson_json.copy()  # Snapshot for QA
-        review_snapshot = review_result.model_dump() # Snapshot for QA
-        
         rewriter_prompt = None
-        
-        logger.info(f"Review decision: {review_result.decision} - {review_result.summary}")
-        
         rewrite_count = 0
         rewrite_duration = 0.0
         
+        logger.info(f"Review decision: {review_result.decision} - {review_result.summary}")
+        
         # 5. Handle review decision
         if review_result.decision == "approved":
-            # Lesson is good to go
             logger.info("Lesson approved on first attempt")
-            
         elif review_result.decision == "fix_in_place":
-            # Apply targeted fixes
             logger.info(f"Applying targeted fixes ({len(review_result.fixable_issues)} issues)")
-            
             rew_start = time.time()
-            lesson_json, rewriter_prompt = self._rewrite_lesson(
-                lesson_json, review_result, lesson_spec, user_profile, 
+            lesson_json, rewriter_prompt = await self._rewrite_lesson(
+                lesson_json, review_result, lesson_spec, user_profile,
                 difficulty_knobs, course_config
             )
             rewrite_duration = time.time() - rew_start
             rewrite_count = 1
-            
         elif review_result.decision == "regenerate_from_scratch":
-            # Use fallback generator for fast, safe lesson
             logger.warning(f"Lesson needs regeneration ({len(review_result.blocking_issues)} blocking issues). Using fallback generator.")
-            return self._fallback_lesson(
+            return await self._fallback_lesson(
                 lesson_id, course_id, difficulty_level,
-                lesson_spec, user_profile, difficulty_knobs, course_config
+                lesson_spec, user_profile, difficulty_knobs, course_config, adaptation_context
             )
         
+        # 6-8. Validate, cache and return with metadata
+        return await self._finalize_lesson(
+            lesson_id, course_id, user_profile, difficulty_level, adaptation_context, model_name,
+            lesson_json, initial_lesson, review_result,
+            prompts=(generator_prompt, reviewer_prompt, rewriter_prompt),
+            phase_durations={
+                "generation": round(gen_duration, 2),
+                "review": round(rev_duration, 2),
+                "rewrite": round(rewrite_duration, 2)
+            },
+            rewrite_count=rewrite_count,
+            start_time=start_time,
+            context=(lesson_spec, difficulty_knobs, course_config)
+        )
+    
+    @staticmethod
+    def _use_layered_generation(user_profile: UserProfileData) -> bool:
+        """Whether to personalize the shared core lesson instead of running the full pipeline."""
+        return get_settings().lesson_generation_mode == "layered" and not is_core_profile(user_profile)
+    
+    async def _run_layered_pipeline(
+        self,
+        lesson_id: str,
+        course_id: str,
+        user_profile: UserProfileData,
+        difficulty_level: int,
+        adaptation_context: Optional[str],
+        model_name: str,
+        start_time: float,
+        difficulty_knobs: Dict
+    ) -> GeneratedLesson:
+        """
+        Layered generation (see services/lesson_layers.py): personalize the core lesson.
+        
+        The core lesson for CORE_PROFILE runs the full pipeline once per lesson,
+        difficulty and adaptation (cached and coalesced like any lesson); this
+        learner only pays for one personalization call over its hook and example slides.
+        """
+        logger.info(f"Layered generation of {lesson_id} for {user_profile.profession} at difficulty {difficulty_level}")
+        
+        core_start = time.time()
+        core = await self._generate_lesson(lesson_id, course_id, CORE_PROFILE, difficulty_level, adaptation_context)
+        core_duration = time.time() - core_start
+        if core.generation_metadata.fallback:
+            logger.warning(f"Core lesson for {lesson_id} is a fallback, serving it without personalization")
+            return core
+        
+        pers_start = time.time()
+        core_json = core.lesson_content.model_dump()
+        lesson_json, personalizer_prompt = await self._personalize_lesson(core_json, user_profile, difficulty_knobs)
+        
+        return await asyncio.to_thread(
+            self._finalize_personalized_lesson,
+            lesson_id, course_id, user_profile, difficulty_level, adaptation_context, model_name,
+            core, core_json, lesson_json, personalizer_prompt,
+            {
+                "core": round(core_duration, 2),
+                "personalization": round(time.time() - pers_start, 2)
+            },
+            start_time
+        )
+    
+    async def _personalize_lesson(
+        self,
+        core_json: Dict,
+        user_profile: UserProfileData,
+        difficulty_knobs: Dict
+    ) -> tuple[Optional[Dict], Optional[str]]:
+        """
+        Rewrite the hook and example slides of a core lesson for the learner.
+        
+        Returns:
+            (personalized lesson JSON or None on failure, personalizer prompt)
+        """
+        slides = personalizable_slides(core_json)
+        if not slides:
+            return core_json, None
+        
+        personalizer_prompt = self._format_personalizer_prompt(core_json, slides, user_profile)
+        system_prompt, user_prompt = self._split_prompt(personalizer_prompt)
+        
+        try:
+            result = await self.llm_client.agenerate_json(
+                user_prompt,
+                system=system_prompt,
+                temperature=0.7,
+                max_tokens=min(lesson_max_tokens(difficulty_knobs), slide_max_tokens(difficulty_knobs) * len(slides)),
+                response_model=PersonalizedSlides,
+                caller="lesson_personalizer"
+            )
+            return self._merge_personalized_slides(core_json, slides, result), personalizer_prompt
+            
+        except (ValueError, ValidationError) as e:
+            logger.error(f"Personalization failed: {e}. Serving the core lesson")
+            return None, personalizer_prompt
+    
+    @staticmethod
+    def _merge_personalized_slides(core_json: Dict, slides: list, result: Dict) -> Dict:
+        """Merge personalized slides into the core lesson (raises ValidationError if the result is invalid)."""
+        expected = {slide["slide_number"] for slide in slides}
+        personalized = {
+            slide.slide_number: slide.model_dump()
+            for slide in PersonalizedSlides(**result).slides
+            if slide.slide_number in expected
+        }
+        merged = merge_slides(core_json, personalized)
+        LessonContent(**merged)
+        return merged
+    
+    def _finalize_personalized_lesson(
+        self,
+        lesson_id: str,
+        course_id: str,
+        user_profile: UserProfileData,
+        difficulty_level: int,
+        adaptation_context: Optional[str],
+        model_name: str,
+        core: GeneratedLesson,
+        core_json: Dict,
+        lesson_json: Optional[Dict],
+        personalizer_prompt: Optional[str],
+        phase_durations: Dict[str, float],
+        start_time: float
+    ) -> GeneratedLesson:
+        """
+        Cache the personalized lesson under the learner's key and attach metadata.
+        
+        If personalization failed (lesson_json is None) the core lesson is served
+        and nothing is cached for the learner, so the next request tries again.
+        """
+        if lesson_json is None:
+            lesson_json = core_json
+        elif self.cache_service:
+            self.cache_service.set(
+                course_id=course_id,
+                lesson_id=lesson_id,
+                difficulty_level=difficulty_level,
+                user_profile=user_profile,
+                llm_model=model_name,
+                lesson_content=lesson_json,
+                adaptation_context=adaptation_context,
+                initial_lesson=core_json,
+                gen_prompt=personalizer_prompt
+            )
+            self._schedule_variants(lesson_id, course_id, user_profile, difficulty_level, adaptation_context)
+        
+        return GeneratedLesson(
+            lesson_id=lesson_id,
+            course_id=course_id,
+            difficulty_level=difficulty_level,
+            lesson_content=LessonContent(**lesson_json),
+            generation_metadata=GenerationMetadata(
+                cache_hit=False,
+                llm_model=self.llm_client.last_model_used if personalizer_prompt else core.generation_metadata.llm_model,
+                generation_time_seconds=round(time.time() - start_time, 2),
+                phase_durations=phase_durations,
+                review_passed_first_time=core.generation_metadata.review_passed_first_time,
+                review_skipped=core.generation_metadata.review_skipped,
+                rewrite_count=core.generation_metadata.rewrite_count,
+                quality_score=None,
+                core_cache_hit=core.generation_metadata.cache_hit
+            ),
+            audit_trail=AuditTrail(
+                gen_prompt=personalizer_prompt,
+                gen_output=core_json,
+                rew_output=lesson_json
+            )
+        )
+    
+    @staticmethod
+    def _use_derived_variants(difficulty_level: int, adaptation_context: Optional[str]) -> bool:
+        """Whether this difficulty is derived from the base difficulty instead of generated."""
+        return (
+            get_settings().lesson_variant_mode == "derived"
+            and adaptation_context is None
+            and difficulty_level in VARIANT_DIFFICULTY_LEVELS
+        )
+    
+    async def derive_difficulty_variants_async(
+        self,
+        lesson_id: str,
+        course_id: str,
+        user_profile: UserProfileData
+    ) -> list[int]:
+        """
+        Derive and cache the difficulty variants of a lesson that are not cached yet.
+        
+        The base difficulty lesson is generated first if needed (usually a cache hit).
+        
+        Returns:
+            Difficulty levels that were derived and cached
+        """
+        model_name = self.llm_client.model if self.llm_client else "unknown"
+        token = _deriving_variants.set(True)
+        try:
+            base = await self._generate_lesson(lesson_id, course_id, user_profile, BASE_DIFFICULTY_LEVEL)
+        finally:
+            _deriving_variants.reset(token)
+        if base.generation_metadata.fallback:
+            return []
+        
+        targets = await asyncio.to_thread(self._missing_variants, lesson_id, course_id, user_profile, model_name)
+        variants = await self._derive_variants(base.lesson_content.model_dump(), user_profile, targets)
+        return await asyncio.to_thread(
+            self._store_variants, lesson_id, course_id, user_profile, model_name, base, variants
+        )
+    
+    async def _derive_variant(
+        self,
+        lesson_id: str,
+        course_id: str,
+        user_profile: UserProfileData,
+        difficulty_level: int,
+        model_name: str,
+        start_time: float
+    ) -> Optional[GeneratedLesson]:
+        """
+        Derive a requested difficulty (and any uncached sibling) from the base difficulty.
+        
+        Returns:
+            The derived lesson, or None if it could not be derived (run the full pipeline)
+        """
+        logger.info(f"Deriving {lesson_id} D{difficulty_level} from D{BASE_DIFFICULTY_LEVEL}")
+        token = _deriving_variants.set(True)
+        try:
+            base = await self._generate_lesson(lesson_id, course_id, user_profile, BASE_DIFFICULTY_LEVEL)
+        finally:
+            _deriving_variants.reset(token)
+        if base.generation_metadata.fallback:
+            logger.warning(f"Base lesson for {lesson_id} is a fallback, generating D{difficulty_level} in full")
+            return None
+        
+        targets = await asyncio.to_thread(
+            self._missing_variants, lesson_id, course_id, user_profile, model_name, difficulty_level
+        )
+        variants = await self._derive_variants(base.lesson_content.model_dump(), user_profile, targets)
+        await asyncio.to_thread(self._store_variants, lesson_id, course_id, user_profile, model_name, base, variants)
+        return self._variant_lesson(lesson_id, course_id, difficulty_level, base, variants, start_time)
+    
+    def _missing_variants(
+        self,
+        lesson_id: str,
+        course_id: str,
+        user_profile: UserProfileData,
+        model_name: str,
+        required: Optional[int] = None
+    ) -> list[int]:
+        """Variant difficulties to derive: the required one plus any sibling not cached yet."""
+        return [
+            level for level in VARIANT_DIFFICULTY_LEVELS
+            if level == required or not (
+                self.cache_service and self.cache_service.is_cached(course_id, lesson_id, level, user_profile, model_name)
+            )
+        ]
+    
+    async def _derive_variants(
+        self,
+        base_json: Dict,
+        user_profile: UserProfileData,
+        targets: list[int]
+    ) -> Dict[int, tuple[Optional[Dict], str]]:
+        """Transform the base lesson to each target difficulty (one LLM call per target, in parallel)."""
+        results = await asyncio.gather(*(
+            self._transform_difficulty(base_json, user_profile, level) for level in targets
+        ))
+        return dict(zip(targets, results))
+    
+    async def _transform_difficulty(
+        self,
+        base_json: Dict,
+        user_profile: UserProfileData,
+        difficulty_level: int
+    ) -> tuple[Optional[Dict], str]:
+        """Re-level the base lesson to one difficulty. Returns (lesson JSON or None on failure, prompt)."""
+        difficulty_knobs = get_difficulty_knobs(difficulty_level)
+        variant_prompt = self._format_variant_prompt(base_json, user_profile, difficulty_level, difficulty_knobs)
+        system_prompt, user_prompt = self._split_prompt(variant_prompt)
+        
+        try:
+            lesson_json = await self.llm_client.agenerate_json(
+                user_prompt,
+                system=system_prompt,
+                temperature=0.7,
+                max_tokens=lesson_max_tokens(difficulty_knobs),
+                response_model=LessonContent,
+                caller="lesson_variant"
+            )
+            return self._validate_variant(lesson_json, difficulty_level, difficulty_knobs), variant_prompt
+            
+        except (ValueError, ValidationError) as e:
+            logger.error(f"Deriving D{difficulty_level} failed: {e}")
+            return None, variant_prompt
+    
+    @staticmethod
+    def _validate_variant(lesson_json: Dict, difficulty_level: int, difficulty_knobs: Dict) -> Dict:
+        """Validate a derived lesson (raises ValidationError); precheck findings are only logged."""
+        lesson_json["difficulty_level"] = difficulty_level
+        LessonContent(**lesson_json)
+        
+        problems = precheck_lesson(lesson_json, difficulty_knobs)
+        if problems:
+            logger.warning(f"Derived D{difficulty_level} lesson has {len(problems)} precheck findings: {problems[:3]}")
+        return lesson_json
+    
+    def _store_variants(
+        self,
+        lesson_id: str,
+        course_id: str,
+        user_profile: UserProfileData,
+        model_name: str,
+        base: GeneratedLesson,
+        variants: Dict[int, tuple[Optional[Dict], str]]
+    ) -> list[int]:
+        """Cache the derived variants next to the base lesson. Returns the cached difficulty levels."""
+        stored = [level for level, (lesson_json, _) in variants.items() if lesson_json is not None]
+        if not self.cache_service:
+            return stored
+        
+        base_json = base.lesson_content.model_dump()
+        for level in stored:
+            lesson_json, variant_prompt = variants[level]
+            self.cache_service.set(
+                course_id=course_id,
+                lesson_id=lesson_id,
+                difficulty_level=level,
+                user_profile=user_profile,
+                llm_model=model_name,
+                lesson_content=lesson_json,
+                initial_lesson=base_json,
+                gen_prompt=variant_prompt
+            )
+        logger.info(f"Cached D{stored} variants of {lesson_id} derived from D{BASE_DIFFICULTY_LEVEL}")
+        return stored
+    
+    def _variant_lesson(
+        self,
+        lesson_id: str,
+        course_id: str,
+        difficulty_level: int,
+        base: GeneratedLesson,
+        variants: Dict[int, tuple[Optional[Dict], str]],
+        start_time: float
+    ) -> Optional[GeneratedLesson]:
+        """GeneratedLesson for the requested derived variant, or None if deriving it failed."""
+        lesson_json, variant_prompt = variants.get(difficulty_level, (None, None))
+        if lesson_json is None:
+            return None
+        
+        return GeneratedLesson(
+            lesson_id=lesson_id,
+            course_id=course_id,
+            difficulty_level=difficulty_level,
+            lesson_content=LessonContent(**lesson_json),
+            generation_metadata=GenerationMetadata(
+                cache_hit=False,
+                llm_model=self.llm_client.last_model_used,
+                generation_time_seconds=round(time.time() - start_time, 2),
+                review_passed_first_time=base.generation_metadata.review_passed_first_time,
+                rewrite_count=0,
+                quality_score=None,
+                derived_from_difficulty=BASE_DIFFICULTY_LEVEL
+            ),
+            audit_trail=AuditTrail(
+                gen_prompt=variant_prompt,
+                gen_output=lesson_json
+            )
+        )
+    
+    def _schedule_variants(
+        self,
+        lesson_id: str,
+        course_id: str,
+        user_profile: UserProfileData,
+        difficulty_level: int,
+        adaptation_context: Optional[str]
+    ):
+        """Queue background derivation of the difficulty variants after a base lesson was cached."""
+        settings = get_settings()
+        if (
+            settings.lesson_variant_mode != "derived"
+            or not settings.job_workers_enabled  # Variants are then derived on first request
+            or difficulty_level != BASE_DIFFICULTY_LEVEL
+            or adaptation_context is not None
+            or self.cache_service is None
+            or _deriving_variants.get()  # The caller derives them inline
+        ):
+            return
+        try:
+            job = enqueue_lesson_variants_job(course_id, lesson_id, user_profile)
+            logger.info(f"Queued D{list(VARIANT_DIFFICULTY_LEVELS)} variants of {lesson_id} as job {job.id}")
+        except Exception as e:
+            logger.warning(f"Failed to queue variants of {lesson_id}: {e}")
+    
+    @staticmethod
+    def _cache_key(
+        lesson_id: str,
+        course_id: str,
+        user_profile: UserProfileData,
+        difficulty_level: int,
+        adaptation_context: Optional[str],
+        model_name: str
+    ) -> str:
+        """Lesson cache key, also used to coalesce concurrent generations."""
+        return LessonCacheService.generate_cache_key(
+            course_id, lesson_id, difficulty_level,
+            LessonCacheService.generate_profile_hash(user_profile), model_name, adaptation_context
+        )
+    
+    @staticmethod
+    def _shared_copy(lesson: GeneratedLesson) -> GeneratedLesson:
+        """Copy of a lesson generated by another request (its token usage is not ours)."""
+        shared = lesson.model_copy(deep=True)
+        shared.generation_metadata.cache_hit = True
+        shared.generation_metadata.token_usage = {}
+        return shared
+    
+    def _get_cached_lesson(
+        self,
+        lesson_id: str,
+        course_id: str,
+        user_profile: UserProfileData,
+        difficulty_level: int,
+        adaptation_context: Optional[str],
+        model_name: str
+    ) -> Optional[GeneratedLesson]:
+        """Cached lesson for this learner and difficulty, or None on a miss (or without a cache)."""
+        if not self.cache_service:
+            return None
+        cached_lesson = self.cache_service.get(
+            course_id, lesson_id, difficulty_level, user_profile, model_name, adaptation_context
+        )
+        if not cached_lesson:
+            return None
+        
+        logger.info(f"Returning CACHED lesson for {lesson_id} (Model: {model_name})")
+        return GeneratedLesson(
+            lesson_id=lesson_id,
+            course_id=course_id,
+            difficulty_level=difficulty_level,
+            lesson_content=LessonContent(**cached_lesson["lesson_content"]),
+            generation_metadata=GenerationMetadata(cache_hit=True, llm_model=model_name),
+            audit_trail=AuditTrail(**cached_lesson["audit_trail"])
+        )
+    
+    async def _finalize_lesson(
+        self,
+        lesson_id: str,
+        course_id: str,
+        user_profile: UserProfileData,
+        difficulty_level: int,
+        adaptation_context: Optional[str],
+        model_name: str,
+        lesson_json: Dict,
+        initial_lesson: Dict,
+        review_result: ReviewResult,
+        prompts: tuple[str, str, Optional[str]],
+        phase_durations: Dict[str, float],
+        rewrite_count: int,
+        start_time: float,
+        context: tuple[Dict, Dict, Dict]
+    ) -> GeneratedLesson:
+        """
+        Validate the reviewed lesson, cache it and attach metadata and the audit trail.
+        
+        Args:
+            prompts: (generator_prompt, reviewer_prompt, rewriter_prompt)
+            context: (lesson_spec, difficulty_knobs, course_config), used for the
+                fallback lesson if validation fails
+        
+        Returns:
+            GeneratedLesson, or the fallback lesson if the final JSON is invalid
+        """
+        generator_prompt, reviewer_prompt, rewriter_prompt = prompts
+        lesson_spec, difficulty_knobs, course_config = context
+        review_snapshot = review_result.model_dump()  # Snapshot for QA
+        
         # 6. Validate final lesson
         try:
             lesson_content = LessonContent(**lesson_json)
         except ValidationError as e:
             logger.error(f"Final lesson validation failed: {e}")
-            return self._fallback_lesson(
+            return await self._fallback_lesson(
                 lesson_id, course_id, difficulty_level,
-                lesson_spec, user_profile, difficulty_knobs, course_config
+                lesson_spec, user_profile, difficulty_knobs, course_config, adaptation_context
             )
         
-        # 7. Cache if approved or fixed (including QA snapshots)
+        # 7. Cache if approved or fixed (including QA snapshots; both are DB calls)
         if self.cache_service and review_result.decision in ["approved", "fix_in_place"]:
-            self.cache_service.set(
+            await asyncio.to_thread(
+                self.cache_service.set,
                 course_id=course_id,
                 lesson_id=lesson_id,
                 difficulty_level=difficulty_level,
@@ -208,6 +938,9 @@ class LessonGenerator:
                 rev_prompt=reviewer_prompt,
                 rew_prompt=rewriter_prompt
             )
+            await asyncio.to_thread(
+                self._schedule_variants, lesson_id, course_id, user_profile, difficulty_level, adaptation_context
+            )
         
         # 8. Return with metadata
         total_time = time.time() - start_time
@@ -219,14 +952,11 @@ class LessonGenerator:
             lesson_content=lesson_content,
             generation_metadata=GenerationMetadata(
                 cache_hit=False,
-                llm_model=self.llm_client.model if self.llm_client else "unknown",
+                llm_model=self.llm_client.last_model_used if self.llm_client else "unknown",
                 generation_time_seconds=round(total_time, 2),
-                phase_durations={
-                    "generation": round(gen_duration, 2),
-                    "review": round(rev_duration, 2),
-                    "rewrite": round(rewrite_duration, 2)
-                },
+                phase_durations=phase_durations,
                 review_passed_first_time=(rewrite_count == 0),
+                review_skipped=(reviewer_prompt is None),  # No reviewer prompt: sampling skipped the review
                 rewrite_count=rewrite_count,
                 quality_score=None
             ),
@@ -240,7 +970,98 @@ class LessonGenerator:
             )
         )
     
-    def _generate_with_retry(
+    def _skipped_review(
+        self,
+        lesson_json: Dict,
+        lesson_id: str,
+        lesson_spec: Dict,
+        difficulty_level: int,
+        difficulty_knobs: Dict,
+        generator_model: str
+    ) -> Optional[ReviewResult]:
+        """
+        Approved review result if review sampling lets this lesson skip the LLM reviewer.
+        
+        Args:
+            generator_model: Model that generated the lesson (stats are kept per model)
+        
+        Returns:
+            ReviewResult standing in for the review, or None if the lesson must be reviewed
+        """
+        settings = get_settings()
+        if self.force_review or settings.review_force or not settings.review_sampling_enabled:
+            return None
+        
+        try:
+            sampler = get_review_sampler()
+            review_needed, reason = sampler.should_review(
+                generator_model, self.review_prompt_version, lesson_id, difficulty_level,
+                precheck_lesson(lesson_json, difficulty_knobs)
+            )
+            if review_needed:
+                logger.info(f"Reviewing {lesson_id} (D{difficulty_level}): {reason}")
+                return None
+            sampler.record(generator_model, self.review_prompt_version, lesson_id, difficulty_level, "skipped")
+        except Exception as e:
+            logger.warning(f"Review sampling failed: {e}. Running full review")
+            return None
+        
+        logger.info(f"Skipping review of {lesson_id} (D{difficulty_level}): {reason}")
+        return ReviewResult(
+            decision="approved",
+            rewrite_strategy="none",
+            duration_analysis={
+                "total_estimated_seconds": 0,
+                "target_seconds": lesson_spec.get("estimated_duration_minutes", 3) * 60,
+                "status": "on_target",
+                "slides_over_target": []
+            },
+            summary=f"Review skipped by sampling ({reason})"
+        )
+    
+    def _record_review_outcome(
+        self,
+        lesson_id: str,
+        difficulty_level: int,
+        review_result: ReviewResult,
+        generator_model: str
+    ):
+        """Count a reviewer decision towards review sampling (reviewer failures are not counted)."""
+        if not get_settings().review_sampling_enabled or review_result.summary == REVIEW_ERROR_SUMMARY:
+            return
+        try:
+            get_review_sampler().record(
+                generator_model, self.review_prompt_version, lesson_id, difficulty_level, review_result.decision
+            )
+        except Exception as e:
+            logger.warning(f"Failed to record review outcome: {e}")
+    
+    @staticmethod
+    def _review_error_result(lesson_spec: Dict) -> ReviewResult:
+        """Review result used when the reviewer fails; it triggers regeneration."""
+        return ReviewResult(
+            decision="regenerate_from_scratch",
+            rewrite_strategy="complete_regeneration",
+            blocking_issues=[
+                {
+                    "type": "json_error",
+                    "severity": "critical",
+                    "description": "Review agent failed to produce valid output",
+                    "action_required": "Regenerate the lesson"
+                }
+            ],
+            fixable_issues=[],
+            preserve_elements=[],
+            duration_analysis={
+                "total_estimated_seconds": 0,
+                "target_seconds": lesson_spec.get("estimated_duration_minutes", 3) * 60,
+                "status": "on_target",
+                "slides_over_target": []
+            },
+            summary=REVIEW_ERROR_SUMMARY
+        )
+    
+    async def _generate_with_retry(
         self,
         lesson_spec: Dict,
         user_profile: UserProfileData,
@@ -254,6 +1075,9 @@ class LessonGenerator:
         """
         Generate lesson with retry logic for JSON parsing failures.
         
+        generate_json already repairs malformed JSON locally, so a retry here
+        only costs another LLM call when the output could not be repaired.
+        
         Returns:
             (lesson_json, success, prompt_used)
         """
@@ -261,31 +1085,31 @@ class LessonGenerator:
             lesson_spec, user_profile, difficulty_level, difficulty_knobs,
             pedagogical_stage, course_config, adaptation_context
         )
+        system_prompt, user_prompt = self._split_prompt(generator_prompt)
         
         for attempt in range(max_retries):
             try:
                 logger.info(f"Generation attempt {attempt + 1}/{max_retries}")
-                lesson_json = self.llm_client.generate_json(
-                    generator_prompt,
-                    temperature=0.7  # Creative generation (auto-corrected to 1.0 for Gemini 3)
+                lesson_json = await self.llm_client.agenerate_json(
+                    user_prompt,
+                    system=system_prompt,
+                    temperature=0.7,
+                    max_tokens=lesson_max_tokens(difficulty_knobs),
+                    response_model=LessonContent,
+                    caller="lesson_generator"
                 )
-                
-                # Validate JSON structure
                 LessonContent(**lesson_json)
                 
                 logger.info("Lesson generated and validated successfully")
                 return lesson_json, True, generator_prompt
                 
-            except (JSONDecodeError, ValidationError) as e:
+            except (ValueError, ValidationError) as e:
                 logger.warning(f"Generation attempt {attempt + 1} failed: {e}")
-                if attempt == max_retries - 1:
-                    logger.error(f"All {max_retries} generation attempts failed")
-                    return {}, False, generator_prompt
-                continue
         
+        logger.error(f"All {max_retries} generation attempts failed")
         return {}, False, generator_prompt
     
-    def _review_lesson(
+    async def _review_lesson(
         self,
         lesson_json: Dict,
         lesson_spec: Dict,
@@ -298,11 +1122,15 @@ class LessonGenerator:
         reviewer_prompt = self._format_reviewer_prompt(
             lesson_json, lesson_spec, user_profile, difficulty_level, difficulty_knobs, course_config
         )
+        system_prompt, user_prompt = self._split_prompt(reviewer_prompt)
         
         try:
-            review_json = self.llm_client.generate_json(
-                reviewer_prompt,
-                temperature=0.3  # Consistent reviews (auto-corrected to 1.0 for Gemini 3)
+            review_json = await self.llm_client.agenerate_json(
+                user_prompt,
+                system=system_prompt,
+                temperature=0.3,
+                response_model=ReviewResult,
+                caller="lesson_reviewer"
             )
             review_result = ReviewResult(**review_json)
             
@@ -310,35 +1138,13 @@ class LessonGenerator:
                 f"Review complete: {review_result.decision} "
                 f"({len(review_result.blocking_issues)} blocking, {len(review_result.fixable_issues)} fixable issues)"
             )
-            
             return review_result, reviewer_prompt
             
-        except (JSONDecodeError, ValidationError) as e:
+        except (ValueError, ValidationError) as e:
             logger.error(f"Review failed: {e}. Defaulting to regenerate_from_scratch")
-            # Return a fallback review result that triggers regeneration
-            return ReviewResult(
-                decision="regenerate_from_scratch",
-                rewrite_strategy="complete_regeneration",
-                blocking_issues=[
-                    {
-                        "type": "json_error",
-                        "severity": "critical",
-                        "description": "Review agent failed to produce valid output",
-                        "action_required": "Regenerate the lesson"
-                    }
-                ],
-                fixable_issues=[],
-                preserve_elements=[],
-                duration_analysis={
-                    "total_estimated_seconds": 0,
-                    "target_seconds": lesson_spec.get("estimated_duration_minutes", 3) * 60,
-                    "status": "on_target",
-                    "slides_over_target": []
-                },
-                summary="Review agent error - regeneration required"
-            ), reviewer_prompt
+            return self._review_error_result(lesson_spec), reviewer_prompt
     
-    def _rewrite_lesson(
+    async def _rewrite_lesson(
         self,
         lesson_json: Dict,
         review_result: ReviewResult,
@@ -347,28 +1153,123 @@ class LessonGenerator:
         difficulty_knobs: Dict,
         course_config: Dict
     ) -> tuple[Dict, str]:
-        """Rewrite lesson based on review feedback."""
+        """
+        Rewrite lesson based on review feedback.
+        
+        When every fixable issue targets a single slide (and LESSON_REWRITE_MODE
+        is "patch"), only the affected slides are rewritten, in parallel.
+        """
+        slide_issues = self._slide_patch_plan(lesson_json, review_result)
+        if slide_issues:
+            return await self._rewrite_slides(lesson_json, review_result, slide_issues, difficulty_knobs)
+        
         rewriter_prompt = self._format_rewriter_prompt(
             lesson_json, review_result, lesson_spec, user_profile,
             difficulty_knobs, course_config
         )
+        system_prompt, user_prompt = self._split_prompt(rewriter_prompt)
         
         try:
-            rewritten_json = self.llm_client.generate_json(
-                rewriter_prompt,
-                temperature=0.7  # Creative rewriting (auto-corrected to 1.0 for Gemini 3)
+            rewritten_json = await self.llm_client.agenerate_json(
+                user_prompt,
+                system=system_prompt,
+                temperature=0.7,
+                max_tokens=lesson_max_tokens(difficulty_knobs),
+                response_model=LessonContent,
+                caller="lesson_rewriter"
             )
-            
-            # Validate rewritten lesson
             LessonContent(**rewritten_json)
             
             logger.info("Lesson rewritten successfully")
             return rewritten_json, rewriter_prompt
             
-        except (JSONDecodeError, ValidationError) as e:
+        except (ValueError, ValidationError) as e:
             logger.error(f"Rewrite failed: {e}. Returning original lesson")
             return lesson_json, rewriter_prompt
     
+    def _slide_patch_plan(
+        self,
+        lesson_json: Dict,
+        review_result: ReviewResult
+    ) -> Optional[Dict[int, list]]:
+        """Fixable issues grouped by slide, or None if the whole lesson must be rewritten."""
+        if get_settings().lesson_rewrite_mode != "patch" or not review_result.fixable_issues:
+            return None
+        slide_numbers = [slide.get("slide_number") for slide in lesson_json.get("slides", [])]
+        slide_issues = group_issues_by_slide(review_result.fixable_issues, slide_numbers)
+        if slide_issues is None:
+            logger.info("Fixable issues are not all slide-level, rewriting the whole lesson")
+        return slide_issues
+    
+    async def _rewrite_slides(
+        self,
+        lesson_json: Dict,
+        review_result: ReviewResult,
+        slide_issues: Dict[int, list],
+        difficulty_knobs: Dict
+    ) -> tuple[Dict, str]:
+        """
+        Rewrite only the slides with fixable issues (one LLM call per slide, in parallel).
+        
+        Returns:
+            (lesson_json with rewritten slides merged in, combined slide prompts)
+        """
+        slides = {slide["slide_number"]: slide for slide in lesson_json["slides"]}
+        logger.info(f"Patching {len(slide_issues)} of {len(slides)} slides ({len(review_result.fixable_issues)} issues)")
+        
+        numbers = list(slide_issues)
+        rewrites = await asyncio.gather(*(
+            self._rewrite_slide(slides[number], slide_issues[number], review_result, difficulty_knobs)
+            for number in numbers
+        ))
+        return self._merge_slide_rewrites(lesson_json, dict(zip(numbers, rewrites)))
+    
+    async def _rewrite_slide(
+        self,
+        slide_json: Dict,
+        issues: list,
+        review_result: ReviewResult,
+        difficulty_knobs: Dict
+    ) -> tuple[Optional[Dict], str]:
+        """Apply the issues for one slide. Returns (rewritten slide or None on failure, prompt)."""
+        slide_prompt = self._format_slide_rewriter_prompt(slide_json, issues, review_result)
+        system_prompt, user_prompt = self._split_prompt(slide_prompt)
+        
+        try:
+            rewritten = await self.llm_client.agenerate_json(
+                user_prompt,
+                system=system_prompt,
+                temperature=0.7,
+                max_tokens=slide_max_tokens(difficulty_knobs),
+                response_model=SlideContent,
+                caller="lesson_rewriter"
+            )
+            SlideContent(**rewritten)
+            return rewritten, slide_prompt
+            
+        except (ValueError, ValidationError) as e:
+            logger.error(f"Rewrite of slide {slide_json.get('slide_number')} failed: {e}. Keeping original slide")
+            return None, slide_prompt
+    
+    @staticmethod
+    def _merge_slide_rewrites(
+        lesson_json: Dict,
+        results: Dict[int, tuple[Optional[Dict], str]]
+    ) -> tuple[Dict, str]:
+        """Merge rewritten slides into the lesson; keeps the original lesson if the result is invalid."""
+        rewritten_slides = {number: slide for number, (slide, _) in results.items() if slide is not None}
+        combined_prompt = "\n\n---\n\n".join(prompt for _, prompt in results.values())
+        
+        merged = merge_slides(lesson_json, rewritten_slides)
+        try:
+            LessonContent(**merged)
+        except ValidationError as e:
+            logger.error(f"Patched lesson failed validation: {e}. Returning original lesson")
+            return lesson_json, combined_prompt
+        
+        logger.info(f"Lesson patched successfully ({len(rewritten_slides)}/{len(results)} slides rewritten)")
+        return merged, combined_prompt
+    
     def _format_generator_prompt(
         self,
         lesson_spec: Dict,
@@ -527,7 +1428,69 @@ class LessonGenerator:
         
         return self.rewriter_template.render(**context)
     
-    def _fallback_lesson(
+    def _format_slide_rewriter_prompt(
+        self,
+        slide_json: Dict,
+        issues: list,
+        review_result: ReviewResult
+    ) -> str:
+        """Format the single-slide rewriter prompt (issues and preserve elements for that slide only)."""
+        slide_number = slide_json.get("slide_number")
+        preserve = [
+            element.model_dump() for element in review_result.preserve_elements
+            if slide_number_for_location(element.location) == slide_number
+        ]
+        
+        context = {
+            "slide_json": json.dumps(slide_json, indent=2),
+            "issues_json": json.dumps([issue.model_dump() for issue in issues], indent=2),
+            "preserve_json": json.dumps(preserve, indent=2)
+        }
+        
+        return self.slide_rewriter_template.render(**context)
+    
+    def _format_variant_prompt(
+        self,
+        base_json: Dict,
+        user_profile: UserProfileData,
+        difficulty_level: int,
+        difficulty_knobs: Dict
+    ) -> str:
+        """Format the difficulty variant prompt (target difficulty profile and the base lesson)."""
+        context = {
+            "profession": user_profile.profession,
+            "industry": user_profile.industry,
+            "typical_outputs": user_profile.typical_outputs,
+            "difficulty_level": difficulty_level,
+            "difficulty_label": difficulty_knobs.get("label", ""),
+            "difficulty_profile_json": json.dumps(difficulty_knobs, indent=2, ensure_ascii=False),
+            "base_lesson_json": json.dumps(base_json, indent=2)
+        }
+        
+        return self.variant_template.render(**context)
+    
+    def _format_personalizer_prompt(
+        self,
+        core_json: Dict,
+        slides: list,
+        user_profile: UserProfileData
+    ) -> str:
+        """Format the personalization prompt (learner profile and the slides to rewrite)."""
+        context = {
+            "profession": user_profile.profession,
+            "industry": user_profile.industry,
+            "experience_level": user_profile.experience_level,
+            "typical_outputs": user_profile.typical_outputs,
+            "daily_responsibilities": user_profile.daily_responsibilities,
+            "pain_points": user_profile.pain_points,
+            "high_stakes_areas": user_profile.high_stakes_areas,
+            "lesson_title": core_json.get("lesson_title", ""),
+            "slides_json": json.dumps(slides, indent=2)
+        }
+        
+        return self.personalizer_template.render(**context)
+    
+    async def _fallback_lesson(
         self,
         lesson_id: str,
         course_id: str,
@@ -535,61 +1498,139 @@ class LessonGenerator:
         lesson_spec: Dict,
         user_profile: UserProfileData,
         difficulty_knobs: Dict,
-        course_config: Dict
+        course_config: Dict,
+        adaptation_context: Optional[str] = None
     ) -> GeneratedLesson:
         """
-        Generate a simple, safe fallback lesson using LLM with strict constraints.
+        Serve a safe fallback lesson and queue a personalized regeneration.
         
         This is called when:
         - Primary generation fails validation
         - Review returns 'regenerate_from_scratch'
         - Final validation fails
         
-        The fallback generator uses a simplified prompt with:
+        The pre-built lesson from the fallback bank (services/fallback_bank.py)
+        is served without any LLM call. Lessons missing from the bank are
+        generated with the fallback prompt, which uses:
         - No figures (text-only)
         - Adaptive slide count based on difficulty
         - Guaranteed to pass validation
         - Personalized to user profile
         """
+        await asyncio.to_thread(
+            self._schedule_regeneration, lesson_id, course_id, difficulty_level, user_profile, adaptation_context
+        )
+        
+        banked = await asyncio.to_thread(self._banked_fallback_lesson, lesson_id, course_id, difficulty_level)
+        if banked:
+            return banked
+        
         logger.warning(f"Generating fallback lesson for {lesson_id} using LLM")
         
         try:
-            # Format fallback prompt
             fallback_prompt = self._format_fallback_prompt(
                 lesson_spec, user_profile, difficulty_level, difficulty_knobs, course_config
             )
-            
-            # Generate with LLM (single attempt, no retry)
-            lesson_json = self.llm_client.generate_json(
+            lesson_json = await self.llm_client.agenerate_json(
                 fallback_prompt,
-                temperature=0.7  # Balanced creativity for fallback
-            )
-            
-            # Validate
-            lesson_content = LessonContent(**lesson_json)
-            
-            logger.info(f"Fallback lesson generated successfully with {len(lesson_content.slides)} slides")
-            
-            return GeneratedLesson(
-                lesson_id=lesson_id,
-                course_id=course_id,
-                difficulty_level=difficulty_level,
-                lesson_content=lesson_content,
-                generation_metadata=GenerationMetadata(
-                    cache_hit=False,
-                    llm_model=self.llm_client.model,
-                    generation_time_seconds=0,  # Not tracked for fallback
-                    review_passed_first_time=None,  # Fallback skips review
-                    rewrite_count=0,
-                    quality_score=None
-                )
+                temperature=0.7,
+                response_model=LessonContent,
+                caller="lesson_fallback"
             )
+            return self._build_fallback_lesson(lesson_id, course_id, difficulty_level, lesson_json)
             
         except Exception as e:
-            # If even fallback generation fails, return minimal hardcoded lesson
             logger.error(f"Fallback generation failed: {e}. Returning minimal hardcoded lesson.")
             return self._minimal_hardcoded_lesson(lesson_id, course_id, difficulty_level)
     
+    def _build_fallback_lesson(
+        self,
+        lesson_id: str,
+        course_id: str,
+        difficulty_level: int,
+        lesson_json: Dict
+    ) -> GeneratedLesson:
+        """Validate fallback lesson JSON and wrap it (raises ValidationError if invalid)."""
+        lesson_content = LessonContent(**lesson_json)
+        
+        logger.info(f"Fallback lesson generated successfully with {len(lesson_content.slides)} slides")
+        
+        return GeneratedLesson(
+            lesson_id=lesson_id,
+            course_id=course_id,
+            difficulty_level=difficulty_level,
+            lesson_content=lesson_content,
+            generation_metadata=GenerationMetadata(
+                cache_hit=False,
+                llm_model=self.llm_client.last_model_used,
+                generation_time_seconds=0,  # Not tracked for fallback
+                review_passed_first_time=None,  # Fallback skips review
+                rewrite_count=0,
+                quality_score=None,
+                fallback="llm"
+            )
+        )
+    
+    def _banked_fallback_lesson(
+        self,
+        lesson_id: str,
+        course_id: str,
+        difficulty_level: int
+    ) -> Optional[GeneratedLesson]:
+        """Pre-built fallback lesson from the fallback bank (no LLM call), or None if unavailable."""
+        if not get_settings().fallback_bank_enabled:
+            return None
+        
+        lesson_json = get_fallback_lesson(course_id, lesson_id, difficulty_level)
+        if lesson_json is None:
+            logger.info(f"No pre-built fallback lesson for {course_id}/{lesson_id}")
+            return None
+        
+        try:
+            lesson_content = LessonContent(**lesson_json)
+        except ValidationError as e:
+            logger.error(f"Pre-built fallback lesson for {lesson_id} is invalid: {e}")
+            return None
+        
+        logger.warning(f"Serving pre-built fallback lesson for {lesson_id} (D{difficulty_level})")
+        return GeneratedLesson(
+            lesson_id=lesson_id,
+            course_id=course_id,
+            difficulty_level=difficulty_level,
+            lesson_content=lesson_content,
+            generation_metadata=GenerationMetadata(
+                cache_hit=False,
+                llm_model=None,
+                generation_time_seconds=0,
+                review_passed_first_time=None,
+                rewrite_count=0,
+                quality_score=None,
+                fallback="bank"
+            )
+        )
+    
+    def _schedule_regeneration(
+        self,
+        lesson_id: str,
+        course_id: str,
+        difficulty_level: int,
+        user_profile: UserProfileData,
+        adaptation_context: Optional[str]
+    ):
+        """Queue a background job that regenerates (and caches) the personalized lesson."""
+        settings = get_settings()
+        if self.cache_service is None or not settings.fallback_regenerate_enabled or not settings.job_workers_enabled:
+            return
+        if get_current_job_type() in RETRY_ON_FALLBACK_JOB_TYPES:
+            # The running job is retried by the queue; a second job would generate the lesson twice
+            logger.info(f"Not queueing regeneration of {lesson_id}: the running job retries it")
+            return
+        try:
+            job = enqueue_lesson_job(course_id, lesson_id, difficulty_level, user_profile, adaptation_context)
+            logger.info(f"Queued regeneration of {lesson_id} (D{difficulty_level}) as job {job.id}")
+        except Exception as e:
+            logger.warning(f"Failed to queue regeneration of {lesson_id}: {e}")
+    
     def _minimal_hardcoded_lesson(
         self,
         lesson_id: str,
@@ -664,7 +1705,8 @@ class LessonGenerator:
                 generation_time_seconds=0,
                 review_passed_first_time=None,
                 rewrite_count=0,
-                quality_score=None
+                quality_score=None,
+                fallback="minimal"
             )
         )
 
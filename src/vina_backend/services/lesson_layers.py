@@ -0,0 +1,47 @@
+"""
+Two-layer lesson generation (LESSON_GENERATION_MODE=layered).
+
+The lesson cache key includes the learner's profession, industry and
+experience, so every new combination pays for a full generate → review →
+rewrite run of content that is mostly identical across professions.
+Layered generation splits a lesson into:
+
+1. a core lesson per (lesson, difficulty, adaptation), generated and reviewed
+   once for CORE_PROFILE and cached under that profile's key
+2. a personalization pass that rewrites only the hook and example slides of
+   the core lesson for the learner (prompts/lesson/lesson_personalizer_prompt.md),
+   cached under the learner's key as usual
+"""
+from typing import Any, Dict, List
+
+from vina_backend.domain.schemas.profile import UserProfileData
+
+# Profession-neutral learner the core lesson (and the fallback bank) is written for
+CORE_PROFILE = UserProfileData(
+    profession="Professional",
+    industry="Cross-industry",
+    experience_level="Intermediate",
+    technical_comfort_level="Medium",
+    daily_responsibilities=["Writing documents", "Answering questions from colleagues", "Reviewing information"],
+    pain_points=["Too much time spent on first drafts", "Searching for information"],
+    typical_outputs=["Reports", "Emails", "Summaries", "Presentations"],
+    professional_goals=["Use AI tools safely and effectively at work"],
+    safety_priorities=["Verify AI output before sharing it", "Protect confidential information"],
+    high_stakes_areas=["Decisions based on unverified facts", "Sharing sensitive data with external tools"],
+)
+
+# Slides the personalization pass rewrites; concept and connection slides are kept from the core lesson
+PERSONALIZED_SLIDE_TYPES = ("hook", "example")
+
+
+def is_core_profile(user_profile: UserProfileData) -> bool:
+    """Whether a profile shares CORE_PROFILE's cache identity (profession, industry, experience)."""
+    return (
+        (user_profile.profession, user_profile.industry, user_profile.experience_level)
+        == (CORE_PROFILE.profession, CORE_PROFILE.industry, CORE_PROFILE.experience_level)
+    )
+
+
+def personalizable_slides(lesson_json: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Slides of a core lesson the personalization pass rewrites, in lesson order."""
+    return [slide for slide in lesson_json.get("slides", []) if slide.get("slide_type") in PERSONALIZED_SLIDE_TYPES]
@@ -0,0 +1,71 @@
+"""
+Slide-level patching for the lesson rewriter.
+
+Most fix_in_place reviews touch one or two slides (a long talk track, a
+forbidden phrase in one bullet), yet a whole-lesson rewrite resends and
+regenerates every slide. These helpers group the reviewer's fixable issues
+by slide so that only the affected slides are rewritten, then merge the
+rewritten slides back into the lesson JSON.
+
+Issue locations follow the reviewer's "slide_X_item_Y" convention
+(prompts/lesson/lesson_reviewer_prompt.md).
+"""
+import copy
+import re
+from typing import Any, Dict, List, Optional
+
+_SLIDE_LOCATION = re.compile(r"^\s*slide[\s_-]*(\d+)(?:\b|_)", re.IGNORECASE)
+
+
+def slide_number_for_location(location: Optional[str]) -> Optional[int]:
+    """
+    Slide number a reviewer location points at.
+
+    Returns:
+        The slide number for "slide_2" / "slide_2_item_3", None for lesson-level
+        or unrecognized locations
+    """
+    match = _SLIDE_LOCATION.match(location or "")
+    return int(match.group(1)) if match else None
+
+
+def group_issues_by_slide(issues: List[Any], slide_numbers: List[int]) -> Optional[Dict[int, List[Any]]]:
+    """
+    Group fixable issues by the slide they target.
+
+    Args:
+        issues: Reviewer issues (objects or dicts with a "location")
+        slide_numbers: Slide numbers present in the lesson
+
+    Returns:
+        Mapping of slide number -> issues in review order, or None if any issue
+        is lesson-level or points at an unknown slide (the whole lesson must
+        then be rewritten)
+    """
+    grouped: Dict[int, List[Any]] = {}
+    for issue in issues:
+        location = issue.get("location") if isinstance(issue, dict) else getattr(issue, "location", None)
+        slide_number = slide_number_for_location(location)
+        if slide_number is None or slide_number not in slide_numbers:
+            return None
+        grouped.setdefault(slide_number, []).append(issue)
+    return grouped
+
+
+def merge_slides(lesson_json: Dict[str, Any], rewritten_slides: Dict[int, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Replace slides in a lesson with their rewritten versions.
+
+    Args:
+        lesson_json: Original lesson (not modified)
+        rewritten_slides: Mapping of slide number -> rewritten slide JSON
+
+    Returns:
+        New lesson JSON; slide numbers and order are kept from the original
+    """
+    merged = copy.deepcopy(lesson_json)
+    for index, slide in enumerate(merged.get("slides", [])):
+        replacement = rewritten_slides.get(slide.get("slide_number"))
+        if replacement is not None:
+            merged["slides"][index] = {**replacement, "slide_number": slide["slide_number"]}
+    return merged
@@ -0,0 +1,96 @@
+"""
+Deterministic pre-review checks for generated lessons.
+
+The reviewer prompt (prompts/lesson/lesson_reviewer_prompt.md) mixes
+judgement calls (example quality, accuracy, tone) with rules that can be
+checked mechanically: slide count, one figure first on every slide, image
+prompt text limits, bullet length, Markdown, em dashes, forbidden AI-speak
+phrases and pacing. precheck_lesson runs the mechanical rules so the
+review sampler (services/review_sampling.py) only skips the LLM review for
+lessons that already pass them.
+"""
+from typing import Any, Dict, List
+
+from vina_backend.integrations.llm.token_budget import parse_range
+
+# Reviewer rules that can be checked without an LLM (prompts/lesson/lesson_reviewer_prompt.md)
+FORBIDDEN_PHRASES = (
+    "in today's fast-paced world",
+    "dive deep",
+    "unlock the potential",
+    "game-changer",
+    "seamlessly",
+    "empower",
+    "leverage",
+    "at the end of the day",
+    "think outside the box",
+)
+ANTI_HALLUCINATION_PHRASES = (
+    "icons and single-word labels only",
+    "avoid sentences",
+    "minimal text",
+    "simple labels only",
+)
+MARKDOWN_MARKERS = ("**", "```")
+MAX_BULLET_WORDS = 12
+SPOKEN_WORDS_PER_SECOND = 2.3
+# Upper pacing targets per slide type, plus the reviewer's 30% tolerance
+SLIDE_SECONDS_TARGET = {"hook": 40, "concept": 60, "example": 60, "connection": 40}
+PACING_TOLERANCE = 1.3
+
+
+def precheck_lesson(lesson_json: Dict[str, Any], difficulty_knobs: Dict[str, Any]) -> List[str]:
+    """
+    Deterministic subset of the reviewer's checks.
+
+    Args:
+        lesson_json: Generated lesson (validated LessonContent JSON)
+        difficulty_knobs: Difficulty config (see course_loader.get_difficulty_knobs)
+
+    Returns:
+        Problems found (empty if the lesson passes)
+    """
+    problems = []
+    slides = lesson_json.get("slides", [])
+
+    metrics = difficulty_knobs.get("delivery_metrics", {})
+    min_slides, max_slides = parse_range(metrics.get("slide_count_for_3min_lesson"), (4, 5))
+    if not min_slides <= len(slides) <= max_slides:
+        problems.append(f"{len(slides)} slides (expected {min_slides}-{max_slides})")
+
+    for slide in slides:
+        number = slide.get("slide_number")
+        items = slide.get("items", [])
+        figures = [item for item in items if item.get("type") == "figure"]
+
+        if len(figures) != 1 or items[0].get("type") != "figure":
+            problems.append(f"slide {number}: expected exactly one figure as the first item")
+        for item in figures:
+            figure = item.get("figure") or {}
+            prompt = (figure.get("image_prompt") or "").lower()
+            if not any(phrase in prompt for phrase in ANTI_HALLUCINATION_PHRASES):
+                problems.append(f"slide {number}: image prompt lacks text limitation language")
+
+        spoken_words = 0
+        for index, item in enumerate(items, start=1):
+            bullet, talk = item.get("bullet", ""), item.get("talk", "")
+            spoken_words += len(talk.split())
+            if len(bullet.split()) > MAX_BULLET_WORDS:
+                problems.append(f"slide {number} item {index}: bullet over {MAX_BULLET_WORDS} words")
+
+            text = f"{bullet}\n{talk}"
+            lowered = text.lower()
+            if "—" in text:
+                problems.append(f"slide {number} item {index}: em dash")
+            if any(marker in text for marker in MARKDOWN_MARKERS):
+                problems.append(f"slide {number} item {index}: Markdown formatting")
+            problems.extend(
+                f"slide {number} item {index}: forbidden phrase '{phrase}'"
+                for phrase in FORBIDDEN_PHRASES if phrase in lowered
+            )
+
+        target = SLIDE_SECONDS_TARGET.get(slide.get("slide_type"))
+        if target and spoken_words / SPOKEN_WORDS_PER_SECOND > target * PACING_TOLERANCE:
+            problems.append(f"slide {number}: talk track over {target}s pacing target")
+
+    return problems
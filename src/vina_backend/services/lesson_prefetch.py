@@ -0,0 +1,101 @@
+"""
+Predictive pre-generation of a learner's next lesson.
+
+When a learner passes a quiz we already know the next lesson
+(lesson_quiz_service.get_next_lesson) and, from the quiz score, the
+difficulty they will most likely see it at (learner_state_manager.next_difficulty).
+prefetch_next_lesson queues a low-priority lesson + video job for that key
+so that opening the next lesson is a cache hit instead of a full pipeline
+run. Keys already in LessonCache (with a video) are skipped.
+"""
+import logging
+from typing import Optional
+
+from sqlmodel import Session, select
+
+from vina_backend.integrations.db.models.user import UserProfile
+from vina_backend.integrations.db.repositories.profile_repository import ProfileRepository
+from vina_backend.services.generation_jobs import JOB_PRIORITY_PREFETCH, GenerationJob, enqueue_lesson_video_job
+from vina_backend.services.learner_state_manager import next_difficulty
+from vina_backend.services.lesson_cache import LessonCacheService
+
+logger = logging.getLogger(__name__)
+
+# Difficulty levels lessons are generated at (see course_loader.get_difficulty_knobs)
+CONTENT_DIFFICULTY_LEVELS = (1, 3, 5)
+
+
+def predict_difficulty(current_difficulty: int, quiz_score: int) -> int:
+    """
+    Difficulty the next lesson will most likely be served at.
+
+    Applies the quiz rules of mark_lesson_complete and snaps the result to a
+    level lessons exist at; a tie (2 or 4) follows the direction of the change.
+
+    Args:
+        current_difficulty: Difficulty of the lesson just completed
+        quiz_score: Score out of 3
+
+    Returns:
+        One of CONTENT_DIFFICULTY_LEVELS
+    """
+    target = next_difficulty(current_difficulty, quiz_score)
+    if target in CONTENT_DIFFICULTY_LEVELS:
+        return target
+    if target > current_difficulty:
+        return target + 1
+    if target < current_difficulty:
+        return target - 1
+    return min(CONTENT_DIFFICULTY_LEVELS, key=lambda level: abs(level - target))
+
+
+def prefetch_next_lesson(
+    engine,
+    user_id: str,
+    course_id: str,
+    next_lesson_id: str,
+    current_difficulty: int,
+    quiz_score: int,
+) -> Optional[GenerationJob]:
+    """
+    Queue low-priority generation of the next lesson for a learner.
+
+    Args:
+        engine: SQLAlchemy engine of the application database
+        user_id: Learner who passed the quiz
+        course_id: Course identifier
+        next_lesson_id: Lesson to pre-generate
+        current_difficulty: Difficulty of the lesson just completed
+        quiz_score: Score out of 3
+
+    Returns:
+        The queued job, or None if the learner has no profile or the lesson is already cached
+    """
+    from vina_backend.integrations.llm.client import get_llm_client
+
+    difficulty_level = predict_difficulty(current_difficulty, quiz_score)
+
+    with Session(engine) as session:
+        db_profile = session.exec(select(UserProfile).where(UserProfile.user_id == user_id)).first()
+        if not db_profile:
+            logger.debug(f"No profile for user {user_id}, skipping prefetch of {next_lesson_id}")
+            return None
+        user_profile = ProfileRepository.to_profile_data(db_profile)
+
+        if LessonCacheService(session).is_cached(
+            course_id, next_lesson_id, difficulty_level, user_profile, get_llm_client().model,
+            require_video=True
+        ):
+            logger.info(f"Next lesson {next_lesson_id} (D{difficulty_level}) already cached for user {user_id}")
+            return None
+
+    job = enqueue_lesson_video_job(
+        course_id,
+        next_lesson_id,
+        difficulty_level,
+        user_profile,
+        user_id=user_id,
+        priority=JOB_PRIORITY_PREFETCH,
+    )
+    logger.info(f"Prefetching {next_lesson_id} at D{difficulty_level} for user {user_id} (job {job.id})")
+    return job
@@ -0,0 +1,246 @@
+"""
+Single-flight coalescing of identical lesson generations.
+
+Learners with the same profession/industry/experience share a lesson cache
+key, so when several of them open the same lesson at once every request
+misses LessonCacheService.get and runs its own three-agent pipeline.
+LessonSingleFlight lets one caller per cache key generate while the others
+wait for its result:
+
+- within a process, callers share an in-memory future per key
+- across workers, the generating process holds a lease row in
+  lesson_generation_lease; other workers poll the lesson cache until the
+  lease is released and then re-check the cache before generating
+  themselves. Leases expire so a crashed worker cannot block a key forever.
+"""
+import asyncio
+import logging
+import os
+import socket
+import threading
+import time
+from concurrent.futures import CancelledError as FutureCancelledError
+from concurrent.futures import Future
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Field, Session, SQLModel
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class LessonGenerationLease(SQLModel, table=True):
+    """Database model for cross-worker generation leases."""
+
+    __tablename__ = "lesson_generation_lease"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    cache_key: str = Field(unique=True, index=True)
+    owner: str
+    expires_at: datetime = Field(index=True)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class LessonSingleFlight:
+    """
+    Runs at most one generation per cache key; concurrent callers share its result.
+    """
+
+    def __init__(
+        self,
+        engine=None,
+        lease_seconds: float = 300.0,
+        poll_seconds: float = 2.0,
+        wait_seconds: float = 240.0,
+    ):
+        """
+        Initialize the coalescer.
+
+        Args:
+            engine: SQLAlchemy engine holding the lease table (None: in-process only)
+            lease_seconds: Lease lifetime; should exceed a full pipeline run
+            poll_seconds: How often a waiting worker re-checks the cache and lease
+            wait_seconds: Longest a worker waits on another worker before generating anyway
+        """
+        self.engine = engine
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self.wait_seconds = wait_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self.coalesced = 0
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def _join(self, key: str) -> Tuple[Future, bool]:
+        """Return the in-flight future for key and whether the caller leads it."""
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            future = Future()
+            self._inflight[key] = future
+            return future, True
+
+    def _finish(self, key: str, future: Future, result: Any = None, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+        if isinstance(error, (asyncio.CancelledError, FutureCancelledError)):
+            future.cancel()  # Waiters retry and one of them takes over
+        elif error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    async def arun(
+        self,
+        key: str,
+        generate: Callable[[], Awaitable[T]],
+        recheck: Callable[[], Optional[T]],
+        use_lease: bool = True,
+    ) -> Tuple[T, bool]:
+        """
+        Generate for key, or wait for the generation already running.
+
+        Cancelling a waiting caller does not affect the shared generation; if
+        the generating caller is cancelled, one of the waiters takes over.
+
+        Args:
+            key: Lesson cache key (LessonCacheService.generate_cache_key)
+            generate: Coroutine function running the pipeline
+            recheck: Blocking cache lookup (run in a worker thread)
+            use_lease: Coordinate with other workers (only useful when results are cached)
+
+        Returns:
+            (result, shared) where shared is True if another caller produced it
+        """
+        while True:
+            future, leader = self._join(key)
+            if not leader:
+                try:
+                    return await asyncio.shield(asyncio.wrap_future(future)), True
+                except asyncio.CancelledError:
+                    if future.cancelled():
+                        continue
+                    raise
+
+            try:
+                result = await (self._arun_leased(key, generate, recheck) if use_lease else generate())
+            except BaseException as e:
+                self._finish(key, future, error=e)
+                raise
+            self._finish(key, future, result=result)
+            return result, False
+
+    async def _arun_leased(
+        self,
+        key: str,
+        generate: Callable[[], Awaitable[T]],
+        recheck: Callable[[], Optional[T]],
+    ) -> T:
+        if self.engine is None:
+            return await generate()
+
+        deadline = time.monotonic() + self.wait_seconds
+        waited = False
+        while not await asyncio.to_thread(self._acquire_lease, key):
+            waited = True
+            cached = await asyncio.to_thread(recheck)
+            if cached is not None:
+                logger.info(f"Lesson {key} generated by another worker, using its result")
+                return cached
+            if time.monotonic() > deadline:
+                logger.warning(f"Gave up waiting for another worker on {key}, generating")
+                return await generate()
+            await asyncio.sleep(self.poll_seconds)
+
+        try:
+            if waited:
+                cached = await asyncio.to_thread(recheck)
+                if cached is not None:
+                    return cached
+            return await generate()
+        finally:
+            await asyncio.to_thread(self._release_lease, key)
+
+    def _acquire_lease(self, key: str) -> bool:
+        """Insert the lease row for key (after clearing an expired one); False if held elsewhere."""
+        now = datetime.utcnow()
+        try:
+            with Session(self.engine) as session:
+                session.execute(
+                    delete(LessonGenerationLease).where(
+                        LessonGenerationLease.cache_key == key,
+                        LessonGenerationLease.expires_at < now,
+                    )
+                )
+                session.add(LessonGenerationLease(
+                    cache_key=key,
+                    owner=self.owner,
+                    expires_at=now + timedelta(seconds=self.lease_seconds),
+                ))
+                session.commit()
+            return True
+        except IntegrityError:
+            return False
+        except Exception as e:
+            # Never block generation on the lease table
+            logger.warning(f"Lesson lease unavailable for {key}: {e}")
+            return True
+
+    def _release_lease(self, key: str) -> None:
+        try:
+            with Session(self.engine) as session:
+                session.execute(
+                    delete(LessonGenerationLease).where(
+                        LessonGenerationLease.cache_key == key,
+                        LessonGenerationLease.owner == self.owner,
+                    )
+                )
+                session.commit()
+        except Exception as e:
+            logger.warning(f"Could not release lesson lease for {key}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """In-flight generations and callers coalesced onto them since startup."""
+        with self._lock:
+            return {"in_flight": len(self._inflight), "coalesced": self.coalesced}
+
+
+# Global coalescer instance (lazy initialization)
+_lesson_singleflight: Optional[LessonSingleFlight] = None
+
+
+def get_lesson_singleflight() -> LessonSingleFlight:
+    """
+    Get or create the process-wide lesson generation coalescer.
+
+    Returns:
+        LessonSingleFlight backed by the application database
+    """
+    global _lesson_singleflight
+    if _lesson_singleflight is None:
+        from vina_backend.core.config import get_settings
+        from vina_backend.integrations.db.engine import engine
+
+        settings = get_settings()
+        LessonGenerationLease.metadata.create_all(engine, tables=[LessonGenerationLease.__table__])
+        _lesson_singleflight = LessonSingleFlight(
+            engine,
+            lease_seconds=settings.lesson_lease_seconds,
+            poll_seconds=settings.lesson_lease_poll_seconds,
+            wait_seconds=settings.lesson_lease_wait_seconds,
+        )
+    return _lesson_singleflight
+
+
+def reset_lesson_singleflight():
+    """
+    Reset the global coalescer (leases in the database are kept until they expire).
+    """
+    global _lesson_singleflight
+    _lesson_singleflight = None
@@ -57,7 +57,8 @@ def generate_user_profile(
             prompt=prompt,
             max_tokens=2000,  # Increased for safety_priorities and high_stakes_areas
             # temperature will be automatically set to safest default (1.0 for Gemini 3)
-            
+            response_model=UserProfileData,
+            caller="profile_builder",
         )
         
         # Validate and parse into Pydantic model
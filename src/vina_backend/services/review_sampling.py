@@ -0,0 +1,229 @@
+"""
+Adaptive sampling of the lesson reviewer.
+
+Every freshly generated lesson pays for a full reviewer call, yet for a
+stable (model, lesson, difficulty) combination nearly every review comes
+back "approved". ReviewSampler keeps approved / fixed / regenerated counts
+per combination in lesson_review_stats and lets the generator skip the LLM
+review when:
+
+- the combination has at least min_reviews real reviews under the current
+  generator + reviewer prompts (new prompts or models always get full review),
+- its approval rate is at or above approval_threshold,
+- lesson_precheck.precheck_lesson finds none of the problems the reviewer checks
+  deterministically (slide count, figure placement/layout, forbidden phrases,
+  Markdown, em dashes, pacing), and
+- the lesson is not drawn for the review_rate sample that keeps stats fresh.
+
+Skips are counted too, so the skip rate can be reported (GET /health/reviews).
+"""
+import hashlib
+import logging
+import random
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, update
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Field, Session, SQLModel, select
+
+logger = logging.getLogger(__name__)
+
+OUTCOME_COLUMNS = {"approved": "approved", "fix_in_place": "fixed", "regenerate_from_scratch": "regenerated"}
+
+
+class LessonReviewStats(SQLModel, table=True):
+    """Database model for reviewer outcomes per (model, prompts, lesson, difficulty)."""
+
+    __tablename__ = "lesson_review_stats"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    stats_key: str = Field(unique=True, index=True)
+    llm_model: str = Field(index=True)
+    prompt_version: str
+    lesson_id: str = Field(index=True)
+    difficulty_level: int
+    approved: int = Field(default=0)
+    fixed: int = Field(default=0)
+    regenerated: int = Field(default=0)
+    skipped: int = Field(default=0)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    @property
+    def reviewed(self) -> int:
+        return self.approved + self.fixed + self.regenerated
+
+
+def prompt_version(*paths: Path) -> str:
+    """Short hash of prompt template files; stats restart whenever a prompt changes."""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(Path(path).read_bytes())
+    return digest.hexdigest()[:12]
+
+
+class ReviewSampler:
+    """
+    Decides whether a generated lesson needs the LLM reviewer, from past review outcomes.
+    """
+
+    def __init__(
+        self,
+        engine,
+        min_reviews: int = 20,
+        approval_threshold: float = 0.95,
+        review_rate: float = 0.1,
+    ):
+        """
+        Initialize the sampler.
+
+        Args:
+            engine: SQLAlchemy engine holding lesson_review_stats
+            min_reviews: Real reviews needed before a combination may skip review
+            approval_threshold: Approval rate at or above which review may be skipped
+            review_rate: Fraction of skippable lessons still reviewed to keep stats current
+        """
+        self.engine = engine
+        self.min_reviews = min_reviews
+        self.approval_threshold = approval_threshold
+        self.review_rate = review_rate
+
+    @staticmethod
+    def _stats_key(llm_model: str, prompt_version: str, lesson_id: str, difficulty_level: int) -> str:
+        return f"{llm_model}:{prompt_version}:{lesson_id}:d{difficulty_level}"
+
+    def _get(self, session: Session, stats_key: str) -> Optional[LessonReviewStats]:
+        return session.exec(select(LessonReviewStats).where(LessonReviewStats.stats_key == stats_key)).first()
+
+    def should_review(
+        self,
+        llm_model: str,
+        prompt_version: str,
+        lesson_id: str,
+        difficulty_level: int,
+        precheck_problems: List[str],
+    ) -> Tuple[bool, str]:
+        """
+        Whether to run the LLM reviewer on a freshly generated lesson.
+
+        Args:
+            llm_model: Generator model
+            prompt_version: Hash of the generator and reviewer prompts
+            lesson_id: Lesson identifier
+            difficulty_level: Difficulty level
+            precheck_problems: Result of precheck_lesson for this lesson
+
+        Returns:
+            (review needed, reason)
+        """
+        if precheck_problems:
+            return True, f"precheck failed: {precheck_problems[0]}"
+
+        with Session(self.engine) as session:
+            stats = self._get(session, self._stats_key(llm_model, prompt_version, lesson_id, difficulty_level))
+
+        if stats is None or stats.reviewed < self.min_reviews:
+            return True, f"{stats.reviewed if stats else 0}/{self.min_reviews} reviews for this model and prompt"
+
+        approval_rate = stats.approved / stats.reviewed
+        if approval_rate < self.approval_threshold:
+            return True, f"approval rate {approval_rate:.0%} below {self.approval_threshold:.0%}"
+        if random.random() < self.review_rate:
+            return True, f"sampled ({self.review_rate:.0%} of skippable lessons)"
+        return False, f"approval rate {approval_rate:.0%} over {stats.reviewed} reviews"
+
+    def record(
+        self,
+        llm_model: str,
+        prompt_version: str,
+        lesson_id: str,
+        difficulty_level: int,
+        outcome: str,
+    ):
+        """
+        Count a reviewer decision ("approved", "fix_in_place", "regenerate_from_scratch") or "skipped".
+        """
+        column = OUTCOME_COLUMNS.get(outcome, outcome)
+        stats_key = self._stats_key(llm_model, prompt_version, lesson_id, difficulty_level)
+
+        with Session(self.engine) as session:
+            if self._get(session, stats_key) is None:
+                session.add(LessonReviewStats(
+                    stats_key=stats_key,
+                    llm_model=llm_model,
+                    prompt_version=prompt_version,
+                    lesson_id=lesson_id,
+                    difficulty_level=difficulty_level,
+                ))
+                try:
+                    session.commit()
+                except IntegrityError:
+                    session.rollback()  # Created concurrently by another worker
+
+            counter = getattr(LessonReviewStats, column)
+            session.execute(
+                update(LessonReviewStats)
+                .where(LessonReviewStats.stats_key == stats_key)
+                .values({column: counter + 1, "updated_at": datetime.utcnow()})
+            )
+            session.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Totals across all combinations, including the share of lessons whose review was skipped."""
+        with Session(self.engine) as session:
+            approved, fixed, regenerated, skipped = session.exec(
+                select(
+                    func.coalesce(func.sum(LessonReviewStats.approved), 0),
+                    func.coalesce(func.sum(LessonReviewStats.fixed), 0),
+                    func.coalesce(func.sum(LessonReviewStats.regenerated), 0),
+                    func.coalesce(func.sum(LessonReviewStats.skipped), 0),
+                )
+            ).one()
+
+        reviewed = approved + fixed + regenerated
+        total = reviewed + skipped
+        return {
+            "reviewed": reviewed,
+            "approved": approved,
+            "fixed": fixed,
+            "regenerated": regenerated,
+            "skipped": skipped,
+            "skip_rate": round(skipped / total, 3) if total else 0.0,
+            "approval_rate": round(approved / reviewed, 3) if reviewed else None,
+        }
+
+
+# Global sampler instance (lazy initialization)
+_review_sampler: Optional[ReviewSampler] = None
+
+
+def get_review_sampler() -> ReviewSampler:
+    """
+    Get or create the process-wide review sampler.
+
+    Returns:
+        ReviewSampler backed by the application database
+    """
+    global _review_sampler
+    if _review_sampler is None:
+        from vina_backend.core.config import get_settings
+        from vina_backend.integrations.db.engine import engine
+
+        settings = get_settings()
+        LessonReviewStats.metadata.create_all(engine, tables=[LessonReviewStats.__table__])
+        _review_sampler = ReviewSampler(
+            engine,
+            min_reviews=settings.review_sampling_min_reviews,
+            approval_threshold=settings.review_sampling_approval_threshold,
+            review_rate=settings.review_sampling_rate,
+        )
+    return _review_sampler
+
+
+def reset_review_sampler():
+    """
+    Reset the global sampler (stats in the database are kept).
+    """
+    global _review_sampler
+    _review_sampler = None
@@ -375,6 +375,34 @@ class VideoPipeline:
         return slide_paths
 
 
+def lesson_to_video_data(lesson_content: Any) -> Dict[str, Any]:
+    """
+    Convert a generated LessonContent into the lesson data VideoPipeline expects.
+    
+    Args:
+        lesson_content: LessonContent (see domain/schemas/lesson.py)
+    
+    Returns:
+        Dictionary with title, topic and per-slide bullets/narration/image prompt
+    """
+    slides = []
+    for slide in lesson_content.slides:
+        figure = next((item.figure for item in slide.items if item.type == "figure" and item.figure), None)
+        slides.append({
+            "title": slide.title,
+            "bullets": [item.bullet for item in slide.items],
+            "narration": " ".join(item.talk for item in slide.items),
+            "has_figure": figure is not None,
+            "image_prompt": figure.image_prompt if figure else None
+        })
+    
+    return {
+        "title": lesson_content.lesson_title,
+        "topic": lesson_content.lesson_id or "General Knowledge",
+        "slides": slides
+    }
+
+
 def get_video_pipeline(config: Optional[PipelineConfig] = None) -> VideoPipeline:
     """
     Get a video pipeline instance.
@@ -0,0 +1,244 @@
+"""
+Deterministic repair of malformed JSON produced by LLMs.
+
+Fixes the failure modes we actually see from the lesson/quiz agents without
+another model call:
+- truncated output (unterminated strings, unbalanced brackets, dangling keys)
+- trailing commas before } or ]
+- unescaped double quotes, raw newlines/tabs and stray backslashes inside strings
+- Python literals (True/False/None) instead of JSON ones
+
+Every change is recorded so callers can log what was repaired.
+"""
+import json
+from dataclasses import dataclass, field
+from typing import Any, List, Tuple
+
+_VALID_ESCAPES = set('"\\/bfnrtu')
+_HEX_DIGITS = set("0123456789abcdefABCDEF")
+_VALUE_STARTS = set('"{[-0123456789')
+_LITERAL_VALUES = ("true", "false", "null")
+_PYTHON_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_CONTROL_ESCAPES = {"\n": "\\n", "\r": "\\r", "\t": "\\t"}
+
+
+@dataclass
+class RepairResult:
+    """Outcome of a repair attempt."""
+    text: str
+    changes: List[str] = field(default_factory=list)
+
+    @property
+    def repaired(self) -> bool:
+        return bool(self.changes)
+
+
+def _next_non_ws(text: str, start: int) -> Tuple[int, str]:
+    """Index and value of the next non-whitespace character ('' at end of input)."""
+    j = start
+    while j < len(text) and text[j] in " \t\r\n":
+        j += 1
+    return j, (text[j] if j < len(text) else "")
+
+
+def _starts_token(text: str, start: int) -> bool:
+    """Whether a JSON value or closing bracket plausibly starts at `start`."""
+    if start >= len(text) or text[start] in _VALUE_STARTS or text[start] in "}]":
+        return True
+    return text.startswith(_LITERAL_VALUES, start)
+
+
+def _strip_trailing_comma(out: List[str]) -> bool:
+    """Remove a trailing comma (ignoring whitespace) from the output buffer."""
+    k = len(out) - 1
+    while k >= 0 and out[k] in (" ", "\t", "\r", "\n"):
+        k -= 1
+    if k >= 0 and out[k] == ",":
+        del out[k]
+        return True
+    return False
+
+
+def repair_json(text: str) -> RepairResult:
+    """
+    Repair common LLM JSON defects in a single left-to-right pass.
+
+    Args:
+        text: Raw JSON-ish text (code fences should already be stripped)
+
+    Returns:
+        RepairResult with the repaired text and a list of human-readable changes
+    """
+    changes: List[str] = []
+    out: List[str] = []
+    # Stack of open containers; objects track whether they expect a key,
+    # have just seen a key, or expect a value ("key" / "colon" / "value")
+    stack: List[List[str]] = []
+    in_string = False
+    i = 0
+    n = len(text)
+
+    def note(change: str) -> None:
+        if change not in changes:
+            changes.append(change)
+
+    def in_key_position() -> bool:
+        return bool(stack) and stack[-1][0] == "{" and stack[-1][1] == "key"
+
+    while i < n:
+        ch = text[i]
+
+        if in_string:
+            if ch == "\\":
+                nxt = text[i + 1] if i + 1 < n else ""
+                if nxt == "":
+                    note("dropped dangling backslash at end of input")
+                    i += 1
+                    continue
+                hex_digits = text[i + 2:i + 6]
+                if nxt == "u" and (len(hex_digits) < 4 or not all(c in _HEX_DIGITS for c in hex_digits)):
+                    out.append("\\\\")
+                    note("escaped stray backslash")
+                    i += 1
+                    continue
+                if nxt in _VALID_ESCAPES:
+                    out.append(ch + nxt)
+                    i += 2
+                    continue
+                out.append("\\\\")
+                note("escaped stray backslash")
+                i += 1
+                continue
+
+            if ch == '"':
+                j, nxt = _next_non_ws(text, i + 1)
+                closes = False
+                if nxt in ("}", "]", ""):
+                    closes = True
+                elif nxt == ":":
+                    closes = in_key_position()
+                elif nxt == ",":
+                    k, _ = _next_non_ws(text, j + 1)
+                    closes = _starts_token(text, k)
+
+                if closes:
+                    out.append(ch)
+                    in_string = False
+                    if stack and stack[-1][0] == "{" and stack[-1][1] == "key":
+                        stack[-1][1] = "colon"
+                else:
+                    out.append('\\"')
+                    note("escaped unescaped quote inside string")
+                i += 1
+                continue
+
+            if ch in _CONTROL_ESCAPES:
+                out.append(_CONTROL_ESCAPES[ch])
+                note("escaped raw control character inside string")
+                i += 1
+                continue
+
+            out.append(ch)
+            i += 1
+            continue
+
+        # Outside of strings
+        if ch == '"':
+            in_string = True
+            out.append(ch)
+        elif ch in "{[":
+            stack.append([ch, "key" if ch == "{" else "value"])
+            out.append(ch)
+        elif ch in "}]":
+            if not stack:
+                note(f"dropped unmatched '{ch}'")
+                i += 1
+                continue
+            expected = "}" if stack[-1][0] == "{" else "]"
+            if ch != expected:
+                note(f"replaced mismatched '{ch}' with '{expected}'")
+                ch = expected
+            if _strip_trailing_comma(out):
+                note("removed trailing comma")
+            stack.pop()
+            out.append(ch)
+        elif ch == ":":
+            if stack and stack[-1][0] == "{":
+                stack[-1][1] = "value"
+            out.append(ch)
+        elif ch == ",":
+            if stack and stack[-1][0] == "{":
+                stack[-1][1] = "key"
+            out.append(ch)
+        elif ch.isalpha():
+            j = i
+            while j < n and text[j].isalpha():
+                j += 1
+            word = text[i:j]
+            if word in _PYTHON_LITERALS:
+                out.append(_PYTHON_LITERALS[word])
+                note(f"converted Python literal {word}")
+            else:
+                out.append(word)
+            i = j
+            continue
+        else:
+            out.append(ch)
+        i += 1
+
+    # --- Truncation handling ---
+    if in_string:
+        out.append('"')
+        note("closed unterminated string")
+        if stack and stack[-1][0] == "{" and stack[-1][1] == "key":
+            stack[-1][1] = "colon"
+
+    if stack:
+        if _strip_trailing_comma(out):
+            note("removed trailing comma")
+        tail = "".join(out).rstrip()
+        if stack[-1][0] == "{":
+            if stack[-1][1] == "colon":
+                out.append(": null")
+                note("completed dangling key with null")
+            elif tail.endswith(":"):
+                out.append(" null")
+                note("completed dangling key with null")
+        closers = "".join("}" if c[0] == "{" else "]" for c in reversed(stack))
+        out.append(closers)
+        note(f"closed {len(stack)} unbalanced bracket(s)")
+
+    repaired = "".join(out)
+
+    # Trailing commas at top level (e.g. '{...},')
+    stripped = repaired.rstrip()
+    if stripped.endswith(","):
+        repaired = stripped[:-1]
+        note("removed trailing comma")
+
+    return RepairResult(text=repaired, changes=changes)
+
+
+def loads_with_repair(text: str) -> Tuple[Any, List[str]]:
+    """
+    Parse JSON, repairing it locally if the first parse fails.
+
+    Args:
+        text: Raw JSON text
+
+    Returns:
+        (parsed_value, changes) where changes is empty if no repair was needed
+
+    Raises:
+        json.JSONDecodeError: If the text is still invalid after repair
+    """
+    try:
+        return json.loads(text), []
+    except json.JSONDecodeError as original_error:
+        result = repair_json(text)
+        if not result.repaired:
+            raise original_error
+        try:
+            return json.loads(result.text), result.changes
+        except json.JSONDecodeError:
+            raise original_error
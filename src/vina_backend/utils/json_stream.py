@@ -0,0 +1,122 @@
+"""
+Incremental parsing of streamed LLM JSON.
+
+A lesson arrives as one JSON object whose "slides" array is written slide by
+slide. JSONArrayStreamParser is fed the raw text chunks as they stream in and
+returns every element of the watched array as soon as its closing bracket
+arrives, so downstream stages can start on slide 1 while later slides are
+still being generated.
+
+Only the array under a top-level key is watched; text before the first "{"
+(e.g. a ```json fence) is ignored.
+"""
+from typing import Any, List, Optional
+
+from vina_backend.utils.json_safety import loads_with_repair
+
+
+class JSONArrayStreamParser:
+    """
+    Streaming scanner yielding completed elements of one top-level array.
+
+    Example:
+        parser = JSONArrayStreamParser("slides")
+        for chunk in chunks:
+            for slide in parser.feed(chunk):
+                ...
+    """
+
+    def __init__(self, array_key: str):
+        """
+        Initialize the parser.
+
+        Args:
+            array_key: Key of the array in the top-level object to stream elements from
+        """
+        self.array_key = array_key
+        self.text = ""
+        self.items_emitted = 0
+        self._pos = 0
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._expect_key = False  # Only tracked for the top-level object
+        self._string_is_key = False
+        self._last_key: Optional[str] = None
+        self._array_depth: Optional[int] = None
+        self._element_start: Optional[int] = None
+
+    def feed(self, chunk: str) -> List[Any]:
+        """
+        Consume the next chunk of text.
+
+        Args:
+            chunk: Newly streamed text
+
+        Returns:
+            Array elements completed by this chunk, in order
+        """
+        self.text += chunk
+        completed: List[Any] = []
+        text = self.text
+
+        while self._pos < len(text):
+            ch = text[self._pos]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._string_is_key:
+                        self._last_key = text[self._string_start + 1:self._pos]
+                self._pos += 1
+                continue
+
+            if not self._started:
+                if ch == "{":
+                    self._started = True
+                    self._depth = 1
+                    self._expect_key = True
+                self._pos += 1
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._string_start = self._pos
+                self._string_is_key = self._depth == 1 and self._expect_key
+            elif ch in "{[":
+                if self._depth == self._array_depth and self._element_start is None:
+                    self._element_start = self._pos
+                if (
+                    ch == "["
+                    and self._depth == 1
+                    and not self._expect_key
+                    and self._last_key == self.array_key
+                ):
+                    self._array_depth = 2
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == self._array_depth and self._element_start is not None:
+                    completed.append(self._parse_element(text[self._element_start:self._pos + 1]))
+                    self._element_start = None
+                elif self._array_depth is not None and self._depth < self._array_depth:
+                    self._array_depth = None
+            elif self._depth == 1 and ch == ":":
+                self._expect_key = False
+            elif self._depth == 1 and ch == ",":
+                self._expect_key = True
+            self._pos += 1
+
+        self.items_emitted += len(completed)
+        return completed
+
+    @staticmethod
+    def _parse_element(fragment: str) -> Any:
+        parsed, _ = loads_with_repair(fragment)
+        return parsed
@@ -0,0 +1,34 @@
+# tests/test_fallback_bank.py
+from vina_backend.services.fallback_bank import (
+    empty_bank,
+    get_fallback_lesson,
+    load_fallback_bank,
+    save_fallback_bank,
+    set_fallback_lesson,
+)
+
+
+def test_missing_bank_is_empty(tmp_path):
+    path = tmp_path / "fallback_lessons.json"
+    assert load_fallback_bank(path) == empty_bank()
+    assert get_fallback_lesson("c_llm_foundations", "l01_what_llms_are", 3, path=path) is None
+
+
+def test_bank_round_trip_uses_closest_difficulty(tmp_path):
+    path = tmp_path / "fallback_lessons.json"
+    bank = empty_bank()
+    set_fallback_lesson(bank, "c_llm_foundations", "l01_what_llms_are", 1, {"lesson_title": "Guided"})
+    set_fallback_lesson(bank, "c_llm_foundations", "l01_what_llms_are", 5, {"lesson_title": "Direct"})
+    save_fallback_bank(bank, prompt_version="abc123", path=path)
+
+    reloaded = load_fallback_bank(path, reload=True)
+    assert reloaded["version"] == 1
+    assert reloaded["prompt_version"] == "abc123"
+
+    assert get_fallback_lesson("c_llm_foundations", "l01_what_llms_are", 1, path=path)["lesson_title"] == "Guided"
+    assert get_fallback_lesson("c_llm_foundations", "l01_what_llms_are", 4, path=path)["lesson_title"] == "Direct"
+    assert get_fallback_lesson("c_llm_foundations", "l01_what_llms_are", 3, path=path)["lesson_title"] == "Guided"
+
+    # Callers get a copy they can modify
+    get_fallback_lesson("c_llm_foundations", "l01_what_llms_are", 5, path=path)["lesson_title"] = "Changed"
+    assert get_fallback_lesson("c_llm_foundations", "l01_what_llms_are", 5, path=path)["lesson_title"] == "Direct"
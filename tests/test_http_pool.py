@@ -0,0 +1,30 @@
+# tests/test_http_pool.py
+import httpx
+
+from vina_backend.integrations.http.pool import HostLimitedTransport, HTTPPoolMetrics
+
+
+def make_client(max_per_host: int = 1):
+    inner = httpx.MockTransport(lambda request: httpx.Response(200, content=b"streamed body"))
+    transport = HostLimitedTransport(inner, max_per_host=max_per_host, metrics=HTTPPoolMetrics())
+    return httpx.Client(transport=transport), transport
+
+
+def test_host_slot_is_held_until_the_response_is_closed():
+    client, transport = make_client()
+    slot = transport._semaphore("api.example.com")
+
+    with client.stream("GET", "https://api.example.com/v1/chat") as response:
+        assert not slot.acquire(blocking=False)
+        assert response.read() == b"streamed body"
+
+    assert slot.acquire(blocking=False)
+
+
+def test_read_responses_free_their_slot_and_are_counted():
+    client, transport = make_client()
+
+    for _ in range(3):
+        assert client.get("https://api.example.com/v1/chat").status_code == 200
+
+    assert transport._metrics.snapshot()["api.example.com"]["requests"] == 3
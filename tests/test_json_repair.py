@@ -0,0 +1,48 @@
+# tests/test_json_repair.py
+import json
+
+import pytest
+
+from vina_backend.utils.json_safety import loads_with_repair, repair_json
+
+
+def test_valid_json_is_untouched():
+    text = '{"slides": [{"title": "A", "talk": "B"}]}'
+    result = repair_json(text)
+    assert not result.repaired
+    assert json.loads(result.text) == json.loads(text)
+
+
+def test_trailing_commas_removed():
+    parsed, changes = loads_with_repair('{"a": [1, 2, 3,], "b": {"c": 1,},}')
+    assert parsed == {"a": [1, 2, 3], "b": {"c": 1}}
+    assert "removed trailing comma" in changes
+
+
+def test_truncated_output_is_closed():
+    parsed, changes = loads_with_repair('{"lesson_title": "Intro", "slides": [{"title": "One", "talk": "Half a sent')
+    assert parsed["slides"][0]["talk"] == "Half a sent"
+    assert "closed unterminated string" in changes
+
+
+def test_dangling_key_completed_with_null():
+    parsed, _ = loads_with_repair('{"a": 1, "b":')
+    assert parsed == {"a": 1, "b": None}
+    parsed, _ = loads_with_repair('{"a": 1, "b"')
+    assert parsed == {"a": 1, "b": None}
+
+
+def test_unescaped_quotes_and_newlines_in_strings():
+    parsed, changes = loads_with_repair('{"talk": "He said "hi", then\nleft", "n": 1}')
+    assert parsed == {"talk": 'He said "hi", then\nleft', "n": 1}
+    assert "escaped unescaped quote inside string" in changes
+
+
+def test_stray_backslash_and_python_literals():
+    parsed, _ = loads_with_repair('{"path": "C:\\data", "ok": True, "x": None}')
+    assert parsed == {"path": "C:\\data", "ok": True, "x": None}
+
+
+def test_unrepairable_raises_decode_error():
+    with pytest.raises(json.JSONDecodeError):
+        loads_with_repair("not json at all")
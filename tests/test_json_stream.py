@@ -0,0 +1,41 @@
+# tests/test_json_stream.py
+import json
+
+from vina_backend.utils.json_stream import JSONArrayStreamParser
+
+LESSON = {
+    "lesson_title": "What LLMs Are [intro]",
+    "slides": [
+        {"slide_number": 1, "title": "Hook \"quoted\" }", "items": [{"type": "text", "content": "a ] b"}]},
+        {"slide_number": 2, "title": "Concept", "items": [{"type": "text", "content": "c"}]},
+    ],
+    "references_to_previous_lessons": None,
+}
+
+
+def _stream(text, size):
+    parser = JSONArrayStreamParser("slides")
+    emitted = []
+    for i in range(0, len(text), size):
+        emitted.append(parser.feed(text[i:i + size]))
+    return parser, emitted
+
+
+def test_slides_are_emitted_as_soon_as_they_close():
+    text = "```json\n" + json.dumps(LESSON, indent=2) + "\n```"
+    parser, emitted = _stream(text, 1)
+
+    slides = [item for batch in emitted for item in batch]
+    assert slides == LESSON["slides"]
+
+    # Slide 1 is available before the second slide has been streamed
+    first_index = next(i for i, batch in enumerate(emitted) if batch)
+    assert first_index < text.index('"Concept"')
+    assert parser.items_emitted == 2
+
+
+def test_only_the_watched_top_level_array_is_streamed():
+    doc = {"other": [{"x": 1}], "meta": {"slides": [{"nested": True}]}, "slides": [{"slide_number": 1}]}
+    parser, emitted = _stream(json.dumps(doc), 7)
+
+    assert [item for batch in emitted for item in batch] == [{"slide_number": 1}]
@@ -0,0 +1,37 @@
+# tests/test_key_pool.py
+import time
+
+from vina_backend.integrations.llm.key_pool import APIKeyPool
+
+
+def test_pool_round_robins_unthrottled_keys():
+    pool = APIKeyPool(["key-a", "key-b", "key-a"])
+
+    assert len(pool) == 2
+    assert [pool.acquire() for _ in range(4)] == ["key-a", "key-b", "key-a", "key-b"]
+
+
+def test_throttled_key_cools_down_while_others_serve():
+    pool = APIKeyPool(["key-a", "key-b"], cooldown_seconds=60)
+    pool.mark_throttled("key-a")
+
+    assert [pool.acquire() for _ in range(3)] == ["key-b", "key-b", "key-b"]
+    assert pool.snapshot()[0]["throttle_count"] == 1
+
+
+def test_least_recently_throttled_key_is_preferred_after_cooldown():
+    pool = APIKeyPool(["key-a", "key-b"], cooldown_seconds=60)
+    pool.mark_throttled("key-a", cooldown_seconds=0.001)
+    pool.mark_throttled("key-b", cooldown_seconds=0.001)
+
+    time.sleep(0.01)
+    assert pool.acquire() == "key-a"
+
+
+def test_all_keys_cooling_down():
+    pool = APIKeyPool(["key-a", "key-b"], cooldown_seconds=60)
+    pool.mark_throttled("key-a", cooldown_seconds=10)
+    pool.mark_throttled("key-b", cooldown_seconds=30)
+
+    assert pool.acquire(ready_only=True) is None
+    assert pool.acquire() == "key-a"  # recovers first
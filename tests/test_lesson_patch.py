@@ -0,0 +1,33 @@
+# tests/test_lesson_patch.py
+from vina_backend.services.lesson_patch import group_issues_by_slide, merge_slides, slide_number_for_location
+
+
+def test_slide_number_for_location():
+    assert slide_number_for_location("slide_2") == 2
+    assert slide_number_for_location("slide_3_item_1") == 3
+    assert slide_number_for_location("lesson") is None
+    assert slide_number_for_location(None) is None
+
+
+def test_group_issues_by_slide():
+    issues = [
+        {"location": "slide_2_item_1"},
+        {"location": "slide_4"},
+        {"location": "slide_2_item_3"},
+    ]
+    grouped = group_issues_by_slide(issues, [1, 2, 3, 4])
+    assert list(grouped) == [2, 4]
+    assert len(grouped[2]) == 2
+
+    # Lesson-level or unknown-slide issues need a whole-lesson rewrite
+    assert group_issues_by_slide(issues + [{"location": "lesson_structure"}], [1, 2, 3, 4]) is None
+    assert group_issues_by_slide([{"location": "slide_9"}], [1, 2, 3, 4]) is None
+
+
+def test_merge_slides_keeps_order_and_numbers():
+    lesson = {"lesson_id": "l01", "slides": [{"slide_number": 1, "title": "a"}, {"slide_number": 2, "title": "b"}]}
+    merged = merge_slides(lesson, {2: {"slide_number": 7, "title": "fixed"}})
+
+    assert [slide["title"] for slide in merged["slides"]] == ["a", "fixed"]
+    assert merged["slides"][1]["slide_number"] == 2
+    assert lesson["slides"][1]["title"] == "b"
@@ -0,0 +1,46 @@
+# tests/test_lesson_precheck.py
+import copy
+
+from vina_backend.services.course_loader import get_difficulty_knobs
+from vina_backend.services.lesson_precheck import precheck_lesson
+
+
+def _slide(number, slide_type):
+    return {
+        "slide_number": number,
+        "slide_type": slide_type,
+        "title": f"Slide {number}",
+        "items": [
+            {
+                "type": "figure",
+                "bullet": "How a model predicts text",
+                "talk": "This picture shows the model picking the next word from likely options.",
+                "figure": {"image_prompt": "Flow diagram. Use icons and single-word labels only."},
+            },
+            {"type": "text", "bullet": "Check outputs before sharing", "talk": "Always verify the draft against your source documents."},
+        ],
+    }
+
+
+LESSON = {"slides": [_slide(1, "hook"), _slide(2, "concept"), _slide(3, "example"), _slide(4, "connection")]}
+
+
+def test_clean_lesson_passes():
+    assert precheck_lesson(LESSON, get_difficulty_knobs(3)) == []
+
+
+def test_precheck_flags_reviewer_rules():
+    lesson = copy.deepcopy(LESSON)
+    lesson["slides"][0]["items"].reverse()  # figure no longer first
+    lesson["slides"][1]["items"][1]["talk"] = "We leverage the model — then check it."
+    lesson["slides"][2]["items"][0]["figure"]["image_prompt"] = "A detailed infographic"
+
+    problems = precheck_lesson(lesson, get_difficulty_knobs(3))
+    assert any("slide 1" in problem and "first item" in problem for problem in problems)
+    assert any("forbidden phrase 'leverage'" in problem for problem in problems)
+    assert any("em dash" in problem for problem in problems)
+    assert any("slide 3" in problem and "text limitation" in problem for problem in problems)
+
+
+def test_precheck_checks_slide_count_for_difficulty():
+    assert precheck_lesson(LESSON, get_difficulty_knobs(1)) == ["4 slides (expected 5-6)"]
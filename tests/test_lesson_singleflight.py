@@ -0,0 +1,122 @@
+# tests/test_lesson_singleflight.py
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+from sqlmodel import Session, create_engine, select
+
+from vina_backend.services.lesson_singleflight import LessonGenerationLease, LessonSingleFlight
+
+KEY = "lesson:c_llm_foundations:l01_what_llms_are:d3:abc123"
+
+
+def make_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'leases.db'}")
+    LessonGenerationLease.metadata.create_all(engine, tables=[LessonGenerationLease.__table__])
+    return engine
+
+
+def test_concurrent_callers_share_one_generation():
+    singleflight = LessonSingleFlight(engine=None)
+    calls = []
+
+    async def run():
+        release = asyncio.Event()
+
+        async def generate():
+            calls.append(1)
+            await release.wait()
+            return "lesson"
+
+        callers = [asyncio.create_task(singleflight.arun(KEY, generate, lambda: None)) for _ in range(3)]
+        while singleflight.get_stats()["coalesced"] < 2:
+            await asyncio.sleep(0.01)
+        release.set()
+        return await asyncio.gather(*callers)
+
+    results = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert sorted(results) == [("lesson", False), ("lesson", True), ("lesson", True)]
+    assert singleflight.get_stats() == {"in_flight": 0, "coalesced": 2}
+
+
+def test_async_waiter_takes_over_when_leader_is_cancelled():
+    singleflight = LessonSingleFlight(engine=None)
+
+    async def run():
+        started = asyncio.Event()
+
+        async def slow_generate():
+            started.set()
+            await asyncio.sleep(10)
+
+        async def fast_generate():
+            return "lesson"
+
+        leader = asyncio.create_task(singleflight.arun(KEY, slow_generate, lambda: None))
+        await started.wait()
+        waiter = asyncio.create_task(singleflight.arun(KEY, fast_generate, lambda: None))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return await waiter
+
+    assert asyncio.run(run()) == ("lesson", False)
+
+
+def test_lease_is_exclusive_until_released_by_its_owner(tmp_path):
+    engine = make_engine(tmp_path)
+    worker_a = LessonSingleFlight(engine)
+    worker_b = LessonSingleFlight(engine)
+    worker_a.owner, worker_b.owner = "host-a:1", "host-b:2"
+
+    assert worker_a._acquire_lease(KEY)
+    assert not worker_b._acquire_lease(KEY)
+
+    worker_b._release_lease(KEY)  # Not the owner: the lease stays
+    assert not worker_b._acquire_lease(KEY)
+
+    worker_a._release_lease(KEY)
+    assert worker_b._acquire_lease(KEY)
+
+
+def test_expired_lease_is_taken_over(tmp_path):
+    engine = make_engine(tmp_path)
+    crashed = LessonSingleFlight(engine)
+    worker = LessonSingleFlight(engine)
+    crashed.owner, worker.owner = "host-a:1", "host-b:2"
+
+    assert crashed._acquire_lease(KEY)
+    with Session(engine) as session:
+        session.execute(
+            update(LessonGenerationLease).values(expires_at=datetime.utcnow() - timedelta(seconds=1))
+        )
+        session.commit()
+
+    assert worker._acquire_lease(KEY)
+    with Session(engine) as session:
+        assert session.exec(select(LessonGenerationLease.owner)).all() == ["host-b:2"]
+
+
+def test_waiting_worker_uses_the_cached_result_of_the_lease_holder(tmp_path):
+    engine = make_engine(tmp_path)
+    holder = LessonSingleFlight(engine)
+    waiter = LessonSingleFlight(engine, poll_seconds=0.01, wait_seconds=5)
+    holder.owner, waiter.owner = "host-a:1", "host-b:2"
+    assert holder._acquire_lease(KEY)
+
+    cache = []
+    checks = []
+
+    def recheck():
+        checks.append(1)
+        if len(checks) == 2:
+            cache.append("lesson from host-a")
+        return cache[0] if cache else None
+
+    async def generate():
+        return "generated twice"
+
+    result = asyncio.run(waiter.arun(KEY, generate=generate, recheck=recheck))
+
+    assert result == ("lesson from host-a", False)
@@ -0,0 +1,56 @@
+# tests/test_llm_health.py
+from vina_backend.integrations.llm.health import ModelHealthRegistry
+
+
+def test_circuit_opens_after_repeated_overloads():
+    registry = ModelHealthRegistry(failure_threshold=2, cooldown_seconds=60)
+
+    registry.record_failure("gemini", "gemini-3-flash-preview", "overloaded")
+    assert registry.acquire("gemini", "gemini-3-flash-preview")
+
+    registry.record_failure("gemini", "gemini-3-flash-preview", "overloaded")
+    assert not registry.acquire("gemini", "gemini-3-flash-preview")
+    assert registry.snapshot()["gemini/gemini-3-flash-preview"]["state"] == "open"
+
+
+def test_non_tripping_errors_do_not_open_circuit():
+    registry = ModelHealthRegistry(failure_threshold=1, cooldown_seconds=60)
+
+    registry.record_failure("openai", "gpt-4o-mini", "other")
+    assert registry.acquire("openai", "gpt-4o-mini")
+
+
+def test_half_open_allows_single_probe_then_closes():
+    registry = ModelHealthRegistry(failure_threshold=1, cooldown_seconds=0)
+
+    registry.record_failure("anthropic", "claude-haiku-4-5-20251001", "rate_limit")
+
+    # Cooldown of 0s: first caller gets the probe, second is refused
+    assert registry.acquire("anthropic", "claude-haiku-4-5-20251001")
+    assert not registry.acquire("anthropic", "claude-haiku-4-5-20251001")
+
+    registry.record_success("anthropic", "claude-haiku-4-5-20251001", latency_seconds=1.5)
+    assert registry.acquire("anthropic", "claude-haiku-4-5-20251001")
+    assert registry.snapshot()["anthropic/claude-haiku-4-5-20251001"]["state"] == "closed"
+
+
+def test_any_available_false_when_all_open():
+    registry = ModelHealthRegistry(failure_threshold=1, cooldown_seconds=60)
+    candidates = [("gemini", "gemini-2.5-flash"), ("openai", "gpt-4o-mini")]
+
+    for provider, model in candidates:
+        registry.record_failure(provider, model, "overloaded")
+
+    assert not registry.any_available(candidates)
+
+
+def test_latency_percentile_needs_samples():
+    registry = ModelHealthRegistry()
+
+    for latency in [1.0, 2.0, 3.0, 4.0]:
+        registry.record_success("openai", "gpt-4o-mini", latency)
+    assert registry.latency_percentile("openai", "gpt-4o-mini", 90) is None
+
+    registry.record_success("openai", "gpt-4o-mini", 10.0)
+    assert registry.latency_percentile("openai", "gpt-4o-mini", 90) == 10.0
+    assert registry.latency_percentile("openai", "gpt-4o-mini", 50) == 3.0
@@ -0,0 +1,58 @@
+# tests/test_llm_scheduler.py
+import asyncio
+
+import pytest
+
+from vina_backend.integrations.llm.scheduler import LLMScheduler, get_current_priority, llm_priority
+
+
+def test_batch_is_capped_below_total_capacity():
+    scheduler = LLMScheduler(max_concurrency=2, class_limits={"batch": 1})
+
+    async def run():
+        async with scheduler.aslot("batch"):
+            blocked = asyncio.ensure_future(scheduler.aslot("batch").__aenter__())
+            await asyncio.sleep(0.01)
+            assert not blocked.done()
+            assert scheduler.get_metrics()["batch"]["queue_depth"] == 1
+
+            # Interactive still has a free slot
+            async with scheduler.aslot("interactive"):
+                assert scheduler.get_metrics()["interactive"]["active"] == 1
+            blocked.cancel()
+
+    asyncio.run(run())
+    assert scheduler.get_metrics()["batch"]["queue_depth"] == 0
+
+
+def test_interactive_waiters_are_served_before_batch():
+    scheduler = LLMScheduler(max_concurrency=1)
+    order = []
+
+    async def worker(priority, name):
+        async with scheduler.aslot(priority):
+            order.append(name)
+            await asyncio.sleep(0)
+
+    async def run():
+        async with scheduler.aslot("batch"):
+            tasks = [
+                asyncio.ensure_future(worker("batch", "batch-1")),
+                asyncio.ensure_future(worker("interactive", "interactive-1")),
+            ]
+            await asyncio.sleep(0.01)
+        await asyncio.gather(*tasks)
+
+    asyncio.run(run())
+    assert order == ["interactive-1", "batch-1"]
+
+
+def test_llm_priority_context():
+    assert get_current_priority() == "interactive"
+    with llm_priority("batch"):
+        assert get_current_priority() == "batch"
+    assert get_current_priority() == "interactive"
+
+    with pytest.raises(ValueError):
+        with llm_priority("urgent"):
+            pass
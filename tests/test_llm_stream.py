@@ -0,0 +1,120 @@
+# tests/test_llm_stream.py
+import asyncio
+from types import SimpleNamespace
+
+import litellm
+import pytest
+
+from vina_backend.integrations.llm import client as client_module
+from vina_backend.integrations.llm.client import LLMClient
+from vina_backend.integrations.llm.scheduler import LLMScheduler
+
+LESSON_CHUNKS = ['{"slides": [{"title": "Tokens"}', ', {"title": "Context"}', "]}"]
+
+
+def chunk(text: str):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+
+class StreamingTransport:
+    def __init__(self, texts, error=None):
+        self.texts = texts
+        self.error = error
+
+    async def astream(self, **kwargs):
+        for text in self.texts:
+            yield chunk(text)
+        if self.error:
+            raise self.error
+
+
+class RecordingHealth:
+    def __init__(self):
+        self.calls = []
+
+    def any_available(self, candidates):
+        return True
+
+    def acquire(self, provider, model):
+        return True
+
+    def release(self, provider, model):
+        self.calls.append("release")
+
+    def record_failure(self, provider, model, error_kind):
+        self.calls.append("failure")
+
+    def record_success(self, provider, model, latency_seconds):
+        self.calls.append("success")
+
+
+class RecordingLimiter:
+    def __init__(self):
+        self.refunds = 0
+
+    async def aacquire(self, provider, model, tokens):
+        pass
+
+    def refund(self, provider, model, tokens=0):
+        self.refunds += 1
+
+    def penalize(self, provider, model):
+        pass
+
+    def reconcile(self, provider, model, reserved_tokens, actual_tokens):
+        pass
+
+
+@pytest.fixture
+def stream_env(monkeypatch):
+    env = SimpleNamespace(
+        health=RecordingHealth(), limiter=RecordingLimiter(), scheduler=LLMScheduler(max_concurrency=1)
+    )
+    monkeypatch.setattr(client_module, "get_health_registry", lambda: env.health)
+    monkeypatch.setattr(client_module, "get_rate_limiter", lambda: env.limiter)
+    monkeypatch.setattr(client_module, "get_scheduler", lambda: env.scheduler)
+    monkeypatch.setattr(litellm, "stream_chunk_builder", lambda chunks, messages=None: None)
+    return env
+
+
+def make_client(monkeypatch, transport) -> LLMClient:
+    client = LLMClient.__new__(LLMClient)
+    client.provider, client.model = "openai", "gpt-4o-mini"
+    client.transport = transport
+    monkeypatch.setattr(client, "_get_models_to_try", lambda caller=None: [("openai", "gpt-4o-mini")])
+    monkeypatch.setattr(client, "_has_api_key", lambda provider: True)
+    monkeypatch.setattr(client, "_get_api_key_for", lambda provider: "test-key")
+    return client
+
+
+def test_slot_is_released_while_a_slow_consumer_still_holds_items(monkeypatch, stream_env):
+    client = make_client(monkeypatch, StreamingTransport(LESSON_CHUNKS))
+
+    async def run():
+        titles = []
+        async for slide in client.astream_json_items("Write a lesson", "slides"):
+            titles.append(slide["title"])
+            await asyncio.sleep(0.01)  # e.g. TTS for this slide
+            titles.append(stream_env.scheduler.get_metrics()["interactive"]["active"])
+        return titles
+
+    assert asyncio.run(run()) == ["Tokens", 0, "Context", 0]
+    assert stream_env.health.calls == ["success"]
+
+
+def test_mid_stream_error_records_failure_and_refunds(monkeypatch, stream_env):
+    client = make_client(
+        monkeypatch, StreamingTransport(LESSON_CHUNKS[:1], error=RuntimeError("Connection reset by peer"))
+    )
+
+    async def run():
+        stream = client.astream_json_items("Write a lesson", "slides")
+        first = await stream.__anext__()
+        with pytest.raises(RuntimeError):
+            await stream.__anext__()
+        return first
+
+    assert asyncio.run(run()) == {"title": "Tokens"}
+    assert stream_env.health.calls == ["failure"]
+    assert stream_env.limiter.refunds == 1
+    assert stream_env.scheduler.get_metrics()["interactive"]["active"] == 0
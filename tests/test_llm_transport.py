@@ -0,0 +1,66 @@
+# tests/test_llm_transport.py
+import asyncio
+
+import pytest
+from litellm import ModelResponse
+
+from vina_backend.integrations.llm import transport
+from vina_backend.integrations.llm.transport import (
+    LLMTransport,
+    RecordingTransport,
+    ReplayMissError,
+    ReplayTransport,
+)
+
+MESSAGES = [
+    {"role": "system", "content": "You write lessons."},
+    {"role": "user", "content": "Explain tokens in one sentence."},
+]
+
+
+@pytest.fixture(autouse=True)
+def no_shared_http_pool(monkeypatch):
+    monkeypatch.setattr(LLMTransport, "_use_shared_http_pool", staticmethod(lambda: None))
+
+
+def fake_completion(**kwargs):
+    return ModelResponse(
+        model=kwargs["model"],
+        choices=[{"index": 0, "message": {"role": "assistant", "content": "Tokens are chunks of text."}}],
+    )
+
+
+def test_recorded_completion_replays_for_any_model(tmp_path, monkeypatch):
+    path = tmp_path / "recordings.jsonl"
+    monkeypatch.setattr(transport, "completion", fake_completion)
+
+    recorded = RecordingTransport(path).complete(model="gpt-4o-mini", messages=MESSAGES)
+    replay = ReplayTransport(path)
+
+    replayed = replay.complete(model="gemini/gemini-2.5-flash", messages=MESSAGES)
+    assert replayed.choices[0].message.content == recorded.choices[0].message.content
+    assert replayed.model == "gemini/gemini-2.5-flash"
+
+    async def stream():
+        return [chunk async for chunk in replay.astream(model="gpt-4o-mini", messages=MESSAGES)]
+
+    chunks = asyncio.run(stream())
+    assert "".join(c.choices[0].delta.content for c in chunks) == "Tokens are chunks of text."
+
+
+def test_replay_without_recording_raises_miss(tmp_path):
+    replay = ReplayTransport(tmp_path / "missing.jsonl")
+
+    with pytest.raises(ReplayMissError):
+        replay.complete(model="gpt-4o-mini", messages=MESSAGES)
+
+
+def test_replay_of_unrecorded_prompt_raises_miss(tmp_path, monkeypatch):
+    path = tmp_path / "recordings.jsonl"
+    monkeypatch.setattr(transport, "completion", fake_completion)
+    RecordingTransport(path).complete(model="gpt-4o-mini", messages=MESSAGES)
+
+    with pytest.raises(ReplayMissError):
+        ReplayTransport(path).complete(
+            model="gpt-4o-mini", messages=[{"role": "user", "content": "Something else"}]
+        )
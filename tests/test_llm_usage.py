@@ -0,0 +1,88 @@
+# tests/test_llm_usage.py
+import asyncio
+import threading
+from types import SimpleNamespace
+
+from sqlmodel import Session, create_engine, select
+
+from vina_backend.integrations.llm.usage import (
+    LLMUsageRecord,
+    UsageRecord,
+    UsageTracker,
+    collect_usage,
+    extract_token_counts,
+    summarize_usage,
+)
+
+
+def make_record(caller: str = "lesson_generator", **kwargs) -> UsageRecord:
+    return UsageRecord(provider="openai", model="gpt-4o-mini", caller=caller, **kwargs)
+
+
+def test_extract_token_counts_reads_openai_and_anthropic_cache_fields():
+    openai_response = SimpleNamespace(usage=SimpleNamespace(
+        prompt_tokens=1000, completion_tokens=200,
+        prompt_tokens_details=SimpleNamespace(cached_tokens=800),
+    ))
+    anthropic_response = SimpleNamespace(usage=SimpleNamespace(
+        prompt_tokens=1000, completion_tokens=200, prompt_tokens_details=None,
+        cache_read_input_tokens=600, cache_creation_input_tokens=300,
+    ))
+
+    assert extract_token_counts(openai_response) == (1000, 200, 800, 0)
+    assert extract_token_counts(anthropic_response) == (1000, 200, 600, 300)
+    assert extract_token_counts(SimpleNamespace(usage=None)) == (0, 0, 0, 0)
+
+
+def test_summarize_usage_totals_and_splits_by_caller():
+    summary = summarize_usage([
+        make_record(prompt_tokens=100, cached_tokens=50, cost_usd=0.01),
+        make_record(prompt_tokens=100, cost_usd=0.02),
+        make_record("lesson_reviewer", prompt_tokens=200, completion_tokens=10, cost_usd=0.03),
+    ])
+
+    assert summary["calls"] == 3
+    assert summary["prompt_tokens"] == 400
+    assert summary["cost_usd"] == 0.06
+    assert summary["cache_hit_ratio"] == 0.125
+    assert summary["by_caller"]["lesson_generator"]["calls"] == 2
+    assert summary["by_caller"]["lesson_reviewer"]["completion_tokens"] == 10
+
+
+def test_collect_usage_only_sees_records_inside_the_block():
+    tracker = UsageTracker(engine=None, flush_interval_seconds=3600)
+    tracker.record(make_record())
+
+    with collect_usage() as records:
+        tracker.record(make_record("lesson_reviewer"))
+
+    tracker.record(make_record())
+    assert [r.caller for r in records] == ["lesson_reviewer"]
+    assert len(tracker.recent()) == 3
+    assert len(tracker.recent("lesson_reviewer")) == 1
+
+
+def test_flush_writes_pending_records(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'usage.db'}")
+    LLMUsageRecord.metadata.create_all(engine, tables=[LLMUsageRecord.__table__])
+    tracker = UsageTracker(engine, flush_interval_seconds=3600)
+    tracker.record(make_record(prompt_tokens=10))
+    tracker.record(make_record(prompt_tokens=20))
+
+    assert tracker.flush() == 2
+    assert tracker.flush() == 0
+    with Session(engine) as session:
+        assert sorted(r.prompt_tokens for r in session.exec(select(LLMUsageRecord)).all()) == [10, 20]
+
+
+def test_record_in_event_loop_flushes_in_worker_thread():
+    tracker = UsageTracker(engine=None, flush_interval_seconds=0)
+    flush_threads = []
+    tracker.flush = lambda: flush_threads.append(threading.current_thread())
+
+    async def run():
+        tracker.record(make_record())
+        await asyncio.gather(*tracker._flush_tasks)
+
+    asyncio.run(run())
+    assert flush_threads and flush_threads[0] is not threading.main_thread()
@@ -0,0 +1,56 @@
+# tests/test_model_router.py
+from vina_backend.integrations.llm.router import (
+    ModelRouter,
+    load_quality_scores,
+    record_judge_scores,
+    task_for_caller,
+)
+
+TABLE = {
+    "review": {
+        "models": ["gemini/fast", "openai/mid", "anthropic/slow"],
+        "min_quality": 6.0,
+        "max_latency_seconds": 10,
+    }
+}
+
+
+class _FakeHealth:
+    def __init__(self, stats):
+        self.stats = stats
+
+    def snapshot(self):
+        return self.stats
+
+
+def test_route_keeps_cheapest_first_and_drops_models_below_quality_bar():
+    router = ModelRouter(table=TABLE, quality_scores={"review": {"gemini/fast": 5.0, "openai/mid": 8.0}})
+
+    assert router.route("review") == [("openai", "mid"), ("anthropic", "slow")]
+
+
+def test_route_demotes_slow_or_failing_models():
+    health = _FakeHealth({
+        "gemini/fast": {"total_calls": 10, "error_rate": 0.5, "latency_ema_seconds": 2.0},
+        "openai/mid": {"total_calls": 10, "error_rate": 0.0, "latency_ema_seconds": 25.0},
+        "anthropic/slow": {"total_calls": 2, "error_rate": 1.0, "latency_ema_seconds": 90.0},
+    })
+    router = ModelRouter(table=TABLE, health=health)
+
+    # anthropic/slow has too few samples to be judged
+    assert router.route("review") == [("anthropic", "slow"), ("gemini", "fast"), ("openai", "mid")]
+
+
+def test_task_for_caller():
+    assert task_for_caller("lesson_reviewer") == "review"
+    assert task_for_caller("practice_question_rewriter") == "quiz"
+    assert task_for_caller("unknown") is None
+    assert task_for_caller(None) is None
+
+
+def test_judge_scores_are_averaged_across_runs(tmp_path):
+    path = tmp_path / "model_quality.json"
+    record_judge_scores(path, "generate", {"openai/mid": [8.0]})
+    record_judge_scores(path, "generate", {"openai/mid": [6.0, 7.0]})
+
+    assert load_quality_scores(path) == {"generate": {"openai/mid": 7.0}}
@@ -6,4 +6,16 @@ def test_prompt_has_required_placeholders():
     
     required = ["{profession}", "{industry}", "{experience_level}"]
     for placeholder in required:
-        assert placeholder in prompt, f"Missing placeholder: {placeholder}"
\ No newline at end of file
+        assert placeholder in prompt, f"Missing placeholder: {placeholder}"
+
+def test_lesson_prompt_cacheable_prefix_is_static():
+    """Everything above the cache breakpoint must be identical for every learner."""
+    for name in ["lesson_generator_prompt.md", "lesson_reviewer_prompt.md", "lesson_rewriter_prompt.md",
+                 "lesson_slide_rewriter_prompt.md", "lesson_personalizer_prompt.md",
+                 "lesson_variant_prompt.md"]:
+        with open(f"src/vina_backend/prompts/lesson/{name}") as f:
+            prompt = f.read()
+        
+        assert "<!-- PROMPT CACHE BREAKPOINT -->" in prompt, f"Missing cache breakpoint: {name}"
+        prefix = prompt.split("<!-- PROMPT CACHE BREAKPOINT -->")[0]
+        assert "{{" not in prefix and "{%" not in prefix, f"Template variables in cacheable prefix: {name}"
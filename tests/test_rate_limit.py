@@ -0,0 +1,74 @@
+# tests/test_rate_limit.py
+import asyncio
+
+import pytest
+
+from vina_backend.integrations.llm.rate_limit import RateLimiter, TokenBucket
+
+
+def test_token_bucket_reports_wait_when_empty():
+    bucket = TokenBucket(capacity=60)  # refills 1 token/second
+    bucket.consume(60)
+
+    assert bucket.wait_time(1) == pytest.approx(1.0, abs=0.05)
+
+
+def test_limiter_allows_requests_within_rpm():
+    limiter = RateLimiter(limits={"openai/gpt-4o-mini": {"rpm": 3, "tpm": 10000}})
+
+    for _ in range(3):
+        assert limiter.acquire("openai", "gpt-4o-mini", tokens=100) == 0.0
+
+
+def test_limiter_times_out_instead_of_exceeding_rpm():
+    limiter = RateLimiter(limits={"openai/gpt-4o-mini": {"rpm": 1}})
+    limiter.acquire("openai", "gpt-4o-mini")
+
+    with pytest.raises(TimeoutError):
+        limiter.acquire("openai", "gpt-4o-mini", timeout=0.1)
+
+
+def test_limiter_async_path_waits_for_capacity():
+    limiter = RateLimiter(limits={"gemini/gemini-2.5-flash": {"rpm": 600}})  # 10 req/s
+
+    async def run():
+        await limiter.aacquire("gemini", "gemini-2.5-flash")
+        limiter.penalize("gemini", "gemini-2.5-flash")
+        return await limiter.aacquire("gemini", "gemini-2.5-flash")
+
+    waited = asyncio.run(run())
+    assert waited > 0
+
+
+def test_reconcile_refunds_over_reservation():
+    limiter = RateLimiter(limits={"anthropic": {"tpm": 1000}})
+    limiter.acquire("anthropic", "claude-haiku-4-5-20251001", tokens=1000)
+    limiter.reconcile("anthropic", "claude-haiku-4-5-20251001", reserved_tokens=1000, actual_tokens=200)
+
+    assert limiter.acquire("anthropic", "claude-haiku-4-5-20251001", tokens=700, timeout=0) == 0.0
+
+
+def test_limits_scale_with_key_pool_size():
+    limiter = RateLimiter(limits={"gemini": {"rpm": 2}}, key_counts={"gemini": 2})
+
+    for _ in range(4):
+        assert limiter.acquire("gemini", "gemini-2.5-flash") == 0.0
+    with pytest.raises(TimeoutError):
+        limiter.acquire("gemini", "gemini-2.5-flash", timeout=0.1)
+
+
+def test_default_limits_are_opt_in():
+    limiter = RateLimiter()
+    assert limiter._get_buckets("anthropic", "claude-sonnet-4-20250514") == (None, None)
+
+    limiter = RateLimiter(use_defaults=True)
+    request_bucket, _ = limiter._get_buckets("anthropic", "claude-sonnet-4-20250514")
+    assert request_bucket.capacity == 50
+
+
+def test_refund_returns_reservation_of_failed_call():
+    limiter = RateLimiter(limits={"openai/gpt-4o-mini": {"rpm": 1, "tpm": 1000}})
+    limiter.acquire("openai", "gpt-4o-mini", tokens=1000)
+    limiter.refund("openai", "gpt-4o-mini", tokens=1000)
+
+    assert limiter.acquire("openai", "gpt-4o-mini", tokens=1000, timeout=0) == 0.0
@@ -0,0 +1,87 @@
+# tests/test_response_cache.py
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+from sqlmodel import Session, create_engine
+
+from vina_backend.integrations.llm.client import LLMClient
+from vina_backend.integrations.llm.response_cache import LLMResponseCache, LLMResponseCacheEntry
+
+MESSAGES = [{"role": "user", "content": "Explain tokens"}]
+
+
+def make_cache(tmp_path, **kwargs) -> LLMResponseCache:
+    engine = create_engine(f"sqlite:///{tmp_path / 'cache.db'}")
+    LLMResponseCacheEntry.metadata.create_all(engine, tables=[LLMResponseCacheEntry.__table__])
+    return LLMResponseCache(engine, **kwargs)
+
+
+def test_key_covers_every_request_parameter():
+    key = LLMResponseCache.make_key("openai", "gpt-4o-mini", MESSAGES, 0.3, 1000)
+
+    assert key == LLMResponseCache.make_key("openai", "gpt-4o-mini", list(MESSAGES), 0.3, 1000)
+    assert key != LLMResponseCache.make_key("gemini", "gpt-4o-mini", MESSAGES, 0.3, 1000)
+    assert key != LLMResponseCache.make_key("openai", "gpt-4o", MESSAGES, 0.3, 1000)
+    assert key != LLMResponseCache.make_key("openai", "gpt-4o-mini", [{"role": "user", "content": "x"}], 0.3, 1000)
+    assert key != LLMResponseCache.make_key("openai", "gpt-4o-mini", MESSAGES, 0.7, 1000)
+    assert key != LLMResponseCache.make_key("openai", "gpt-4o-mini", MESSAGES, 0.3, 2000)
+    assert key != LLMResponseCache.make_key("openai", "gpt-4o-mini", MESSAGES, 0.3, 1000, "LessonContent")
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = make_cache(tmp_path, ttl_seconds=60)
+    cache.set("k", "openai", "gpt-4o-mini", "cached text")
+    assert cache.get("k") == "cached text"
+
+    with Session(cache.engine) as session:
+        session.execute(
+            update(LLMResponseCacheEntry).values(created_at=datetime.utcnow() - timedelta(seconds=61))
+        )
+        session.commit()
+
+    assert cache.get("k") is None
+    assert cache.get_stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5, "total_entries": 0}
+
+
+def test_set_replaces_an_existing_entry(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.set("k", "openai", "gpt-4o-mini", "first")
+    cache.set("k", "gemini", "gemini-2.5-flash", "second")
+
+    assert cache.get("k") == "second"
+    assert cache.get_stats()["total_entries"] == 1
+
+
+def test_least_recently_accessed_entry_is_evicted(tmp_path):
+    cache = make_cache(tmp_path, max_entries=2, evict_every=1)
+    cache.set("a", "openai", "gpt-4o-mini", "A")
+    cache.set("b", "openai", "gpt-4o-mini", "B")
+    cache.get("a")
+    cache.set("c", "openai", "gpt-4o-mini", "C")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.get("c") == "C"
+
+
+def test_use_cache_false_bypasses_cache():
+    client = LLMClient.__new__(LLMClient)
+    client.provider, client.model = "openai", "gpt-4o-mini"
+    client.use_response_cache = True
+
+    assert client._get_response_cache_key(MESSAGES, 0.3, 1000, use_cache=None)
+    assert client._get_response_cache_key(MESSAGES, 0.3, 1000, use_cache=False) is None
+
+    client.use_response_cache = False
+    assert client._get_response_cache_key(MESSAGES, 0.3, 1000, use_cache=None) is None
+    assert client._get_response_cache_key(MESSAGES, 0.3, 1000, use_cache=True)
+
+
+def test_cache_write_errors_are_not_raised(monkeypatch):
+    class BrokenCache:
+        def set(self, *args):
+            raise RuntimeError("database is locked")
+
+    monkeypatch.setattr("vina_backend.integrations.llm.client.get_response_cache", lambda: BrokenCache())
+
+    LLMClient._store_cached_response("k", "openai", "gpt-4o-mini", "text")
@@ -0,0 +1,52 @@
+# tests/test_structured_output.py
+import asyncio
+
+import pytest
+from pydantic import BaseModel
+
+from vina_backend.integrations.llm.client import LLMClient
+
+MESSAGES = [{"role": "user", "content": "Return a title"}]
+
+
+class Title(BaseModel):
+    title: str
+
+
+class TimingOutTransport:
+    def __init__(self):
+        self.calls = []
+
+    async def acomplete(self, **kwargs):
+        self.calls.append(kwargs)
+        raise TimeoutError("Request timed out after 30s")
+
+
+def test_only_bad_requests_about_the_schema_count_as_rejections():
+    assert LLMClient._is_schema_rejection(
+        ValueError("400 Bad Request: Invalid parameter: 'response_format' of type 'json_schema' is not supported")
+    )
+    assert not LLMClient._is_schema_rejection(TimeoutError("Request timed out after 30s"))
+    assert not LLMClient._is_schema_rejection(ValueError("400 Bad Request: max_tokens is too large"))
+    assert not LLMClient._is_schema_rejection(ValueError("500 Internal error while applying response_format"))
+
+
+def test_timeout_does_not_disable_structured_output(monkeypatch):
+    client = LLMClient.__new__(LLMClient)
+    client.provider, client.model = "openai", "gpt-4o-mini"
+    client.transport = TimingOutTransport()
+    monkeypatch.setattr(client, "_get_api_key_for", lambda provider: "test-key")
+    monkeypatch.setattr(
+        client, "_supports_structured_output",
+        lambda formatted_model: formatted_model not in LLMClient._structured_output_unsupported,
+    )
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(client._acall_model(
+            "openai", "gpt-4o-mini", MESSAGES, max_tokens=200, temperature=0.3,
+            max_retries=2, retry_delay=0, timeout=None, response_model=Title,
+        ))
+
+    assert "gpt-4o-mini" not in LLMClient._structured_output_unsupported
+    assert client.transport.calls
+    assert all("response_format" in call for call in client.transport.calls)
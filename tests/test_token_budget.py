@@ -0,0 +1,37 @@
+# tests/test_token_budget.py
+from vina_backend.integrations.llm.token_budget import (
+    MAX_OUTPUT_TOKENS,
+    lesson_max_tokens,
+    parse_range,
+    quiz_max_tokens,
+    slide_max_tokens,
+)
+from vina_backend.services.course_loader import get_difficulty_knobs
+
+
+def test_parse_range():
+    assert parse_range("5-6 slides (slower pacing, more repetition)", (4, 5)) == (5, 6)
+    assert parse_range("30-50 words (2-3 short sentences)", (50, 70)) == (30, 50)
+    assert parse_range("3 slides", (4, 5)) == (3, 3)
+    assert parse_range(None, (4, 5)) == (4, 5)
+
+
+def test_lesson_budget_follows_difficulty_knobs():
+    guided = lesson_max_tokens(get_difficulty_knobs(1))
+    direct = lesson_max_tokens(get_difficulty_knobs(5))
+
+    # Difficulty 1 has the most slides, so it needs the largest budget
+    assert guided > lesson_max_tokens(get_difficulty_knobs(3))
+    assert guided > 2000  # the old fixed default truncated these lessons
+    assert direct <= MAX_OUTPUT_TOKENS
+
+
+def test_quiz_budget_scales_with_question_count():
+    assert quiz_max_tokens(3) < 3000
+    assert quiz_max_tokens(6) > quiz_max_tokens(3)
+
+
+def test_slide_budget_is_smaller_than_lesson_budget():
+    for difficulty in (1, 3, 5):
+        knobs = get_difficulty_knobs(difficulty)
+        assert slide_max_tokens(knobs) < lesson_max_tokens(knobs)